@@ -0,0 +1,23 @@
+"""
+GenX-FX Backtesting Module
+Historical replay and simulation components for autonomous trading system
+"""
+
+from .broker import SimulatedBroker, SimulatedClock
+from .engine import BacktestEngine, BacktestConfig, BacktestResult, run_backtest
+from .vectorized import VectorizedBacktester, VectorizedResult
+from .optimizer import ParameterOptimizer, OptimizerConfig, OptimizationReport
+
+__all__ = [
+    "SimulatedBroker",
+    "SimulatedClock",
+    "BacktestEngine",
+    "BacktestConfig",
+    "BacktestResult",
+    "run_backtest",
+    "VectorizedBacktester",
+    "VectorizedResult",
+    "ParameterOptimizer",
+    "OptimizerConfig",
+    "OptimizationReport"
+]
@@ -0,0 +1,254 @@
+"""
+Simulated Broker - Fill model used in place of BrokerAdapter during backtests
+Orders fill at the next bar's open; stops and targets are checked against bar ranges
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+from execution.broker_adapter import Order, OrderSide, OrderStatus, OrderType, Position
+
+
+class SimulatedClock:
+    """Backtest clock advanced by the replay loop instead of wall time"""
+    
+    def __init__(self):
+        self.current: Optional[datetime] = None
+    
+    def set(self, timestamp_ns: int) -> None:
+        self.current = pd.Timestamp(timestamp_ns).to_pydatetime()
+    
+    def now(self) -> datetime:
+        return self.current or datetime.now()
+    
+    async def sleep(self, seconds: float) -> None:
+        """No-op: simulated time only moves with the data"""
+        return None
+
+
+@dataclass
+class OpenTrade:
+    """Position held by the simulated broker"""
+    symbol: str
+    side: str  # 'long' or 'short'
+    quantity: float
+    entry_price: float
+    entry_time: datetime
+    stop_loss: float
+    take_profit: float
+    strategy: str
+    entry_fee: float = 0.0
+
+
+class SimulatedBroker:
+    """
+    Drop-in for BrokerAdapter in backtests.
+    Market orders queue until the symbol's next bar and fill at its open
+    (plus slippage); stop-loss is checked before take-profit within a bar.
+    """
+    
+    def __init__(self, initial_capital: float = 100000.0, commission: float = 0.0,
+                 slippage: float = 0.0, clock: Optional[SimulatedClock] = None):
+        self.logger = logging.getLogger(__name__)
+        self.clock = clock or SimulatedClock()
+        
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        
+        self.cash = initial_capital
+        self.positions: Dict[str, OpenTrade] = {}
+        self.pending: Dict[str, Order] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.orders: Dict[str, Order] = {}
+        self.trades: List[Dict[str, Any]] = []
+        self._order_count = 0
+    
+    async def execute_trade(self, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a market order for the symbol's next bar"""
+        symbol = signal.get('symbol', '')
+        quantity = float(signal.get('position_size', 0) or 0)
+        side = OrderSide.BUY if signal.get('signal_type') == 'buy' else OrderSide.SELL
+        
+        if symbol in self.pending:
+            return {'success': False, 'error': 'Order already pending'}
+        
+        position = self.positions.get(symbol)
+        if position is not None:
+            if (position.side == 'long') == (side == OrderSide.BUY):
+                return {'success': False, 'error': 'Position already open'}
+            # Opposite signal closes the open position
+            quantity = position.quantity
+        elif quantity <= 0:
+            return {'success': False, 'error': 'Zero quantity'}
+        
+        self._order_count += 1
+        order = Order(
+            order_id=f"bt_{self._order_count}",
+            symbol=symbol,
+            side=side,
+            order_type=OrderType.MARKET,
+            quantity=quantity,
+            price=signal.get('entry_price'),
+            stop_price=signal.get('stop_loss'),
+            created_at=self.clock.now(),
+            metadata=signal
+        )
+        self.pending[symbol] = order
+        self.orders[order.order_id] = order
+        
+        return {'success': True, 'order_id': order.order_id, 'status': order.status.value}
+    
+    def on_bar(self, symbol: str, timestamp: datetime, open_: float, high: float,
+               low: float, close: float) -> List[Dict[str, Any]]:
+        """Process one bar: fill pending orders, then trigger stops and targets"""
+        events = []
+        
+        order = self.pending.pop(symbol, None)
+        if order is not None:
+            events.append(self._fill(order, timestamp, open_))
+        
+        position = self.positions.get(symbol)
+        if position is not None:
+            exit_price, reason = self._check_exit(position, open_, high, low)
+            if exit_price is not None:
+                events.append(self._close(symbol, timestamp, exit_price, reason))
+        
+        self.last_prices[symbol] = close
+        return events
+    
+    def _fill(self, order: Order, timestamp: datetime, open_: float) -> Dict[str, Any]:
+        """Fill a market order at the open, adjusted for slippage"""
+        buying = order.side == OrderSide.BUY
+        price = open_ * (1 + self.slippage) if buying else open_ * (1 - self.slippage)
+        
+        order.status = OrderStatus.FILLED
+        order.filled_quantity = order.quantity
+        order.average_price = price
+        order.updated_at = timestamp
+        
+        if order.symbol in self.positions:
+            return self._close(order.symbol, timestamp, price, 'signal')
+        
+        signal = order.metadata or {}
+        fee = order.quantity * price * self.commission
+        self.cash += (-1 if buying else 1) * order.quantity * price - fee
+        
+        # Keep the signal's stop/target distances relative to the actual fill;
+        # a missing level never triggers
+        reference = signal.get('entry_price') or price
+        stop_loss = signal.get('stop_loss')
+        take_profit = signal.get('take_profit')
+        never_low, never_high = 0.0, float('inf')
+        self.positions[order.symbol] = OpenTrade(
+            symbol=order.symbol,
+            side='long' if buying else 'short',
+            quantity=order.quantity,
+            entry_price=price,
+            entry_time=timestamp,
+            stop_loss=price * stop_loss / reference if stop_loss else (never_low if buying else never_high),
+            take_profit=price * take_profit / reference if take_profit else (never_high if buying else never_low),
+            strategy=signal.get('strategy', ''),
+            entry_fee=fee
+        )
+        
+        return {'event': 'open', 'symbol': order.symbol, 'side': 'long' if buying else 'short',
+                'quantity': order.quantity, 'price': price, 'timestamp': timestamp}
+    
+    def _check_exit(self, position: OpenTrade, open_: float, high: float, low: float):
+        """Exit price and reason if the bar reaches the stop or target"""
+        if position.side == 'long':
+            if low <= position.stop_loss:
+                return min(open_, position.stop_loss), 'stop_loss'
+            if high >= position.take_profit:
+                return max(open_, position.take_profit), 'take_profit'
+        else:
+            if high >= position.stop_loss:
+                return max(open_, position.stop_loss), 'stop_loss'
+            if low <= position.take_profit:
+                return min(open_, position.take_profit), 'take_profit'
+        return None, None
+    
+    def _close(self, symbol: str, timestamp: datetime, price: float, reason: str) -> Dict[str, Any]:
+        """Close a position and record the round trip"""
+        position = self.positions.pop(symbol)
+        direction = 1 if position.side == 'long' else -1
+        fee = position.quantity * price * self.commission
+        self.cash += direction * position.quantity * price - fee
+        
+        pnl = direction * (price - position.entry_price) * position.quantity - fee - position.entry_fee
+        trade = {
+            'symbol': symbol,
+            'side': position.side,
+            'strategy': position.strategy,
+            'quantity': position.quantity,
+            'entry_time': position.entry_time,
+            'entry_price': position.entry_price,
+            'exit_time': timestamp,
+            'exit_price': price,
+            'pnl': pnl,
+            'return': pnl / (position.entry_price * position.quantity) if position.entry_price else 0.0,
+            'exit_reason': reason
+        }
+        self.trades.append(trade)
+        
+        return {'event': 'close', **trade}
+    
+    def close_all(self, reason: str = 'end_of_data') -> List[Dict[str, Any]]:
+        """Close every open position at its last price"""
+        self.pending.clear()
+        return [
+            self._close(symbol, self.clock.now(), self.last_prices[symbol], reason)
+            for symbol in list(self.positions)
+        ]
+    
+    def equity(self) -> float:
+        """Cash plus open positions marked at their last price"""
+        value = self.cash
+        for symbol, position in self.positions.items():
+            direction = 1 if position.side == 'long' else -1
+            value += direction * position.quantity * self.last_prices.get(symbol, position.entry_price)
+        return value
+    
+    # BrokerAdapter-compatible queries
+    
+    async def get_positions(self) -> Dict[str, Position]:
+        """Get current positions"""
+        positions = {}
+        for symbol, trade in self.positions.items():
+            price = self.last_prices.get(symbol, trade.entry_price)
+            direction = 1 if trade.side == 'long' else -1
+            positions[symbol] = Position(
+                symbol=symbol,
+                side=trade.side,
+                quantity=trade.quantity,
+                average_price=trade.entry_price,
+                current_price=price,
+                unrealized_pnl=direction * (price - trade.entry_price) * trade.quantity,
+                realized_pnl=0.0,
+                timestamp=trade.entry_time
+            )
+        return positions
+    
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """Get current price for a symbol"""
+        return self.last_prices.get(symbol)
+    
+    async def close_all_positions(self) -> Dict[str, Any]:
+        """Close all positions"""
+        results = {trade['symbol']: trade for trade in self.close_all('manual')}
+        return {'success': True, 'results': results}
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get simulated broker status"""
+        return {
+            'cash': self.cash,
+            'equity': self.equity(),
+            'open_positions': len(self.positions),
+            'pending_orders': len(self.pending),
+            'completed_trades': len(self.trades)
+        }
@@ -0,0 +1,360 @@
+"""
+Backtest Engine - Event-driven replay of stored OHLCV history
+Feeds bars through DecisionEngine and RiskManager with a simulated broker and clock
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from core.decision_engine import DecisionEngine, DecisionEngineConfig, TradingSignal
+from core.risk_manager import RiskManager, RiskLimits
+from .broker import SimulatedBroker, SimulatedClock
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass
+class BacktestConfig:
+    """Backtest configuration"""
+    db_path: str = "market_data/market_data.db"
+    symbols: Optional[List[str]] = None  # defaults to every symbol in the data
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    initial_capital: float = 100000.0
+    commission: float = 0.0  # fraction of notional per fill
+    slippage: float = 0.0  # fraction of price per fill
+    warmup_bars: int = 50  # bars per symbol before signals are generated
+    window_bars: int = 500  # trailing bars passed to the decision engine
+    signal_interval: int = 1  # evaluate signals every N timeline steps
+    close_on_finish: bool = True
+    decision_config: Optional[DecisionEngineConfig] = None
+    risk_limits: Optional[RiskLimits] = None
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of a backtest run"""
+    trades: List[Dict[str, Any]]
+    equity_curve: pd.Series
+    metrics: Dict[str, float]
+    signals_generated: int = 0
+    signals_accepted: int = 0
+    risk_events: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            'signals_generated': self.signals_generated,
+            'signals_accepted': self.signals_accepted,
+            'risk_events': len(self.risk_events)
+        }
+
+
+class BacktestRecorder:
+    """Stands in for MetricsCollector: keeps records in memory instead of exporting them"""
+    
+    def __init__(self, clock: SimulatedClock):
+        self.clock = clock
+        self.signals_recorded = 0
+        self.risk_events: List[Dict[str, Any]] = []
+        self.alerts: List[Dict[str, Any]] = []
+        self.executions: List[Dict[str, Any]] = []
+    
+    async def record_signals(self, signals: List[Any]) -> None:
+        self.signals_recorded += len(signals)
+    
+    async def record_risk_event(self, event: Any, data: Dict[str, Any]) -> None:
+        self.risk_events.append({'event': getattr(event, 'value', event), 'timestamp': self.clock.now(), **data})
+    
+    async def send_alert(self, alert_type: str, message: str) -> None:
+        self.alerts.append({'type': alert_type, 'message': message, 'timestamp': self.clock.now()})
+    
+    async def record_trade_execution(self, order: Any, result: Dict[str, Any]) -> None:
+        self.executions.append({'order_id': getattr(order, 'order_id', None), **result})
+
+
+def load_ohlcv(db_path: str, symbols: Optional[List[str]] = None, start: Optional[datetime] = None,
+               end: Optional[datetime] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Read MarketDataManager's ohlcv_data table into per-symbol arrays (timestamps as int64 ns)"""
+    connection = sqlite3.connect(f"file:{Path(db_path)}?mode=ro", uri=True)
+    try:
+        if symbols is None:
+            symbols = [row[0] for row in connection.execute("SELECT DISTINCT symbol FROM ohlcv_data ORDER BY symbol")]
+        
+        data = {}
+        for symbol in symbols:
+            query = "SELECT timestamp, open, high, low, close, volume FROM ohlcv_data WHERE symbol = ?"
+            params: List[Any] = [symbol]
+            if start is not None:
+                query += " AND timestamp >= ?"
+                params.append(start.isoformat())
+            if end is not None:
+                query += " AND timestamp <= ?"
+                params.append(end.isoformat())
+            query += " ORDER BY timestamp"
+            
+            rows = connection.execute(query, params).fetchall()
+            if not rows:
+                continue
+            
+            timestamps, *columns = zip(*rows)
+            arrays = {name: np.asarray(values, dtype=np.float64) for name, values in zip(OHLCV_COLUMNS, columns)}
+            arrays['timestamp'] = pd.to_datetime(list(timestamps)).values.astype('datetime64[ns]').view(np.int64)
+            data[symbol] = arrays
+        
+        return data
+    finally:
+        connection.close()
+
+
+def signal_to_dict(signal: TradingSignal, timestamp: datetime) -> Dict[str, Any]:
+    """Convert a TradingSignal to the dict form RiskManager and brokers consume"""
+    return {
+        'symbol': signal.symbol,
+        'signal_type': signal.signal_type.value,
+        'confidence': signal.confidence,
+        'strength': signal.strength,
+        'entry_price': signal.entry_price,
+        'stop_loss': signal.stop_loss,
+        'take_profit': signal.take_profit,
+        'position_size': signal.position_size,
+        'strategy': signal.strategy.value,
+        'timestamp': timestamp,
+        'metadata': signal.metadata
+    }
+
+
+class BacktestEngine:
+    """
+    Replays stored bars in timestamp order across all symbols.
+    Each step passes trailing window views plus precomputed indicator values
+    to DecisionEngine.generate_signals, filters the signals with RiskManager,
+    and routes them to a SimulatedBroker. Nothing sleeps; the clock follows the data.
+    """
+    
+    def __init__(self, config: BacktestConfig, decision_engine: Optional[DecisionEngine] = None,
+                 risk_manager: Optional[RiskManager] = None):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        
+        self.clock = SimulatedClock()
+        self.recorder = BacktestRecorder(self.clock)
+        self.broker = SimulatedBroker(config.initial_capital, config.commission, config.slippage, self.clock)
+        
+        # Components are used without initialize() so no live loops or model loading start
+        self.decision_engine = decision_engine or DecisionEngine(config.decision_config or DecisionEngineConfig())
+        self.decision_engine.metrics = self.recorder
+        
+        self.risk_manager = risk_manager or RiskManager(config.risk_limits or RiskLimits())
+        self.risk_manager.metrics = self.recorder
+        self.risk_manager.broker = self.broker
+        self.risk_manager.portfolio_value = config.initial_capital
+        self.risk_manager.peak_value = config.initial_capital
+        
+        self.signals_generated = 0
+        self.signals_accepted = 0
+        self.indicator_params: Optional[Tuple] = None
+    
+    async def run(self, data: Optional[Dict[str, Dict[str, np.ndarray]]] = None) -> BacktestResult:
+        """Run the backtest over `data` or the configured SQLite store"""
+        started = time.perf_counter()
+        cfg = self.config
+        
+        if data is None:
+            data = await asyncio.to_thread(load_ohlcv, cfg.db_path, cfg.symbols, cfg.start, cfg.end)
+        symbols = [s for s in (cfg.symbols or list(data)) if s in data and len(data[s]['close']) > 0]
+        if not symbols:
+            return self._result(np.array([], dtype=np.int64), np.array([]), 0, started)
+        
+        # Indicators for every bar, computed once per symbol instead of once per step
+        engine = self.decision_engine.indicator_engine
+        self.indicator_params = engine.params_key
+        indicators = {}
+        for s in symbols:
+            history = engine.compute_history(data[s]['close'], data[s]['high'], data[s]['low'], data[s]['volume'])
+            indicators[s] = (list(history), np.column_stack(list(history.values())))
+        
+        timeline = np.unique(np.concatenate([data[s]['timestamp'] for s in symbols]))
+        lengths = np.array([len(data[s]['timestamp']) for s in symbols])
+        cursors = np.zeros(len(symbols), dtype=np.int64)
+        exhausted = np.iinfo(np.int64).max
+        next_times = np.array([data[s]['timestamp'][0] for s in symbols])
+        equity = np.empty(len(timeline))
+        current_day = None
+        bars_processed = 0
+        
+        for step, timestamp in enumerate(timeline):
+            self.clock.set(int(timestamp))
+            now = self.clock.now()
+            if now.date() != current_day:
+                current_day = now.date()
+                self.risk_manager.daily_pnl = 0.0
+            
+            evaluate = step % cfg.signal_interval == 0
+            market_data = {'symbols': []}
+            
+            for k in np.flatnonzero(next_times == timestamp):
+                symbol = symbols[k]
+                arrays = data[symbol]
+                i = int(cursors[k])
+                
+                events = self.broker.on_bar(
+                    symbol, now, arrays['open'][i], arrays['high'][i], arrays['low'][i], arrays['close'][i]
+                )
+                for event in events:
+                    await self._sync_risk_manager(event)
+                
+                cursors[k] = i + 1
+                next_times[k] = arrays['timestamp'][i + 1] if i + 1 < lengths[k] else exhausted
+                bars_processed += 1
+                
+                if evaluate and i + 1 >= cfg.warmup_bars:
+                    market_data['symbols'].append(symbol)
+                    market_data[symbol] = self._symbol_view(symbol, arrays, indicators[symbol], i, now)
+            
+            if market_data['symbols']:
+                await self._process_signals(market_data, now)
+            
+            equity[step] = self.broker.equity()
+        
+        if cfg.close_on_finish:
+            for event in self.broker.close_all('end_of_data'):
+                await self._sync_risk_manager(event)
+            if len(equity):
+                equity[-1] = self.broker.equity()
+        
+        return self._result(timeline, equity, bars_processed, started)
+    
+    def _symbol_view(self, symbol: str, arrays: Dict[str, np.ndarray], indicators: Tuple[List[str], np.ndarray],
+                     i: int, now: datetime) -> Dict[str, Any]:
+        """Symbol data as MarketDataManager would provide it, using zero-copy window views"""
+        start = max(0, i + 1 - self.config.window_bars)
+        view = {name: arrays[name][start:i + 1] for name in OHLCV_COLUMNS}
+        view['symbol'] = symbol
+        view['timestamp'] = now
+        names, matrix = indicators
+        view['indicators'] = dict(zip(names, matrix[i].tolist()))
+        view['indicator_params'] = self.indicator_params
+        return view
+    
+    async def _process_signals(self, market_data: Dict[str, Any], now: datetime) -> None:
+        """Generate, risk-filter and submit signals for one step"""
+        signals = await self.decision_engine.generate_signals(market_data)
+        if not signals:
+            return
+        self.signals_generated += len(signals)
+        
+        # Mark open positions so risk checks see current prices
+        for symbol, position in self.broker.positions.items():
+            await self.risk_manager.update_position(symbol, self._risk_position(position))
+        
+        candidates = [signal_to_dict(signal, now) for signal in signals]
+        for signal in await self.risk_manager.filter_signals(candidates):
+            result = await self.broker.execute_trade(signal)
+            if result['success']:
+                self.signals_accepted += 1
+    
+    def _risk_position(self, position, price: Optional[float] = None) -> Dict[str, Any]:
+        """RiskManager position payload for a simulated position"""
+        return {
+            'side': position.side,
+            'size': position.quantity,
+            'entry_price': position.entry_price,
+            'current_price': price if price is not None else self.broker.last_prices.get(position.symbol, position.entry_price),
+            'stop_loss': position.stop_loss,
+            'take_profit': position.take_profit
+        }
+    
+    async def _sync_risk_manager(self, event: Dict[str, Any]) -> None:
+        """Mirror broker fills and exits into RiskManager state"""
+        symbol = event['symbol']
+        if event['event'] == 'open':
+            # A position stopped out on its entry bar never reaches the risk manager
+            if symbol in self.broker.positions:
+                await self.risk_manager.update_position(symbol, self._risk_position(self.broker.positions[symbol]))
+        elif symbol in self.risk_manager.positions:
+            position = self.risk_manager.positions[symbol]
+            await self.risk_manager.update_position(symbol, {
+                'side': position.side,
+                'size': position.size,
+                'entry_price': position.entry_price,
+                'current_price': event['exit_price'],
+                'stop_loss': position.stop_loss,
+                'take_profit': position.take_profit
+            })
+            await self.risk_manager.close_position(symbol)
+    
+    def _result(self, timeline: np.ndarray, equity: np.ndarray, bars_processed: int, started: float) -> BacktestResult:
+        """Assemble the result and performance metrics"""
+        elapsed = time.perf_counter() - started
+        curve = pd.Series(equity, index=pd.to_datetime(timeline, unit='ns'), name='equity')
+        trades = self.broker.trades
+        
+        metrics = compute_performance(curve, trades, self.config.initial_capital)
+        metrics.update({
+            'bars_processed': bars_processed,
+            'elapsed_seconds': elapsed,
+            'bars_per_second': bars_processed / elapsed if elapsed > 0 else 0.0
+        })
+        self.logger.info(
+            f"Backtest finished: {bars_processed} bars, {len(trades)} trades, "
+            f"return {metrics['total_return']:.2%} in {elapsed:.1f}s ({metrics['bars_per_second']:,.0f} bars/s)"
+        )
+        
+        return BacktestResult(
+            trades=trades,
+            equity_curve=curve,
+            metrics=metrics,
+            signals_generated=self.signals_generated,
+            signals_accepted=self.signals_accepted,
+            risk_events=self.recorder.risk_events
+        )
+
+
+def compute_performance(equity: pd.Series, trades: List[Dict[str, Any]], initial_capital: float) -> Dict[str, float]:
+    """Return, risk and trade statistics for an equity curve"""
+    metrics = {
+        'total_return': 0.0,
+        'sharpe_ratio': 0.0,
+        'max_drawdown': 0.0,
+        'total_trades': len(trades),
+        'win_rate': 0.0,
+        'profit_factor': 0.0
+    }
+    if len(equity) == 0:
+        return metrics
+    
+    values = equity.to_numpy()
+    metrics['total_return'] = float(values[-1] / initial_capital - 1)
+    
+    peaks = np.maximum.accumulate(np.concatenate([[initial_capital], values]))[1:]
+    metrics['max_drawdown'] = float(np.max((peaks - values) / peaks))
+    
+    if len(values) > 2:
+        returns = np.diff(values) / values[:-1]
+        spacing = np.median(np.diff(equity.index.asi8)) if len(equity) > 1 else 0
+        periods_per_year = (365 * 24 * 3600 * 1e9) / spacing if spacing > 0 else 252
+        if returns.std() > 0:
+            metrics['sharpe_ratio'] = float(returns.mean() / returns.std() * np.sqrt(periods_per_year))
+    
+    if trades:
+        pnl = np.array([trade['pnl'] for trade in trades])
+        metrics['win_rate'] = float(np.mean(pnl > 0))
+        losses = -pnl[pnl < 0].sum()
+        metrics['profit_factor'] = float(pnl[pnl > 0].sum() / losses) if losses > 0 else float('inf')
+    
+    return metrics
+
+
+def run_backtest(config: BacktestConfig, data: Optional[Dict[str, Dict[str, np.ndarray]]] = None) -> BacktestResult:
+    """Synchronous entry point, e.g. for worker processes"""
+    return asyncio.run(BacktestEngine(config).run(data))
@@ -0,0 +1,405 @@
+"""
+Parameter Optimizer - Walk-forward grid search over strategy parameters
+Grid cells fan out across a process pool; workers share memory-mapped price arrays
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from core.decision_engine import DecisionEngineConfig, StrategyType
+from core.executor import ComputeExecutor, ExecutorConfig, ExecutorType
+from data.indicators import IndicatorEngine
+from .engine import OHLCV_COLUMNS, load_ohlcv
+from .vectorized import VectorizedBacktester
+
+# Parameters that change indicator values; cells sharing them reuse one indicator pass
+INDICATOR_PARAMS = ('bb_std_dev', 'breakout_period')
+
+# Memory-mapped arrays opened by this (worker) process, keyed by directory
+_MAPPED: Dict[str, Dict[str, Dict[str, np.ndarray]]] = {}
+
+
+def default_param_grid() -> Dict[str, List[Any]]:
+    """Grid over the rule-based strategy parameters"""
+    return {
+        'rsi_oversold': [25.0, 30.0, 35.0],
+        'rsi_overbought': [65.0, 70.0, 75.0],
+        'bb_std_dev': [1.5, 2.0, 2.5],
+        'breakout_period': [10, 20, 40],
+        'strategy_weights': [
+            {'momentum': 0.2, 'mean_reversion': 0.2, 'breakout': 0.1},
+            {'momentum': 1 / 3, 'mean_reversion': 1 / 3, 'breakout': 1 / 3}
+        ]
+    }
+
+
+@dataclass
+class OptimizerConfig:
+    """Configuration for the walk-forward optimizer"""
+    db_path: str = "market_data/market_data.db"
+    symbols: Optional[List[str]] = None  # all symbols in the database
+    history_days: int = 90
+    param_grid: Optional[Dict[str, List[Any]]] = None  # defaults to default_param_grid()
+    train_bars: int = 20000
+    test_bars: int = 5000
+    objective: str = 'sharpe_ratio'
+    min_trades: int = 10
+    initial_capital: float = 100000.0
+    commission: float = 0.0
+    slippage: float = 0.0
+    warmup_bars: Optional[int] = None  # defaults to the indicator history each cell needs
+    max_workers: Optional[int] = None  # defaults to the number of CPUs
+    workspace_path: str = "market_data/optimizer"  # shared arrays and result cache
+
+
+@dataclass
+class WalkForwardFold:
+    """Parameters chosen in-sample and their out-of-sample result"""
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+    params: Dict[str, Any]
+    train_score: float
+    test_metrics: Dict[str, float]
+
+
+@dataclass
+class OptimizationReport:
+    """Outcome of a walk-forward optimization"""
+    best_params: Dict[str, Any]
+    best_score: float
+    folds: List[WalkForwardFold]
+    cells_evaluated: int
+    cells_cached: int
+    elapsed_seconds: float
+    data_hash: str = ""
+    out_of_sample: Dict[str, float] = field(default_factory=dict)
+    
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'best_params': self.best_params,
+            'best_score': self.best_score,
+            'folds': len(self.folds),
+            'out_of_sample': self.out_of_sample,
+            'cells_evaluated': self.cells_evaluated,
+            'cells_cached': self.cells_cached,
+            'elapsed_seconds': self.elapsed_seconds
+        }
+
+
+def _to_datetime(timestamp_ns: int) -> datetime:
+    return pd.Timestamp(timestamp_ns).floor('us').to_pydatetime()
+
+
+def to_engine_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Cell parameters in DecisionEngineConfig form (strategy weights keyed by StrategyType)"""
+    converted = dict(params)
+    if 'strategy_weights' in converted:
+        converted['strategy_weights'] = {
+            StrategyType(name): weight for name, weight in converted['strategy_weights'].items()
+        }
+    return converted
+
+
+def hash_arrays(data: Dict[str, Dict[str, np.ndarray]]) -> str:
+    """Content hash of per-symbol price arrays"""
+    digest = hashlib.sha1()
+    for symbol in sorted(data):
+        digest.update(symbol.encode())
+        for column in ('timestamp',) + OHLCV_COLUMNS:
+            digest.update(np.ascontiguousarray(data[symbol][column]).data)
+    return digest.hexdigest()
+
+
+def cell_warmup_bars(cell: Dict[str, Any]) -> int:
+    """Bars before a window that reproduce its full-history indicator values"""
+    return IndicatorEngine({name: cell[name] for name in INDICATOR_PARAMS if name in cell}).history_bars
+
+
+def _map_arrays(arrays_dir: str, files: Dict[str, str]) -> Dict[str, Dict[str, np.ndarray]]:
+    """Open published arrays read-only; pages are shared between worker processes"""
+    if arrays_dir not in _MAPPED:
+        _MAPPED[arrays_dir] = {
+            symbol: {
+                column: np.load(os.path.join(arrays_dir, f"{prefix}_{column}.npy"), mmap_mode='r')
+                for column in ('timestamp',) + OHLCV_COLUMNS
+            }
+            for symbol, prefix in files.items()
+        }
+    return _MAPPED[arrays_dir]
+
+
+def evaluate_cells(arrays_dir: str, files: Dict[str, str], segment: Tuple[int, int],
+                   cells: List[Dict[str, Any]], settings: Dict[str, Any]) -> List[Dict[str, float]]:
+    """
+    Worker entry point: backtest each cell over [start, end) nanoseconds.
+    Cells are expected to share indicator parameters.
+    """
+    start, end = segment
+    warmup = settings['warmup_bars'] or cell_warmup_bars(cells[0])
+    
+    window = {}
+    for symbol, arrays in _map_arrays(arrays_dir, files).items():
+        first, last = np.searchsorted(arrays['timestamp'], [start, end])
+        if last - first < 2:
+            continue
+        # Prepend warm-up history so the first entries fall inside the segment
+        first_with_warmup = max(0, first - warmup)
+        window[symbol] = {column: values[first_with_warmup:last] for column, values in arrays.items()}
+    
+    backtester = VectorizedBacktester(
+        initial_capital=settings['initial_capital'],
+        commission=settings['commission'],
+        slippage=settings['slippage'],
+        warmup_bars=warmup
+    )
+    
+    results = []
+    for cell in cells:
+        params = to_engine_params(cell)
+        weights = params.pop('strategy_weights', None)
+        config = replace(DecisionEngineConfig(), **params)
+        metrics = backtester.run(window, config, weights).metrics
+        
+        value = metrics.get(settings['objective'], 0.0)
+        metrics['score'] = value if metrics['total_trades'] >= settings['min_trades'] else float('-inf')
+        results.append(metrics)
+    
+    return results
+
+
+class ParameterOptimizer:
+    """
+    Walk-forward optimizer for DecisionEngine strategy parameters.
+    Each fold picks the best grid cell on its training window and scores it on
+    the following test window; the recommendation comes from the most recent
+    train_bars of history. Cell results are cached on disk by (params, data, window).
+    """
+    
+    def __init__(self, config: OptimizerConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        
+        self.workspace = Path(config.workspace_path)
+        self.cache_path = self.workspace / "cache"
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        
+        self.executor = ComputeExecutor(ExecutorConfig(
+            executor_type=ExecutorType.PROCESS,
+            max_workers=config.max_workers,
+            name="optimizer"
+        ))
+        
+        self.last_report: Optional[OptimizationReport] = None
+    
+    def expand_grid(self) -> List[Dict[str, Any]]:
+        """Every parameter combination in the grid"""
+        grid = self.config.param_grid or default_param_grid()
+        names = sorted(grid)
+        cells = []
+        for values in itertools.product(*(grid[name] for name in names)):
+            cell = dict(zip(names, values))
+            if 'strategy_weights' in cell:
+                cell['strategy_weights'] = {
+                    getattr(strategy, 'value', strategy): weight
+                    for strategy, weight in cell['strategy_weights'].items()
+                }
+            cells.append(cell)
+        return cells
+    
+    def load_data(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Recent OHLCV history from the market data database"""
+        start = datetime.now() - timedelta(days=self.config.history_days)
+        return load_ohlcv(self.config.db_path, self.config.symbols, start=start)
+    
+    def publish(self, data: Dict[str, Dict[str, np.ndarray]]) -> Tuple[str, Dict[str, str], str]:
+        """Write price arrays once as .npy files for workers to memory-map"""
+        data_hash = hash_arrays(data)
+        arrays_dir = self.workspace / "arrays" / data_hash
+        files = {symbol: f"{index:04d}" for index, symbol in enumerate(sorted(data))}
+        
+        if not (arrays_dir / "manifest.json").exists():
+            arrays_dir.mkdir(parents=True, exist_ok=True)
+            for symbol, prefix in files.items():
+                for column in ('timestamp',) + OHLCV_COLUMNS:
+                    np.save(arrays_dir / f"{prefix}_{column}.npy", np.ascontiguousarray(data[symbol][column]))
+            (arrays_dir / "manifest.json").write_text(json.dumps(files))
+        
+        return str(arrays_dir), files, data_hash
+    
+    def _segments(self, timeline: np.ndarray) -> Tuple[List[Tuple[Tuple[int, int], Tuple[int, int]]], Tuple[int, int]]:
+        """(train, test) windows in nanoseconds, plus the latest training window"""
+        train, test = self.config.train_bars, self.config.test_bars
+        end_ns = int(timeline[-1]) + 1
+        
+        folds = []
+        start = 0
+        while start + train + test <= len(timeline):
+            train_window = (int(timeline[start]), int(timeline[start + train]))
+            test_end = start + train + test
+            test_window = (int(timeline[start + train]), int(timeline[test_end]) if test_end < len(timeline) else end_ns)
+            folds.append((train_window, test_window))
+            start += test
+        
+        latest = (int(timeline[max(0, len(timeline) - train)]), end_ns)
+        return folds, latest
+    
+    def _settings(self) -> Dict[str, Any]:
+        """Backtest settings shipped to workers and folded into cache keys"""
+        return {name: getattr(self.config, name) for name in
+                ('objective', 'min_trades', 'initial_capital', 'commission', 'slippage', 'warmup_bars')}
+    
+    def _cache_key(self, cell: Dict[str, Any], data_hash: str, segment: Tuple[int, int]) -> str:
+        payload = json.dumps({'params': cell, 'data': data_hash, 'segment': segment, 'settings': self._settings()},
+                             sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[Dict[str, float]]:
+        path = self.cache_path / f"{key}.json"
+        if path.exists():
+            return json.loads(path.read_text())
+        return None
+    
+    def _cache_put(self, key: str, metrics: Dict[str, float]) -> None:
+        path = self.cache_path / f"{key}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(metrics))
+        temporary.replace(path)
+    
+    async def _evaluate(self, arrays_dir: str, files: Dict[str, str], data_hash: str,
+                        jobs: List[Tuple[Dict[str, Any], Tuple[int, int]]], counters: Dict[str, int]) -> List[Dict[str, float]]:
+        """Metrics for (cell, segment) jobs, from cache or the process pool"""
+        results: List[Optional[Dict[str, float]]] = [None] * len(jobs)
+        
+        # Group uncached jobs into tasks that share a segment and indicator parameters
+        tasks: Dict[Tuple, List[Tuple[int, str, Dict[str, Any]]]] = {}
+        for index, (cell, segment) in enumerate(jobs):
+            key = self._cache_key(cell, data_hash, segment)
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[index] = cached
+                counters['cached'] += 1
+                continue
+            group = (segment,) + tuple(cell.get(name) for name in INDICATOR_PARAMS)
+            tasks.setdefault(group, []).append((index, key, cell))
+        
+        settings = self._settings()
+        groups = list(tasks.items())
+        outputs = await self.executor.map(evaluate_cells, [
+            (arrays_dir, files, group[0], [cell for _, _, cell in members], settings)
+            for group, members in groups
+        ])
+        
+        for (_, members), metrics_list in zip(groups, outputs):
+            for (index, key, _), metrics in zip(members, metrics_list):
+                self._cache_put(key, metrics)
+                results[index] = metrics
+                counters['evaluated'] += 1
+        
+        return results
+    
+    async def optimize(self, data: Optional[Dict[str, Dict[str, np.ndarray]]] = None) -> Optional[OptimizationReport]:
+        """Run the walk-forward search and return the recommended parameters"""
+        try:
+            started = time.perf_counter()
+            if data is None:
+                data = self.load_data()
+            if not data:
+                self.logger.warning("No market data to optimize on")
+                return None
+            
+            arrays_dir, files, data_hash = self.publish(data)
+            timeline = np.unique(np.concatenate([arrays['timestamp'] for arrays in data.values()]))
+            folds, latest = self._segments(timeline)
+            cells = self.expand_grid()
+            counters = {'evaluated': 0, 'cached': 0}
+            
+            # In-sample: every cell on every training window and the latest window
+            train_segments = [train for train, _ in folds] + [latest]
+            jobs = [(cell, segment) for segment in train_segments for cell in cells]
+            scores = await self._evaluate(arrays_dir, files, data_hash, jobs, counters)
+            
+            best = {}
+            for (cell, segment), metrics in zip(jobs, scores):
+                if segment not in best or metrics['score'] > best[segment][1]:
+                    best[segment] = (cell, metrics['score'])
+            
+            best_cell, best_score = best[latest]
+            if not np.isfinite(best_score):
+                self.logger.warning(
+                    f"No parameter cell reached {self.config.min_trades} trades on the latest window; "
+                    f"keeping current parameters"
+                )
+                return None
+            
+            # Out-of-sample: each fold's winner on the window that follows it
+            folds = [(train, test) for train, test in folds if np.isfinite(best[train][1])]
+            test_jobs = [(best[train][0], test) for train, test in folds]
+            test_results = await self._evaluate(arrays_dir, files, data_hash, test_jobs, counters)
+            
+            walk_forward = [
+                WalkForwardFold(
+                    train_start=_to_datetime(train[0]),
+                    train_end=_to_datetime(train[1]),
+                    test_start=_to_datetime(test[0]),
+                    test_end=_to_datetime(test[1]),
+                    params=to_engine_params(best[train][0]),
+                    train_score=best[train][1],
+                    test_metrics=metrics
+                )
+                for (train, test), metrics in zip(folds, test_results)
+            ]
+            
+            out_of_sample = {}
+            if walk_forward:
+                out_of_sample = {
+                    'mean_return': float(np.mean([fold.test_metrics['total_return'] for fold in walk_forward])),
+                    'mean_score': float(np.mean([fold.test_metrics['score'] for fold in walk_forward
+                                                 if np.isfinite(fold.test_metrics['score'])] or [0.0])),
+                    'worst_drawdown': float(max(fold.test_metrics['max_drawdown'] for fold in walk_forward))
+                }
+            
+            report = OptimizationReport(
+                best_params=to_engine_params(best_cell),
+                best_score=best_score,
+                folds=walk_forward,
+                cells_evaluated=counters['evaluated'],
+                cells_cached=counters['cached'],
+                elapsed_seconds=time.perf_counter() - started,
+                data_hash=data_hash,
+                out_of_sample=out_of_sample
+            )
+            self.last_report = report
+            
+            self.logger.info(
+                f"Optimized {len(cells)} cells over {len(folds)} folds in {report.elapsed_seconds:.1f}s "
+                f"({report.cells_evaluated} evaluated, {report.cells_cached} cached)"
+            )
+            return report
+            
+        except Exception as e:
+            self.logger.error(f"Error optimizing parameters: {e}")
+            return None
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool"""
+        self.executor.shutdown()
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get optimizer status"""
+        return {
+            'grid_size': len(self.expand_grid()),
+            'executor': self.executor.get_status(),
+            'last_report': self.last_report.summary() if self.last_report else None
+        }
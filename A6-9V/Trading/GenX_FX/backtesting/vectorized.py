@@ -0,0 +1,318 @@
+"""
+Vectorized Backtester - Whole-history evaluation of the rule-based strategies
+Entry rules become NumPy masks over every bar; the trade loop steps from trade to trade, not bar to bar
+"""
+
+import logging
+import time
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, Tuple
+
+from core.decision_engine import DecisionEngineConfig, StrategyType
+from data.indicators import IndicatorEngine
+from .engine import compute_performance
+
+
+# Rule-based strategies the vectorized mode can evaluate, with their position size multiplier
+VECTORIZED_STRATEGIES = {
+    StrategyType.MOMENTUM: 0.5,
+    StrategyType.MEAN_REVERSION: 0.3,
+    StrategyType.BREAKOUT: 0.7
+}
+
+# Bars scanned per step when searching for a stop or target hit
+SCAN_CHUNK = 256
+
+
+@dataclass
+class SignalMasks:
+    """Per-bar entry masks with the stop and target each entry would use"""
+    long_entry: np.ndarray
+    short_entry: np.ndarray
+    long_stop: np.ndarray
+    long_take: np.ndarray
+    short_stop: np.ndarray
+    short_take: np.ndarray
+
+
+@dataclass
+class VectorizedResult:
+    """Outcome of a vectorized backtest"""
+    trades: pd.DataFrame
+    equity_curve: pd.Series
+    metrics: Dict[str, float]
+    strategy_metrics: Dict[str, Dict[str, float]]
+
+
+def strategy_masks(strategy: StrategyType, ind: Dict[str, np.ndarray], config: DecisionEngineConfig) -> SignalMasks:
+    """Entry masks mirroring DecisionEngine's per-bar rules, confidence filter included"""
+    close = ind['close']
+    rsi = ind['rsi']
+    oversold, overbought = config.rsi_oversold, config.rsi_overbought
+    
+    if strategy == StrategyType.MOMENTUM:
+        neutral = (rsi > oversold) & (rsi < overbought)
+        long_entry = neutral & (ind['macd'] > 0) & (close > ind['sma_20']) & (ind['sma_20'] > ind['sma_50'])
+        short_entry = neutral & (ind['macd'] < 0) & (close < ind['sma_20']) & (ind['sma_20'] < ind['sma_50'])
+        long_entry &= np.minimum(rsi / 100, 0.8) >= config.min_confidence
+        short_entry &= np.minimum((100 - rsi) / 100, 0.8) >= config.min_confidence
+        masks = SignalMasks(
+            long_entry, short_entry,
+            close * (1 - config.stop_loss_pct), close * (1 + config.take_profit_pct),
+            close * (1 + config.stop_loss_pct), close * (1 - config.take_profit_pct)
+        )
+        
+    elif strategy == StrategyType.MEAN_REVERSION:
+        confident = 0.7 >= config.min_confidence
+        long_entry = (close <= ind['bb_lower']) & (rsi < oversold) & confident
+        short_entry = (close >= ind['bb_upper']) & (rsi > overbought) & confident
+        masks = SignalMasks(
+            long_entry, short_entry,
+            ind['bb_lower'] * 0.99, ind['bb_middle'],
+            ind['bb_upper'] * 1.01, ind['bb_middle']
+        )
+        
+    elif strategy == StrategyType.BREAKOUT:
+        confident = 0.8 >= config.min_confidence
+        volume_ok = ind['volume'] > ind['avg_volume'] * config.breakout_volume_multiplier
+        long_entry = (close > ind['breakout_high']) & volume_ok & confident
+        short_entry = (close < ind['breakout_low']) & volume_ok & confident
+        masks = SignalMasks(
+            long_entry, short_entry,
+            ind['breakout_high'] * 0.98, close * 1.08,
+            ind['breakout_low'] * 1.02, close * 0.92
+        )
+        
+    else:
+        raise ValueError(f"Strategy {strategy.value} has no vectorized rules")
+    
+    # Bullish rules take precedence, as in the per-bar if/elif
+    masks.short_entry = masks.short_entry & ~masks.long_entry
+    return masks
+
+
+def _first_hit(high: np.ndarray, low: np.ndarray, start: int, end: int, is_long: bool,
+               stop: float, take: float) -> int:
+    """First bar in [start, end] whose range reaches the stop or target, or -1"""
+    position = start
+    chunk = SCAN_CHUNK
+    while position <= end:
+        stop_at = min(end + 1, position + chunk)
+        if is_long:
+            hit = (low[position:stop_at] <= stop) | (high[position:stop_at] >= take)
+        else:
+            hit = (high[position:stop_at] >= stop) | (low[position:stop_at] <= take)
+        if hit.any():
+            return position + int(np.argmax(hit))
+        position = stop_at
+        chunk *= 2
+    return -1
+
+
+def simulate_trades(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    masks: SignalMasks, first_bar: int = 0, slippage: float = 0.0) -> List[Tuple]:
+    """
+    One position at a time, with the same fill model as SimulatedBroker:
+    entries fill at the next open, stops are checked before targets, and an
+    opposite signal exits at the following open.
+    Returns (entry_bar, exit_bar, direction, entry_price, exit_price, reason) tuples.
+    """
+    n_bars = len(close)
+    long_bars = np.flatnonzero(masks.long_entry[:n_bars - 1])
+    # A bar with both entries is a long signal, as in the event-driven engine
+    short_bars = np.flatnonzero(masks.short_entry[:n_bars - 1] & ~masks.long_entry[:n_bars - 1])
+    entries = np.union1d(long_bars, short_bars)
+    entries = entries[entries >= first_bar]
+    
+    trades = []
+    k = 0
+    while k < len(entries):
+        signal_bar = int(entries[k])
+        is_long = bool(masks.long_entry[signal_bar])
+        fill_bar = signal_bar + 1
+        fill = open_[fill_bar] * (1 + slippage if is_long else 1 - slippage)
+        
+        # Stop and target keep their distance from the signal close
+        ratio = fill / close[signal_bar] if close[signal_bar] else 1.0
+        if is_long:
+            stop, take = masks.long_stop[signal_bar] * ratio, masks.long_take[signal_bar] * ratio
+            opposite = short_bars
+        else:
+            stop, take = masks.short_stop[signal_bar] * ratio, masks.short_take[signal_bar] * ratio
+            opposite = long_bars
+        
+        # An opposite signal on bar o exits at the open of bar o + 1
+        o = np.searchsorted(opposite, fill_bar)
+        signal_exit = int(opposite[o]) + 1 if o < len(opposite) else n_bars
+        scan_end = min(signal_exit, n_bars) - 1
+        
+        hit = _first_hit(high, low, fill_bar, scan_end, is_long, stop, take)
+        if hit >= 0:
+            stopped = low[hit] <= stop if is_long else high[hit] >= stop
+            if stopped:
+                exit_price = min(open_[hit], stop) if is_long else max(open_[hit], stop)
+            else:
+                exit_price = max(open_[hit], take) if is_long else min(open_[hit], take)
+            exit_bar, reason = hit, 'stop_loss' if stopped else 'take_profit'
+        elif signal_exit < n_bars:
+            exit_bar, reason = signal_exit, 'signal'
+            exit_price = open_[exit_bar] * (1 - slippage if is_long else 1 + slippage)
+        else:
+            exit_bar, reason, exit_price = n_bars - 1, 'end_of_data', close[-1]
+        
+        trades.append((signal_bar + 1, exit_bar, 1 if is_long else -1, fill, exit_price, reason))
+        
+        # Signals on the exit bar may open the next position
+        k = int(np.searchsorted(entries, exit_bar))
+    
+    return trades
+
+
+def trade_pnl_curve(close: np.ndarray, trades: List[Tuple], quantities: np.ndarray,
+                    commission: float = 0.0) -> np.ndarray:
+    """Mark-to-market PnL per bar for a list of simulated trades"""
+    n_bars = len(close)
+    pnl = np.zeros(n_bars)
+    if not trades:
+        return pnl
+    
+    entry_bar, exit_bar, direction, entry_price, exit_price = (
+        np.array(column) for column in list(zip(*trades))[:5]
+    )
+    signed = direction * quantities
+    
+    # Close-to-close PnL while held, plus corrections for the actual fill prices
+    holding = np.zeros(n_bars + 1)
+    np.add.at(holding, entry_bar, signed)
+    np.add.at(holding, exit_bar, -signed)
+    holding = np.cumsum(holding)[:n_bars]
+    pnl[1:] = holding[:-1] * np.diff(close)
+    
+    np.add.at(pnl, entry_bar, signed * (close[entry_bar] - entry_price) - commission * quantities * entry_price)
+    np.add.at(pnl, exit_bar, signed * (exit_price - close[exit_bar]) - commission * quantities * exit_price)
+    return pnl
+
+
+class VectorizedBacktester:
+    """
+    Evaluates momentum, mean-reversion and breakout rules over whole histories.
+    Each strategy trades its own book (one position per symbol) with a fixed
+    notional of initial_capital * max_position_size * the strategy's size multiplier.
+    """
+    
+    def __init__(self, config: Optional[DecisionEngineConfig] = None, initial_capital: float = 100000.0,
+                 commission: float = 0.0, slippage: float = 0.0, warmup_bars: int = 50,
+                 strategies: Optional[List[StrategyType]] = None):
+        self.config = config or DecisionEngineConfig()
+        self.logger = logging.getLogger(__name__)
+        
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.warmup_bars = warmup_bars
+        self.strategies = strategies or list(VECTORIZED_STRATEGIES)
+        
+        # Indicator histories depend only on the data and the indicator parameters
+        self._indicator_cache: Dict[Tuple, Dict[str, np.ndarray]] = {}
+    
+    def indicators(self, symbol: str, arrays: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Per-bar indicators for a symbol, cached across parameter changes that do not affect them"""
+        timestamps = arrays['timestamp']
+        key = (symbol, self.config.bb_std_dev, self.config.breakout_period,
+               len(timestamps), int(timestamps[0]), int(timestamps[-1]))
+        if key not in self._indicator_cache:
+            engine = IndicatorEngine({
+                'bb_std_dev': self.config.bb_std_dev,
+                'breakout_period': self.config.breakout_period
+            })
+            self._indicator_cache[key] = engine.compute_history(
+                arrays['close'], arrays['high'], arrays['low'], arrays['volume']
+            )
+        return self._indicator_cache[key]
+    
+    def run(self, data: Dict[str, Dict[str, np.ndarray]], config: Optional[DecisionEngineConfig] = None,
+            weights: Optional[Dict[StrategyType, float]] = None) -> VectorizedResult:
+        """
+        Backtest every symbol and strategy; `config` overrides the parameters for this run.
+        `weights` scale each strategy's notional, and strategies weighted 0 are skipped.
+        """
+        started = time.perf_counter()
+        if config is not None:
+            self.config = config
+        weights = weights or {}
+        strategies = [strategy for strategy in self.strategies if weights.get(strategy, 1.0) > 0]
+        
+        records = []
+        curves = []
+        for symbol, arrays in data.items():
+            if len(arrays['close']) < 2:
+                continue
+            ind = self.indicators(symbol, arrays)
+            
+            for strategy in strategies:
+                masks = strategy_masks(strategy, ind, self.config)
+                trades = simulate_trades(
+                    arrays['open'], arrays['high'], arrays['low'], arrays['close'],
+                    masks, first_bar=max(self.warmup_bars - 1, 0), slippage=self.slippage
+                )
+                if not trades:
+                    continue
+                
+                notional = (self.initial_capital * self.config.max_position_size *
+                            VECTORIZED_STRATEGIES[strategy] * weights.get(strategy, 1.0))
+                entry_prices = np.array([trade[3] for trade in trades])
+                quantities = notional / entry_prices
+                curves.append((arrays['timestamp'], trade_pnl_curve(arrays['close'], trades, quantities, self.commission)))
+                
+                timestamps = arrays['timestamp']
+                for (entry_bar, exit_bar, direction, entry_price, exit_price, reason), quantity in zip(trades, quantities):
+                    pnl = direction * (exit_price - entry_price) * quantity - self.commission * quantity * (entry_price + exit_price)
+                    records.append({
+                        'symbol': symbol,
+                        'strategy': strategy.value,
+                        'side': 'long' if direction > 0 else 'short',
+                        'quantity': quantity,
+                        'entry_time': timestamps[entry_bar],
+                        'entry_price': entry_price,
+                        'exit_time': timestamps[exit_bar],
+                        'exit_price': exit_price,
+                        'pnl': pnl,
+                        'return': pnl / (entry_price * quantity),
+                        'exit_reason': reason
+                    })
+        
+        equity = self._combine_curves(data, curves)
+        trades = pd.DataFrame.from_records(records)
+        if not trades.empty:
+            trades['entry_time'] = pd.to_datetime(trades['entry_time'], unit='ns')
+            trades['exit_time'] = pd.to_datetime(trades['exit_time'], unit='ns')
+        
+        metrics = compute_performance(equity, records, self.initial_capital)
+        metrics['elapsed_seconds'] = time.perf_counter() - started
+        strategy_metrics = {}
+        if not trades.empty:
+            for strategy, group in trades.groupby('strategy'):
+                pnl = group['pnl'].to_numpy()
+                losses = -pnl[pnl < 0].sum()
+                strategy_metrics[strategy] = {
+                    'total_trades': len(pnl),
+                    'total_pnl': float(pnl.sum()),
+                    'win_rate': float(np.mean(pnl > 0)),
+                    'profit_factor': float(pnl[pnl > 0].sum() / losses) if losses > 0 else float('inf')
+                }
+        
+        return VectorizedResult(trades, equity, metrics, strategy_metrics)
+    
+    def _combine_curves(self, data: Dict[str, Dict[str, np.ndarray]], curves: List[Tuple[np.ndarray, np.ndarray]]) -> pd.Series:
+        """Sum per-symbol PnL onto the union timeline as an equity curve"""
+        if not data:
+            return pd.Series(dtype=float, name='equity')
+        
+        timeline = np.unique(np.concatenate([arrays['timestamp'] for arrays in data.values()]))
+        total = np.zeros(len(timeline))
+        for timestamps, pnl in curves:
+            np.add.at(total, np.searchsorted(timeline, timestamps), pnl)
+        
+        return pd.Series(self.initial_capital + np.cumsum(total), index=pd.to_datetime(timeline, unit='ns'), name='equity')
@@ -10,10 +10,12 @@ from .autonomous_agent import AutonomousAgent
 from .self_manager import SelfManager
 from .decision_engine import DecisionEngine
 from .risk_manager import RiskManager
+from .executor import ComputeExecutor
 
 __all__ = [
     "AutonomousAgent",
     "SelfManager", 
     "DecisionEngine",
-    "RiskManager"
+    "RiskManager",
+    "ComputeExecutor"
 ]
@@ -133,14 +133,15 @@ class AutonomousAgent:
     
     async def _trading_cycle(self) -> None:
         """Single trading cycle"""
-        # Get market data
-        market_data = await self.market_data.get_latest_data()
+        # One snapshot per cycle, shared by reference with every consumer
+        snapshot = await self.market_data.get_snapshot()
+        await self.metrics.record_market_snapshot(snapshot)
         
         # Generate signals
-        signals = await self.decision_engine.generate_signals(market_data)
+        signals = await self.decision_engine.generate_signals(snapshot)
         
         # Apply risk management
-        filtered_signals = await self.risk_manager.filter_signals(signals)
+        filtered_signals = await self.risk_manager.filter_signals(signals, snapshot)
         
         # Execute trades
         if filtered_signals:
@@ -294,8 +295,8 @@ class AutonomousAgent:
         """Retrain models with latest data"""
         self.logger.info("Retraining models...")
         
-        # Get latest training data
-        training_data = await self.market_data.get_training_data()
+        # Latest training data, streamed in symbol chunks
+        training_data = self.market_data.iter_training_batches()
         
         # Retrain models
         new_models = await self.decision_engine.retrain_models(training_data)
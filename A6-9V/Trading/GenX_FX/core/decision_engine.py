@@ -17,6 +17,15 @@ from sklearn.neural_network import MLPRegressor
 from sklearn.preprocessing import StandardScaler
 import xgboost as xgb
 
+from .executor import ComputeExecutor, ExecutorConfig, ExecutorType
+from data.feature_store import FeatureStore
+from data.training_set import TrainingSetBuilder
+from data.snapshot import MarketSnapshot
+from data.indicators import (
+    IndicatorCache, IndicatorEngine, IndicatorSnapshot,
+    batch_bollinger_bands, batch_ema, batch_macd, batch_rsi, batch_sma, stack_series
+)
+
 # Import statements moved to avoid circular imports
 
 
@@ -65,6 +74,70 @@ class DecisionEngineConfig:
     model_ensemble_size: int = 5
     adaptive_learning: bool = True
     strategy_weights: Dict[StrategyType, float] = None
+    training_executor: ExecutorType = ExecutorType.PROCESS
+    inference_executor: ExecutorType = ExecutorType.THREAD
+    executor_workers: Optional[int] = None  # defaults to the number of CPUs
+    training_cache_path: Optional[str] = None  # memory-mapped training set cache
+    # Rule-based strategy parameters
+    rsi_oversold: float = 30.0
+    rsi_overbought: float = 70.0
+    bb_std_dev: float = 2.0
+    breakout_period: int = 20
+    breakout_volume_multiplier: float = 1.5
+    stop_loss_pct: float = 0.02
+    take_profit_pct: float = 0.05
+
+
+# Module-level so they can be shipped to a process pool
+
+def create_ensemble_model(index: int):
+    """Create a model for the ensemble"""
+    if index % 3 == 0:
+        return RandomForestRegressor(n_estimators=100, random_state=42)
+    elif index % 3 == 1:
+        return GradientBoostingRegressor(n_estimators=100, random_state=42)
+    else:
+        return MLPRegressor(hidden_layer_sizes=(100, 50), random_state=42)
+
+
+def fit_ensemble_member(index: int, X: np.ndarray, y: np.ndarray) -> Tuple[Any, StandardScaler]:
+    """Fit one ensemble member and its scaler"""
+    model = create_ensemble_model(index)
+    scaler = StandardScaler()
+    
+    X_scaled = scaler.fit_transform(X)
+    model.fit(X_scaled, y)
+    
+    return model, scaler
+
+
+def predict_ensemble(members: List[Tuple[str, Any, Any]], features: np.ndarray) -> Tuple[List[np.ndarray], List[np.ndarray], List[Tuple[str, str]]]:
+    """Run each (name, model, scaler) member once over a feature matrix"""
+    predictions = []
+    confidences = []
+    errors = []
+    
+    for model_name, model, scaler in members:
+        try:
+            # Scale features
+            scaled_features = scaler.transform(features)
+            
+            # Get prediction
+            prediction = np.asarray(model.predict(scaled_features), dtype=float)
+            
+            if hasattr(model, 'predict_proba'):
+                probabilities = np.asarray(model.predict_proba(scaled_features), dtype=float)
+                confidence = probabilities.max(axis=1) if probabilities.ndim == 2 else probabilities
+            else:
+                confidence = np.full(len(features), 0.5)
+            
+            predictions.append(prediction)
+            confidences.append(confidence)
+            
+        except Exception as e:
+            errors.append((model_name, str(e)))
+    
+    return predictions, confidences, errors
 
 
 class DecisionEngine:
@@ -97,6 +170,34 @@ class DecisionEngine:
         self.scalers = {}
         self.feature_importance = {}
         
+        # Vectorized indicators shared by all strategies, memoized per symbol and bar
+        self.indicator_engine = self._create_indicator_engine()
+        self.indicator_cache = IndicatorCache()
+        self.indicator_params = self.indicator_engine.params_key
+        self.default_indicator_params = IndicatorEngine().params_key
+        
+        # One feature pipeline for training (batch) and live inference (streaming)
+        self.feature_store = FeatureStore({'pipeline': {'lookback': config.lookback_period}})
+        self.feature_pipeline = self.feature_store.pipeline
+        
+        # Training set construction
+        self.training_set_builder = TrainingSetBuilder({
+            'window': config.feature_window,
+            'cache_path': config.training_cache_path
+        }, pipeline=self.feature_pipeline)
+        
+        # Pools that keep training and inference off the event loop
+        self.training_executor = ComputeExecutor(ExecutorConfig(
+            executor_type=config.training_executor,
+            max_workers=config.executor_workers,
+            name="training"
+        ))
+        self.inference_executor = ComputeExecutor(ExecutorConfig(
+            executor_type=config.inference_executor,
+            max_workers=config.executor_workers,
+            name="inference"
+        ))
+        
         # Performance tracking
         self.signal_history = []
         self.strategy_performance = {}
@@ -137,19 +238,32 @@ class DecisionEngine:
             return False
     
     async def generate_signals(self, market_data: Dict[str, Any]) -> List[TradingSignal]:
-        """Generate trading signals from market data"""
+        """Generate trading signals from a MarketSnapshot (or a dict in the same layout)"""
         try:
             signals = []
             
             # Get symbols to analyze
             symbols = market_data.get('symbols', [])
             
+            # Indicator snapshots for all symbols, recomputing only those with a new bar
+            snapshots = self._calculate_indicator_batch(symbols, market_data)
+            
+            # ML predictions for all symbols, one call per ensemble member
+            ml_predictions = None
+            if StrategyType.ML_PREDICTION in self.config.strategy_weights:
+                ml_predictions = await self._predict_ml_batch(symbols, market_data, snapshots)
+            
             for symbol in symbols:
                 # Get symbol data
                 symbol_data = market_data.get(symbol, {})
                 
+                # Symbols missing from the batch result have no prediction this cycle
+                ml_prediction = ml_predictions.get(symbol, {}) if ml_predictions is not None else None
+                
                 # Generate signals for each strategy
-                strategy_signals = await self._generate_strategy_signals(symbol, symbol_data)
+                strategy_signals = await self._generate_strategy_signals(
+                    symbol, symbol_data, snapshots.get(symbol), ml_prediction
+                )
                 signals.extend(strategy_signals)
             
             # Filter and rank signals
@@ -169,29 +283,137 @@ class DecisionEngine:
             self.logger.error(f"Error generating signals: {e}")
             return []
     
-    async def _generate_strategy_signals(self, symbol: str, data: Dict[str, Any]) -> List[TradingSignal]:
+    def _calculate_indicator_batch(self, symbols: List[str], market_data: Dict[str, Any]) -> Dict[str, IndicatorSnapshot]:
+        """Get indicator snapshots for every symbol with price history"""
+        try:
+            snapshots = {}
+            pending = []
+            
+            for symbol in symbols:
+                symbol_data = market_data.get(symbol, {})
+                if not self._has_price_data(symbol_data):
+                    continue
+                
+                bar_key = self._bar_key(symbol_data)
+                snapshot = self.indicator_cache.get(symbol, bar_key)
+                if snapshot is not None:
+                    snapshots[symbol] = snapshot
+                elif symbol_data.get('indicators') is not None and self._accepts_attached_indicators(symbol_data):
+                    # Maintained incrementally by the market data manager
+                    snapshots[symbol] = self.indicator_cache.put(symbol, bar_key, symbol_data['indicators'])
+                else:
+                    pending.append((symbol, bar_key))
+            
+            if pending and isinstance(market_data, MarketSnapshot):
+                # Rows of the snapshot matrices are already aligned and padded
+                rows = [market_data.row(symbol) for symbol, _ in pending]
+                values = self.indicator_engine.compute_for_rows(
+                    market_data.close[rows], market_data.high[rows], market_data.low[rows], market_data.volume[rows]
+                )
+            elif pending:
+                columns = {
+                    name: [market_data[symbol].get(name, []) for symbol, _ in pending]
+                    for name in ('close', 'high', 'low', 'volume')
+                }
+                values = self.indicator_engine.compute_for_series(
+                    columns['close'], columns['high'], columns['low'], columns['volume']
+                )
+            
+            if pending:
+                for (symbol, bar_key), symbol_values in zip(pending, values):
+                    snapshots[symbol] = self.indicator_cache.put(symbol, bar_key, symbol_values)
+            
+            return snapshots
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating indicator batch: {e}")
+            return {}
+    
+    def _get_indicator_snapshot(self, symbol: str, data: Dict[str, Any]) -> Optional[IndicatorSnapshot]:
+        """Get the memoized indicator snapshot for a single symbol"""
+        if not self._has_price_data(data):
+            return None
+        
+        bar_key = self._bar_key(data)
+        snapshot = self.indicator_cache.get(symbol, bar_key)
+        
+        if snapshot is None:
+            values = data.get('indicators') if self._accepts_attached_indicators(data) else None
+            values = values or self._calculate_indicators(data)
+            if values is None:
+                return None
+            snapshot = self.indicator_cache.put(symbol, bar_key, values)
+        
+        return snapshot
+    
+    def _create_indicator_engine(self) -> IndicatorEngine:
+        """Indicator engine configured with the strategy parameters"""
+        return IndicatorEngine({
+            'bb_std_dev': self.config.bb_std_dev,
+            'breakout_period': self.config.breakout_period
+        })
+    
+    def _accepts_attached_indicators(self, data: Dict[str, Any]) -> bool:
+        """Whether attached indicators were computed with this engine's parameters (unlabelled ones use defaults)"""
+        params = data.get('indicator_params')
+        if params is None:
+            params = self.default_indicator_params
+        return params == self.indicator_params
+    
+    def _has_price_data(self, data: Dict[str, Any]) -> bool:
+        """Whether indicators can be derived for this symbol data"""
+        if data.get('indicators') is not None:
+            return True
+        closes = data.get('close')
+        return hasattr(closes, '__len__') and len(closes) > 0
+    
+    def _bar_key(self, data: Dict[str, Any]) -> Tuple:
+        """Identify the latest bar in symbol data; changes whenever a new bar arrives"""
+        closes = data.get('close')
+        timestamp = data.get('timestamp')
+        
+        if isinstance(timestamp, (list, tuple, np.ndarray, pd.Index)):
+            timestamp = timestamp[-1] if len(timestamp) > 0 else None
+        
+        if isinstance(closes, (list, tuple, np.ndarray)):
+            return (len(closes), closes[-1] if len(closes) > 0 else None, timestamp)
+        
+        return (closes, timestamp)
+    
+    def _calculate_indicators(self, data: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """Calculate strategy indicators for a single symbol"""
+        if len(data.get('close', [])) == 0:
+            return None
+        
+        return self.indicator_engine.compute_for_series(
+            [data['close']], [data.get('high', [])], [data.get('low', [])], [data.get('volume', [])]
+        )[0]
+    
+    async def _generate_strategy_signals(self, symbol: str, data: Dict[str, Any],
+                                         indicators: Optional[IndicatorSnapshot] = None,
+                                         ml_prediction: Optional[Dict[str, Any]] = None) -> List[TradingSignal]:
         """Generate signals for a symbol using all strategies"""
         signals = []
         
         try:
             # ML Prediction signals
             if StrategyType.ML_PREDICTION in self.config.strategy_weights:
-                ml_signals = await self._generate_ml_signals(symbol, data)
+                ml_signals = await self._generate_ml_signals(symbol, data, indicators, ml_prediction)
                 signals.extend(ml_signals)
             
             # Momentum signals
             if StrategyType.MOMENTUM in self.config.strategy_weights:
-                momentum_signals = await self._generate_momentum_signals(symbol, data)
+                momentum_signals = await self._generate_momentum_signals(symbol, data, indicators)
                 signals.extend(momentum_signals)
             
             # Mean reversion signals
             if StrategyType.MEAN_REVERSION in self.config.strategy_weights:
-                mean_reversion_signals = await self._generate_mean_reversion_signals(symbol, data)
+                mean_reversion_signals = await self._generate_mean_reversion_signals(symbol, data, indicators)
                 signals.extend(mean_reversion_signals)
             
             # Breakout signals
             if StrategyType.BREAKOUT in self.config.strategy_weights:
-                breakout_signals = await self._generate_breakout_signals(symbol, data)
+                breakout_signals = await self._generate_breakout_signals(symbol, data, indicators)
                 signals.extend(breakout_signals)
             
             # Arbitrage signals
@@ -204,42 +426,79 @@ class DecisionEngine:
         
         return signals
     
-    async def _generate_ml_signals(self, symbol: str, data: Dict[str, Any]) -> List[TradingSignal]:
+    async def _predict_ml_batch(self, symbols: List[str], market_data: Dict[str, Any],
+                                snapshots: Optional[Dict[str, IndicatorSnapshot]] = None) -> Dict[str, Dict[str, Any]]:
+        """Run every ensemble member once over the stacked features of all symbols"""
+        try:
+            snapshots = snapshots or {}
+            ensemble = [(name, model) for name, model in self.models.items() if name.startswith('ensemble_')]
+            if not ensemble:
+                return {}
+            
+            # Stack one feature row per symbol
+            rows = []
+            row_symbols = []
+            for symbol in symbols:
+                features = await self._prepare_features(symbol, market_data.get(symbol, {}), snapshots.get(symbol))
+                # Rows with masked (NaN) features, e.g. time features without a timestamp, are not scored
+                if features is not None and len(features) > 0 and np.isfinite(features[0]).all():
+                    rows.append(features[0])
+                    row_symbols.append(symbol)
+            
+            if not rows:
+                return {}
+            
+            feature_matrix = np.vstack(rows)
+            
+            # Get predictions from ensemble models, one call per model for all symbols,
+            # evaluated in the inference pool so the event loop keeps running
+            members = [
+                (model_name, model, self.scalers.get(f"{model_name}_scaler", StandardScaler()))
+                for model_name, model in ensemble
+            ]
+            predictions, confidences, errors = await self.inference_executor.run(
+                predict_ensemble, members, feature_matrix
+            )
+            
+            for model_name, error in errors:
+                self.logger.warning(f"Error with model {model_name}: {error}")
+            
+            if not predictions:
+                return {}
+            
+            # Ensemble prediction per symbol
+            avg_predictions = np.mean(predictions, axis=0)
+            avg_confidences = np.mean(confidences, axis=0)
+            
+            return {
+                symbol: {
+                    'prediction': float(avg_predictions[row]),
+                    'confidence': float(avg_confidences[row]),
+                    'model_count': len(predictions),
+                    'features_used': feature_matrix.shape[1]
+                }
+                for row, symbol in enumerate(row_symbols)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error running batched ML inference: {e}")
+            return {}
+    
+    async def _generate_ml_signals(self, symbol: str, data: Dict[str, Any],
+                                   indicators: Optional[IndicatorSnapshot] = None,
+                                   ml_prediction: Optional[Dict[str, Any]] = None) -> List[TradingSignal]:
         """Generate ML-based trading signals"""
         signals = []
         
         try:
-            # Prepare features
-            features = await self._prepare_features(symbol, data)
-            
-            if features is None or len(features) == 0:
-                return signals
-            
-            # Get predictions from ensemble models
-            predictions = []
-            confidences = []
-            
-            for model_name, model in self.models.items():
-                if model_name.startswith('ensemble_'):
-                    try:
-                        # Scale features
-                        scaled_features = self.scalers.get(f"{model_name}_scaler", StandardScaler()).transform(features)
-                        
-                        # Get prediction
-                        prediction = model.predict(scaled_features)
-                        confidence = model.predict_proba(scaled_features) if hasattr(model, 'predict_proba') else [0.5]
-                        
-                        predictions.append(prediction[0])
-                        confidences.append(confidence[0] if isinstance(confidence[0], (list, np.ndarray)) else confidence[0])
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Error with model {model_name}: {e}")
-                        continue
-            
-            if predictions:
-                # Ensemble prediction
-                avg_prediction = np.mean(predictions)
-                avg_confidence = np.mean(confidences)
+            if ml_prediction is None:
+                ml_prediction = (await self._predict_ml_batch(
+                    [symbol], {symbol: data}, {symbol: indicators} if indicators is not None else None
+                )).get(symbol)
+            
+            if ml_prediction:
+                avg_prediction = ml_prediction['prediction']
+                avg_confidence = ml_prediction['confidence']
                 
                 # Generate signal based on prediction
                 if avg_confidence > self.config.min_confidence:
@@ -250,7 +509,7 @@ class DecisionEngine:
                         signal_type=signal_type,
                         confidence=avg_confidence,
                         strength=abs(avg_prediction - 0.5) * 2,
-                        entry_price=data.get('close', 0),
+                        entry_price=data['close'][-1],
                         stop_loss=self._calculate_stop_loss(data, signal_type),
                         take_profit=self._calculate_take_profit(data, signal_type),
                         position_size=self._calculate_position_size(avg_confidence),
@@ -258,8 +517,8 @@ class DecisionEngine:
                         timestamp=datetime.now(),
                         metadata={
                             'prediction': avg_prediction,
-                            'model_count': len(predictions),
-                            'features_used': len(features[0]) if features else 0
+                            'model_count': ml_prediction['model_count'],
+                            'features_used': ml_prediction['features_used']
                         }
                     )
                     
@@ -270,28 +529,34 @@ class DecisionEngine:
         
         return signals
     
-    async def _generate_momentum_signals(self, symbol: str, data: Dict[str, Any]) -> List[TradingSignal]:
+    async def _generate_momentum_signals(self, symbol: str, data: Dict[str, Any],
+                                         indicators: Optional[IndicatorSnapshot] = None) -> List[TradingSignal]:
         """Generate momentum-based signals"""
         signals = []
         
         try:
-            # Calculate momentum indicators
-            rsi = self._calculate_rsi(data.get('close', []))
-            macd = self._calculate_macd(data.get('close', []))
-            sma_20 = self._calculate_sma(data.get('close', []), 20)
-            sma_50 = self._calculate_sma(data.get('close', []), 50)
+            if indicators is None:
+                indicators = self._get_indicator_snapshot(symbol, data)
+            if indicators is None:
+                return signals
+            
+            # Momentum indicators
+            rsi = indicators['rsi']
+            macd = indicators['macd']
+            sma_20 = indicators['sma_20']
+            sma_50 = indicators['sma_50']
             
-            current_price = data.get('close', [0])[-1] if data.get('close') else 0
+            current_price = indicators['close']
             
             # Momentum conditions
             bullish_momentum = (
-                rsi > 30 and rsi < 70 and  # Not overbought/oversold
+                rsi > self.config.rsi_oversold and rsi < self.config.rsi_overbought and  # Not overbought/oversold
                 macd > 0 and  # MACD above zero line
                 current_price > sma_20 > sma_50  # Price above moving averages
             )
             
             bearish_momentum = (
-                rsi < 70 and rsi > 30 and  # Not overbought/oversold
+                rsi < self.config.rsi_overbought and rsi > self.config.rsi_oversold and  # Not overbought/oversold
                 macd < 0 and  # MACD below zero line
                 current_price < sma_20 < sma_50  # Price below moving averages
             )
@@ -303,8 +568,8 @@ class DecisionEngine:
                     confidence=min(rsi / 100, 0.8),
                     strength=abs(macd) / 100,
                     entry_price=current_price,
-                    stop_loss=current_price * 0.98,
-                    take_profit=current_price * 1.05,
+                    stop_loss=current_price * (1 - self.config.stop_loss_pct),
+                    take_profit=current_price * (1 + self.config.take_profit_pct),
                     position_size=self.config.max_position_size * 0.5,
                     strategy=StrategyType.MOMENTUM,
                     timestamp=datetime.now(),
@@ -324,8 +589,8 @@ class DecisionEngine:
                     confidence=min((100 - rsi) / 100, 0.8),
                     strength=abs(macd) / 100,
                     entry_price=current_price,
-                    stop_loss=current_price * 1.02,
-                    take_profit=current_price * 0.95,
+                    stop_loss=current_price * (1 + self.config.stop_loss_pct),
+                    take_profit=current_price * (1 - self.config.take_profit_pct),
                     position_size=self.config.max_position_size * 0.5,
                     strategy=StrategyType.MOMENTUM,
                     timestamp=datetime.now(),
@@ -343,20 +608,28 @@ class DecisionEngine:
         
         return signals
     
-    async def _generate_mean_reversion_signals(self, symbol: str, data: Dict[str, Any]) -> List[TradingSignal]:
+    async def _generate_mean_reversion_signals(self, symbol: str, data: Dict[str, Any],
+                                               indicators: Optional[IndicatorSnapshot] = None) -> List[TradingSignal]:
         """Generate mean reversion signals"""
         signals = []
         
         try:
-            # Calculate mean reversion indicators
-            bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(data.get('close', []))
-            rsi = self._calculate_rsi(data.get('close', []))
+            if indicators is None:
+                indicators = self._get_indicator_snapshot(symbol, data)
+            if indicators is None:
+                return signals
             
-            current_price = data.get('close', [0])[-1] if data.get('close') else 0
+            # Mean reversion indicators
+            bb_upper = indicators['bb_upper']
+            bb_middle = indicators['bb_middle']
+            bb_lower = indicators['bb_lower']
+            rsi = indicators['rsi']
+            
+            current_price = indicators['close']
             
             # Mean reversion conditions
-            oversold = current_price <= bb_lower and rsi < 30
-            overbought = current_price >= bb_upper and rsi > 70
+            oversold = current_price <= bb_lower and rsi < self.config.rsi_oversold
+            overbought = current_price >= bb_upper and rsi > self.config.rsi_overbought
             
             if oversold:
                 signal = TradingSignal(
@@ -405,27 +678,33 @@ class DecisionEngine:
         
         return signals
     
-    async def _generate_breakout_signals(self, symbol: str, data: Dict[str, Any]) -> List[TradingSignal]:
+    async def _generate_breakout_signals(self, symbol: str, data: Dict[str, Any],
+                                         indicators: Optional[IndicatorSnapshot] = None) -> List[TradingSignal]:
         """Generate breakout signals"""
         signals = []
         
         try:
-            # Calculate breakout indicators
-            high_20 = max(data.get('high', [0])[-20:]) if len(data.get('high', [])) >= 20 else 0
-            low_20 = min(data.get('low', [0])[-20:]) if len(data.get('low', [])) >= 20 else 0
-            current_price = data.get('close', [0])[-1] if data.get('close') else 0
-            volume = data.get('volume', [0])[-1] if data.get('volume') else 0
-            avg_volume = np.mean(data.get('volume', [0])[-20:]) if len(data.get('volume', [])) >= 20 else volume
+            if indicators is None:
+                indicators = self._get_indicator_snapshot(symbol, data)
+            if indicators is None:
+                return signals
+            
+            # Breakout indicators
+            high_20 = indicators['breakout_high']
+            low_20 = indicators['breakout_low']
+            current_price = indicators['close']
+            volume = indicators['volume']
+            avg_volume = indicators['avg_volume']
             
             # Breakout conditions
             bullish_breakout = (
                 current_price > high_20 and  # Price breaks above 20-day high
-                volume > avg_volume * 1.5  # Volume confirmation
+                volume > avg_volume * self.config.breakout_volume_multiplier  # Volume confirmation
             )
             
             bearish_breakout = (
                 current_price < low_20 and  # Price breaks below 20-day low
-                volume > avg_volume * 1.5  # Volume confirmation
+                volume > avg_volume * self.config.breakout_volume_multiplier  # Volume confirmation
             )
             
             if bullish_breakout:
@@ -518,65 +797,24 @@ class DecisionEngine:
         
         return signals
     
-    async def _prepare_features(self, symbol: str, data: Dict[str, Any]) -> Optional[np.ndarray]:
+    async def _prepare_features(self, symbol: str, data: Dict[str, Any],
+                                indicators: Optional[IndicatorSnapshot] = None) -> Optional[np.ndarray]:
         """Prepare features for ML models"""
         try:
-            if not data.get('close') or len(data['close']) < self.config.lookback_period:
-                return None
-            
-            # Get price data
-            prices = np.array(data['close'][-self.config.lookback_period:])
-            volumes = np.array(data.get('volume', [0])[-self.config.lookback_period:])
-            
-            # Calculate technical indicators
-            features = []
-            
-            # Price features
-            features.extend([
-                prices[-1],  # Current price
-                np.mean(prices),  # Mean price
-                np.std(prices),  # Price volatility
-                (prices[-1] - prices[0]) / prices[0],  # Total return
-            ])
-            
-            # Moving averages
-            for period in [5, 10, 20, 50]:
-                if len(prices) >= period:
-                    sma = np.mean(prices[-period:])
-                    features.append(sma)
-                    features.append((prices[-1] - sma) / sma)  # Price vs SMA
-                else:
-                    features.extend([0, 0])
-            
-            # Technical indicators
-            rsi = self._calculate_rsi(prices)
-            macd = self._calculate_macd(prices)
-            bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(prices)
-            
-            features.extend([
-                rsi,
-                macd,
-                (prices[-1] - bb_lower) / (bb_upper - bb_lower) if bb_upper != bb_lower else 0.5,
-            ])
-            
-            # Volume features
-            if len(volumes) > 0:
-                features.extend([
-                    volumes[-1],
-                    np.mean(volumes),
-                    np.std(volumes),
-                ])
-            else:
-                features.extend([0, 0, 0])
+            # Streaming row maintained by MarketDataManager, if it was built by the same pipeline
+            features = data.get('features')
+            names = self.feature_pipeline.feature_names
+            if isinstance(features, dict) and all(name in features for name in names):
+                return np.array([features[name] for name in names]).reshape(1, -1)
             
-            # Time features
-            now = datetime.now()
-            features.extend([
-                now.hour / 24,  # Hour of day
-                now.weekday() / 7,  # Day of week
-            ])
+            if len(data.get('close', [])) < self.config.lookback_period:
+                return None
             
-            return np.array(features).reshape(1, -1)
+            # Batch mode over the trailing history, identical columns to training
+            timestamps = data.get('timestamp')
+            if not hasattr(timestamps, '__len__') or isinstance(timestamps, str):
+                timestamps = None
+            return self.feature_pipeline.transform_latest(data['close'], data.get('volume'), timestamps)
             
         except Exception as e:
             self.logger.error(f"Error preparing features for {symbol}: {e}")
@@ -625,21 +863,21 @@ class DecisionEngine:
     
     def _calculate_stop_loss(self, data: Dict[str, Any], signal_type: SignalType) -> float:
         """Calculate stop loss price"""
-        current_price = data.get('close', [0])[-1] if data.get('close') else 0
+        current_price = data['close'][-1] if len(data.get('close', [])) > 0 else 0
         
         if signal_type == SignalType.BUY:
-            return current_price * 0.98  # 2% stop loss
+            return current_price * (1 - self.config.stop_loss_pct)
         else:
-            return current_price * 1.02  # 2% stop loss
+            return current_price * (1 + self.config.stop_loss_pct)
     
     def _calculate_take_profit(self, data: Dict[str, Any], signal_type: SignalType) -> float:
         """Calculate take profit price"""
-        current_price = data.get('close', [0])[-1] if data.get('close') else 0
+        current_price = data['close'][-1] if len(data.get('close', [])) > 0 else 0
         
         if signal_type == SignalType.BUY:
-            return current_price * 1.05  # 5% take profit
+            return current_price * (1 + self.config.take_profit_pct)
         else:
-            return current_price * 0.95  # 5% take profit
+            return current_price * (1 - self.config.take_profit_pct)
     
     def _calculate_position_size(self, confidence: float) -> float:
         """Calculate position size based on confidence"""
@@ -647,66 +885,27 @@ class DecisionEngine:
         confidence_multiplier = confidence
         return min(base_size * confidence_multiplier, self.config.max_position_size)
     
-    # Technical indicator calculations
+    # Technical indicator calculations (single-symbol wrappers around the batch engine)
     def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Calculate RSI"""
-        if len(prices) < period + 1:
-            return 50
-        
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return float(batch_rsi(stack_series([prices]), period)[0])
     
     def _calculate_macd(self, prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> float:
         """Calculate MACD"""
-        if len(prices) < slow:
-            return 0
-        
-        ema_fast = self._calculate_ema(prices, fast)
-        ema_slow = self._calculate_ema(prices, slow)
-        return ema_fast - ema_slow
+        return float(batch_macd(stack_series([prices]), fast, slow)[0])
     
     def _calculate_ema(self, prices: List[float], period: int) -> float:
         """Calculate EMA"""
-        if len(prices) < period:
-            return prices[-1]
-        
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        
-        return ema
+        return float(batch_ema(stack_series([prices]), period)[0])
     
     def _calculate_sma(self, prices: List[float], period: int) -> float:
         """Calculate SMA"""
-        if len(prices) < period:
-            return prices[-1]
-        return np.mean(prices[-period:])
+        return float(batch_sma(stack_series([prices]), period)[0])
     
     def _calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: float = 2) -> Tuple[float, float, float]:
         """Calculate Bollinger Bands"""
-        if len(prices) < period:
-            return prices[-1], prices[-1], prices[-1]
-        
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:])
-        
-        upper = sma + (std * std_dev)
-        lower = sma - (std * std_dev)
-        
-        return upper, sma, lower
+        upper, middle, lower = batch_bollinger_bands(stack_series([prices]), period, std_dev)
+        return float(upper[0]), float(middle[0]), float(lower[0])
     
     async def _load_models(self) -> None:
         """Load trained models"""
@@ -765,36 +964,42 @@ class DecisionEngine:
                 self.logger.error(f"Error in adaptive learning loop: {e}")
                 await asyncio.sleep(3600)
     
-    async def _retrain_models(self) -> None:
+    async def retrain_models(self, training_data: Optional[Any] = None) -> Dict[str, Any]:
+        """Retrain the ensemble and return the new models keyed by name"""
+        return await self._retrain_models(training_data)
+    
+    async def _retrain_models(self, training_data: Optional[Any] = None) -> Dict[str, Any]:
         """Retrain models with latest data"""
+        trained_models = {}
+        
         try:
             self.is_learning = True
             self.logger.info("Starting model retraining...")
             
-            # Get latest training data
-            training_data = await self.market_data.get_training_data()
+            # Stream the latest training data chunk by chunk
+            if training_data is None:
+                training_data = self.market_data.iter_training_batches()
             
             # Prepare features and targets
             X, y = await self._prepare_training_data(training_data)
             
             if X is not None and y is not None:
-                # Retrain ensemble models
-                for i in range(self.config.model_ensemble_size):
+                # Fit all ensemble members in parallel off the event loop
+                results = await self.training_executor.map(
+                    fit_ensemble_member,
+                    [(i, X, y) for i in range(self.config.model_ensemble_size)]
+                )
+                
+                for i, (model, scaler) in enumerate(results):
                     model_name = f"ensemble_{i}"
                     
-                    # Create and train model
-                    model = self._create_model(i)
-                    scaler = StandardScaler()
-                    
-                    X_scaled = scaler.fit_transform(X)
-                    model.fit(X_scaled, y)
-                    
                     # Save model and scaler
                     await self.model_registry.save_model(model_name, model)
                     await self.model_registry.save_scaler(f"{model_name}_scaler", scaler)
                     
                     self.models[model_name] = model
                     self.scalers[f"{model_name}_scaler"] = scaler
+                    trained_models[model_name] = model
                 
                 self.logger.info("Model retraining completed")
             
@@ -802,49 +1007,32 @@ class DecisionEngine:
             self.logger.error(f"Error retraining models: {e}")
         finally:
             self.is_learning = False
+        
+        return trained_models
     
     def _create_model(self, index: int):
         """Create a model for the ensemble"""
-        if index % 3 == 0:
-            return RandomForestRegressor(n_estimators=100, random_state=42)
-        elif index % 3 == 1:
-            return GradientBoostingRegressor(n_estimators=100, random_state=42)
-        else:
-            return MLPRegressor(hidden_layer_sizes=(100, 50), random_state=42)
+        return create_ensemble_model(index)
     
-    async def _prepare_training_data(self, data: Dict[str, Any]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Prepare training data for models"""
+    async def _prepare_training_data(self, data: Any) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Prepare training data for models (a symbol dict, TrainingBatch chunks, or an async stream of chunks)"""
         try:
-            # This is a simplified implementation
-            # In practice, you'd have more sophisticated feature engineering
-            features = []
-            targets = []
-            
-            # Process each symbol's data
-            for symbol, symbol_data in data.items():
-                if 'close' in symbol_data and len(symbol_data['close']) > 50:
-                    prices = symbol_data['close']
-                    
-                    # Create features and targets
-                    for i in range(20, len(prices) - 5):
-                        # Features (simplified)
-                        feature_vector = [
-                            prices[i],
-                            np.mean(prices[i-20:i]),
-                            np.std(prices[i-20:i]),
-                            (prices[i] - prices[i-1]) / prices[i-1] if prices[i-1] != 0 else 0
-                        ]
-                        
-                        # Target (future return)
-                        future_return = (prices[i+5] - prices[i]) / prices[i] if prices[i] != 0 else 0
-                        
-                        features.append(feature_vector)
-                        targets.append(1 if future_return > 0.01 else 0)  # Binary classification
-            
-            if features:
-                return np.array(features), np.array(targets)
-            else:
+            if not hasattr(data, '__aiter__'):
+                # Vectorized over all symbols; reuses a memory-mapped build when inputs are unchanged
+                return self.training_set_builder.build(data)
+            
+            # Only one chunk of histories is held at a time; each is reduced to its training rows
+            loop = asyncio.get_running_loop()
+            features, targets = [], []
+            async for batch in data:
+                X, y = await loop.run_in_executor(None, self.training_set_builder.build, batch)
+                if X is not None:
+                    features.append(X)
+                    targets.append(y)
+            
+            if not features:
                 return None, None
+            return np.concatenate(features), np.concatenate(targets)
                 
         except Exception as e:
             self.logger.error(f"Error preparing training data: {e}")
@@ -881,6 +1069,12 @@ class DecisionEngine:
                 if hasattr(self.config, key):
                     setattr(self.config, key, value)
             
+            # Indicator parameters changed: rebuild the engine and drop stale snapshots
+            if {'bb_std_dev', 'breakout_period'} & set(new_params):
+                self.indicator_engine = self._create_indicator_engine()
+                self.indicator_params = self.indicator_engine.params_key
+                self.indicator_cache.invalidate()
+            
             self.logger.info(f"Updated parameters: {new_params}")
             
         except Exception as e:
@@ -894,5 +1088,20 @@ class DecisionEngine:
             'last_retrain': self.last_retrain.isoformat(),
             'strategy_weights': self.config.strategy_weights,
             'strategy_performance': self.strategy_performance,
-            'signals_generated': len(self.signal_history)
+            'signals_generated': len(self.signal_history),
+            'indicator_cache': self.indicator_cache.get_stats(),
+            'executors': {
+                'training': self.training_executor.get_status(),
+                'inference': self.inference_executor.get_status()
+            }
         }
+    
+    async def shutdown(self) -> None:
+        """Shutdown decision engine worker pools"""
+        try:
+            self.training_executor.shutdown()
+            self.inference_executor.shutdown()
+            self.logger.info("Decision engine shutdown complete")
+            
+        except Exception as e:
+            self.logger.error(f"Error during shutdown: {e}")
@@ -0,0 +1,93 @@
+"""
+Compute Executor - Off-event-loop execution of CPU-bound work
+Runs model training and inference in a thread or process pool
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class ExecutorType(Enum):
+    """Pool implementations"""
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for a compute executor"""
+    executor_type: ExecutorType = ExecutorType.THREAD
+    max_workers: Optional[int] = None  # defaults to the number of CPUs
+    name: str = "compute"
+
+
+class ComputeExecutor:
+    """
+    Thin asyncio wrapper around a thread or process pool.
+    Callables submitted to a process pool must be picklable (module-level functions).
+    """
+    
+    def __init__(self, config: ExecutorConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        
+        self._executor: Optional[Executor] = None
+        self.tasks_submitted = 0
+        self.tasks_failed = 0
+    
+    @property
+    def max_workers(self) -> int:
+        return self.config.max_workers or os.cpu_count() or 1
+    
+    def _get_executor(self) -> Executor:
+        """Create the pool on first use"""
+        if self._executor is None:
+            if self.config.executor_type == ExecutorType.PROCESS:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"genx-{self.config.name}"
+                )
+            self.logger.info(
+                f"Started {self.config.executor_type.value} pool '{self.config.name}' "
+                f"with {self.max_workers} workers"
+            )
+        return self._executor
+    
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a callable in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        self.tasks_submitted += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs))
+        except Exception:
+            self.tasks_failed += 1
+            raise
+    
+    async def map(self, func: Callable, arguments: Iterable[Tuple]) -> List[Any]:
+        """Run a callable once per argument tuple in parallel, preserving order"""
+        return await asyncio.gather(*(self.run(func, *args) for args in arguments))
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get executor status"""
+        return {
+            'name': self.config.name,
+            'executor_type': self.config.executor_type.value,
+            'max_workers': self.max_workers,
+            'started': self._executor is not None,
+            'tasks_submitted': self.tasks_submitted,
+            'tasks_failed': self.tasks_failed
+        }
@@ -131,10 +131,13 @@ class RiskManager:
             self.logger.error(f"Failed to initialize risk manager: {e}")
             return False
     
-    async def filter_signals(self, signals: List[Dict]) -> List[Dict]:
-        """Filter trading signals based on risk criteria"""
+    async def filter_signals(self, signals: List[Dict], market_data: Optional[Any] = None) -> List[Dict]:
+        """Filter trading signals based on risk criteria, repricing positions from a MarketSnapshot first"""
         filtered_signals = []
         
+        if market_data is not None:
+            self.mark_to_market(market_data)
+        
         for signal in signals:
             try:
                 # Check if signal passes risk filters
@@ -150,6 +153,29 @@ class RiskManager:
         
         return filtered_signals
     
+    def mark_to_market(self, snapshot: Any) -> None:
+        """Update current prices and unrealized PnL of open positions from a MarketSnapshot"""
+        try:
+            held = [symbol for symbol in self.positions if snapshot.row(symbol) is not None]
+            if not held:
+                return
+            
+            prices = snapshot.latest('close')[[snapshot.row(symbol) for symbol in held]]
+            positions = [self.positions[symbol] for symbol in held]
+            entry = np.array([position.entry_price for position in positions])
+            size = np.array([position.size for position in positions])
+            direction = np.array([1.0 if position.side == 'long' else -1.0 for position in positions])
+            pnl = direction * (prices - entry) * size
+            
+            for position, price, position_pnl in zip(positions, prices.tolist(), pnl.tolist()):
+                if math.isnan(price):
+                    continue
+                position.current_price = price
+                position.unrealized_pnl = position_pnl
+            
+        except Exception as e:
+            self.logger.error(f"Error marking positions to market: {e}")
+    
     async def check_risk_limits(self, signal: Dict) -> bool:
         """Check if signal violates risk limits"""
         try:
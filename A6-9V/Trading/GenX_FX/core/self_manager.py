@@ -5,6 +5,7 @@ Handles self-improvement, updates, and autonomous decision making
 
 import asyncio
 import logging
+import math
 import json
 import hashlib
 from typing import Dict, List, Optional, Any, Tuple
@@ -77,6 +78,8 @@ class SelfManager:
         # Core components
         self.model_registry = None
         self.metrics = None
+        self.decision_engine = None
+        self.optimizer = None
         
         # State management
         self.improvements_queue = []
@@ -109,7 +112,7 @@ class SelfManager:
         except Exception as e:
             self.logger.error(f"Failed to initialize git repository: {e}")
     
-    async def initialize(self, model_registry=None, metrics=None) -> bool:
+    async def initialize(self, model_registry=None, metrics=None, decision_engine=None, optimizer=None) -> bool:
         """Initialize self-manager"""
         try:
             self.logger.info("Initializing self-manager...")
@@ -119,6 +122,10 @@ class SelfManager:
                 self.model_registry = model_registry
             if metrics:
                 self.metrics = metrics
+            if decision_engine:
+                self.decision_engine = decision_engine
+            if optimizer:
+                self.optimizer = optimizer
             
             # Load current state
             await self._load_state()
@@ -402,6 +409,8 @@ class SelfManager:
             
             # Calculate optimal strategy parameters
             optimal_strategy = await self._calculate_optimal_strategy(market_conditions)
+            if optimal_strategy is None:
+                return {'success': True, 'strategy_updated': False}
             
             # Update strategy configuration
             await self._update_strategy_configuration(optimal_strategy)
@@ -411,6 +420,37 @@ class SelfManager:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    async def _analyze_market_conditions(self) -> Dict[str, Any]:
+        """Load recent market history for strategy optimization"""
+        if self.optimizer is None:
+            raise RuntimeError("No parameter optimizer configured")
+        
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self.optimizer.load_data)
+        return {'data': data, 'symbols': list(data)}
+    
+    async def _calculate_optimal_strategy(self, market_conditions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Walk-forward optimize strategy parameters on recent history; None keeps the current ones"""
+        report = await self.optimizer.optimize(market_conditions.get('data'))
+        if report is None or not math.isfinite(report.best_score):
+            self.logger.warning("Strategy optimization produced no qualifying parameters")
+            return None
+        
+        self.logger.info(f"Optimal strategy parameters: {report.summary()}")
+        return report.best_params
+    
+    async def _update_strategy_configuration(self, optimal_strategy: Dict[str, Any]) -> None:
+        """Apply optimized parameters to the decision engine"""
+        if self.decision_engine is None:
+            raise RuntimeError("No decision engine configured")
+        
+        params = dict(optimal_strategy)
+        if 'strategy_weights' in params:
+            # Keep weights of strategies the optimizer does not cover (ML, arbitrage)
+            params['strategy_weights'] = {**self.decision_engine.config.strategy_weights, **params['strategy_weights']}
+        
+        await self.decision_engine.update_parameters(params)
+    
     async def _execute_risk_update(self, improvement: Improvement) -> Dict[str, Any]:
         """Execute risk management update improvement"""
         try:
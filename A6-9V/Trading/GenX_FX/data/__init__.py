@@ -5,10 +5,42 @@ Data management components for autonomous trading system
 
 from .market_data import MarketDataManager
 from .feature_store import FeatureStore
-from .data_validator import DataValidator
+from .columnar_store import ColumnarOHLCVStore
+from .downloader import HistoricalDownloader, HistoricalDataProvider, CSVProvider
+from .feeds import FeedHub, MarketFeed, ReplayFeed, SimulatedFeed
+from .ring_buffer import BarRingBuffers
+from .bar_aggregator import BarAggregator
+from .range_cache import RangeCache
+from .data_validator import DataValidator, StreamingBarValidator, Violation
+from .indicators import IndicatorEngine, IndicatorCache, StreamingIndicators
+from .feature_pipeline import FeaturePipeline
+from .training_set import TrainingSetBuilder
+from .training_loader import TrainingDataLoader, TrainingBatch
+from .snapshot import MarketSnapshot
 
 __all__ = [
     "MarketDataManager",
     "FeatureStore",
-    "DataValidator"
+    "ColumnarOHLCVStore",
+    "HistoricalDownloader",
+    "HistoricalDataProvider",
+    "CSVProvider",
+    "FeedHub",
+    "MarketFeed",
+    "ReplayFeed",
+    "SimulatedFeed",
+    "BarRingBuffers",
+    "BarAggregator",
+    "RangeCache",
+    "DataValidator",
+    "StreamingBarValidator",
+    "Violation",
+    "IndicatorEngine",
+    "IndicatorCache",
+    "StreamingIndicators",
+    "FeaturePipeline",
+    "TrainingSetBuilder",
+    "TrainingDataLoader",
+    "TrainingBatch",
+    "MarketSnapshot"
 ]
@@ -0,0 +1,122 @@
+"""
+Bar Aggregator - Streaming OHLCV bars from ticks
+Builds every configured timeframe at once with constant work per tick
+"""
+
+import logging
+import pandas as pd
+from typing import Dict, List, Any, Optional, Sequence
+
+Tick = Dict[str, Any]  # symbol, price, size, timestamp
+
+TIMEFRAME_UNITS = {'s': 1_000_000_000, 'm': 60_000_000_000, 'h': 3_600_000_000_000, 'd': 86_400_000_000_000}
+
+
+def parse_timeframe(timeframe: str) -> int:
+    """Bar width in nanoseconds for strings like '1s', '5m', '1h', '1d'"""
+    count, unit = timeframe[:-1], timeframe[-1]
+    if unit not in TIMEFRAME_UNITS or not count.isdigit() or int(count) <= 0:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+    return int(count) * TIMEFRAME_UNITS[unit]
+
+
+def is_tick(data: Dict[str, Any]) -> bool:
+    """Whether a feed record is a trade tick rather than a bar"""
+    return 'price' in data and 'close' not in data
+
+
+class BarAggregator:
+    """
+    Folds ticks into open bars for several timeframes at once.
+    Bars are aligned to the epoch (UTC) and emitted when a tick from a later
+    bar arrives or when close_due() finds them past their end.
+    """
+    
+    def __init__(self, timeframes: Sequence[str] = ('1s', '1m', '5m', '1h')):
+        self.timeframes = list(timeframes)
+        self.widths = {timeframe: parse_timeframe(timeframe) for timeframe in self.timeframes}
+        self.logger = logging.getLogger(__name__)
+        
+        # (symbol, timeframe) -> [start_ns, open, high, low, close, volume, ticks]
+        self.open_bars: Dict[tuple, list] = {}
+        # (symbol, timeframe) -> end of the last bar closed by close_due()
+        self.closed_until: Dict[tuple, int] = {}
+        self.stats = {'ticks': 0, 'bars': 0, 'late_ticks': 0}
+    
+    def add_tick(self, symbol: str, price: float, size: float, timestamp: int) -> List[Dict[str, Any]]:
+        """Fold one tick (epoch-nanosecond timestamp) into every timeframe; returns completed bars"""
+        completed = []
+        self.stats['ticks'] += 1
+        for timeframe, width in self.widths.items():
+            start = timestamp - timestamp % width
+            key = (symbol, timeframe)
+            bar = self.open_bars.get(key)
+            
+            if bar is None:
+                if start < self.closed_until.get(key, start):
+                    self.stats['late_ticks'] += 1
+                    continue
+                self.open_bars[key] = [start, price, price, price, price, size, 1]
+            elif start > bar[0]:
+                completed.append(self._to_bar(symbol, timeframe, bar))
+                self.open_bars[key] = [start, price, price, price, price, size, 1]
+            elif start == bar[0]:
+                if price > bar[2]:
+                    bar[2] = price
+                elif price < bar[3]:
+                    bar[3] = price
+                bar[4] = price
+                bar[5] += size
+                bar[6] += 1
+            else:
+                # Belongs to a bar already emitted
+                self.stats['late_ticks'] += 1
+        return completed
+    
+    def add_ticks(self, ticks: List[Tick]) -> List[Dict[str, Any]]:
+        """Fold a batch of tick dicts; returns the bars they completed"""
+        completed = []
+        for tick in ticks:
+            completed.extend(self.add_tick(
+                tick['symbol'], float(tick['price']), float(tick.get('size', 0.0)),
+                pd.Timestamp(tick['timestamp']).value
+            ))
+        return completed
+    
+    def close_due(self, now: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Emit open bars whose period ended before `now` (epoch ns), e.g. for quiet symbols"""
+        now = pd.Timestamp.now(tz='UTC').value if now is None else now
+        completed = []
+        for key, bar in list(self.open_bars.items()):
+            symbol, timeframe = key
+            end = bar[0] + self.widths[timeframe]
+            if end <= now:
+                completed.append(self._to_bar(symbol, timeframe, bar))
+                del self.open_bars[key]
+                # Late ticks for the emitted bar must not reopen it
+                self.closed_until[key] = end
+        return completed
+    
+    def partial(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """The bar still being built"""
+        bar = self.open_bars.get((symbol, timeframe))
+        return self._to_bar(symbol, timeframe, bar, count=False) if bar is not None else None
+    
+    def _to_bar(self, symbol: str, timeframe: str, bar: list, count: bool = True) -> Dict[str, Any]:
+        if count:
+            self.stats['bars'] += 1
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'timestamp': pd.Timestamp(bar[0], tz='UTC').to_pydatetime(),
+            'open': bar[1],
+            'high': bar[2],
+            'low': bar[3],
+            'close': bar[4],
+            'volume': bar[5],
+            'ticks': bar[6]
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Aggregation statistics"""
+        return {'timeframes': self.timeframes, 'open_bars': len(self.open_bars), **self.stats}
@@ -0,0 +1,379 @@
+"""
+Columnar OHLCV Store - Per-symbol memory-mapped column files
+Timestamps are int64 epoch nanoseconds; range reads are zero-copy slices
+"""
+
+import json
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple, Union
+from urllib.parse import quote
+
+from .feature_store import to_nanoseconds
+
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+TimeBound = Union[datetime, pd.Timestamp, int, None]
+
+
+@dataclass
+class OHLCVPartition:
+    """One symbol's bars: a timestamp vector and a (columns x capacity) value matrix"""
+    symbol: str
+    path: Path
+    timestamps: np.ndarray  # int64 memmap, ascending
+    values: np.ndarray  # float64 memmap, one row per column so each column is contiguous
+    size: int
+    dirty: bool = False  # size not yet persisted to meta.json
+    generation: int = 0  # bumped each time the files are rewritten
+    
+    @property
+    def capacity(self) -> int:
+        return len(self.timestamps)
+    
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamps[self.size - 1]) if self.size else None
+
+
+def _column_files(path: Path, generation: int) -> Tuple[Path, Path]:
+    """Timestamp and value files of one generation of a partition"""
+    suffix = f".{generation}" if generation else ""
+    return path / f"timestamp{suffix}.npy", path / f"values{suffix}.npy"
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Plain ndarray view of a memmap slice that callers cannot write through"""
+    view = np.asarray(array)
+    view.flags.writeable = False
+    return view
+
+
+class ColumnarOHLCVStore:
+    """
+    OHLCV storage backend with one directory per symbol.
+    Appends go straight into preallocated memory-mapped files that grow
+    geometrically; out-of-order or overlapping writes are merged with the
+    newest value winning, like INSERT OR REPLACE. Growing or rewriting a
+    symbol writes a new generation of files, so views handed out earlier
+    stay valid and no mapped file is ever replaced.
+    """
+    
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**self._default_config(), **(config or {})}
+        self.logger = logging.getLogger(__name__)
+        
+        self.root = Path(self.config['storage_path'])
+        self.root.mkdir(parents=True, exist_ok=True)
+        
+        self.partitions: Dict[str, OHLCVPartition] = {}
+        self.directories: Dict[str, Path] = {}
+        # Bulk ingest runs in worker threads while live bars append and readers query on the event loop
+        self._lock = threading.RLock()
+        self._scan()
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default columnar store configuration"""
+        return {
+            'storage_path': 'market_data/ohlcv',
+            'initial_capacity': 4096,  # bars preallocated per symbol
+            'growth_factor': 2.0
+        }
+    
+    # Queries
+    
+    def list_symbols(self) -> List[str]:
+        """Symbols with stored bars"""
+        return sorted(self.directories)
+    
+    def count(self, symbol: str) -> int:
+        """Number of stored bars for a symbol"""
+        with self._lock:
+            partition = self._partition(symbol)
+            return partition.size if partition is not None else 0
+    
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        """Most recent bar time in epoch nanoseconds"""
+        with self._lock:
+            partition = self._partition(symbol)
+            return partition.last_timestamp if partition is not None else None
+    
+    def read(self, symbol: str, start: TimeBound = None, end: TimeBound = None) -> Optional[Dict[str, np.ndarray]]:
+        """Bars in [start, end] as read-only views of the mapped files (no copy)"""
+        with self._lock:
+            span = self._span(symbol, start, end)
+            if span is None:
+                return None
+            partition, first, last = span
+            
+            arrays = {'timestamp': _read_only(partition.timestamps[first:last])}
+            for row, column in enumerate(PRICE_COLUMNS):
+                arrays[column] = _read_only(partition.values[row, first:last])
+            return arrays
+    
+    def read_frame(self, symbol: str, start: TimeBound = None, end: TimeBound = None) -> Optional[pd.DataFrame]:
+        """Bars in [start, end] as a DataFrame backed by the mapped files, indexed in UTC like the sqlite path"""
+        with self._lock:
+            span = self._span(symbol, start, end)
+            if span is None:
+                return None
+            partition, first, last = span
+            timestamps = _read_only(partition.timestamps[first:last])
+            block = _read_only(partition.values[:, first:last])
+        
+        index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), copy=False, name='timestamp')
+        return pd.DataFrame(block.T, index=index.tz_localize('UTC'), columns=list(PRICE_COLUMNS), copy=False)
+    
+    def _span(self, symbol: str, start: TimeBound, end: TimeBound) -> Optional[Tuple[OHLCVPartition, int, int]]:
+        """Partition and [first, last) bar positions of a range, or None if it is empty (caller holds the lock)"""
+        partition = self._partition(symbol)
+        if partition is None or partition.size == 0:
+            return None
+        
+        timestamps = partition.timestamps[:partition.size]
+        first = int(np.searchsorted(timestamps, self._bound(start), side='left')) if start is not None else 0
+        last = int(np.searchsorted(timestamps, self._bound(end), side='right')) if end is not None else partition.size
+        return (partition, first, last) if last > first else None
+    
+    # Writes
+    
+    def write(self, symbol: str, timestamps: Any, columns: Dict[str, Any]) -> int:
+        """Store bars (timestamps plus open/high/low/close/volume); returns the bars written"""
+        with self._lock:
+            timestamps = to_nanoseconds(timestamps)
+            if len(timestamps) == 0:
+                return 0
+            values = np.vstack([np.asarray(columns[column], dtype=np.float64) for column in PRICE_COLUMNS])
+            
+            partition = self._partition(symbol, create=True)
+            in_order = np.all(np.diff(timestamps) > 0)
+            last = partition.last_timestamp
+            
+            if in_order and (last is None or timestamps[0] > last):
+                partition = self._append(partition, timestamps, values)
+            else:
+                partition = self._merge(partition, timestamps, values)
+            
+            self._write_meta(partition)
+            return len(timestamps)
+    
+    def write_frame(self, symbol: str, data: pd.DataFrame) -> int:
+        """Store a DataFrame indexed by time with OHLCV columns (any capitalisation)"""
+        lookup = {name.lower(): name for name in data.columns}
+        return self.write(symbol, data.index, {column: data[lookup[column]].to_numpy() for column in PRICE_COLUMNS})
+    
+    def append(self, symbol: str, bar: Dict[str, Any]) -> None:
+        """Store a single bar; the size is persisted on the next flush"""
+        with self._lock:
+            timestamp = to_nanoseconds(bar['timestamp'])
+            values = np.array([[float(bar[column])] for column in PRICE_COLUMNS])
+            
+            partition = self._partition(symbol, create=True)
+            last = partition.last_timestamp
+            if last is None or timestamp[0] > last:
+                partition = self._append(partition, timestamp, values)
+                partition.dirty = True
+            elif timestamp[0] == last:
+                # Update of the bar still forming: overwrite the last slot in place
+                partition.values[:, partition.size - 1] = values[:, 0]
+                partition.dirty = True
+            else:
+                partition = self._merge(partition, timestamp, values)
+                self._write_meta(partition)
+    
+    def truncate_before(self, cutoff: TimeBound) -> int:
+        """Drop bars older than the cutoff from every symbol; returns the bars removed"""
+        with self._lock:
+            cutoff = self._bound(cutoff)
+            removed = 0
+            for symbol in self.list_symbols():
+                partition = self._partition(symbol)
+                keep_from = int(np.searchsorted(partition.timestamps[:partition.size], cutoff))
+                if keep_from == 0:
+                    continue
+                
+                timestamps = np.array(partition.timestamps[keep_from:partition.size])
+                values = np.array(partition.values[:, keep_from:partition.size])
+                partition = self._rewrite(partition, timestamps, values)
+                self._write_meta(partition)
+                removed += keep_from
+            return removed
+    
+    def flush(self) -> None:
+        """Flush mapped pages and persist sizes of partitions with pending appends"""
+        with self._lock:
+            for partition in self.partitions.values():
+                if partition.dirty:
+                    partition.timestamps.flush()
+                    partition.values.flush()
+                    self._write_meta(partition)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Storage statistics"""
+        with self._lock:
+            bars = sum(self.count(symbol) for symbol in self.list_symbols())
+            disk_bytes = sum(path.stat().st_size for path in self.root.glob("*/*.npy"))
+        return {
+            'symbols': len(self.directories),
+            'bars': bars,
+            'open_partitions': len(self.partitions),
+            'disk_bytes': disk_bytes
+        }
+    
+    # Partition management
+    
+    def _bound(self, value: TimeBound) -> int:
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(to_nanoseconds(value)[0])
+    
+    def _scan(self) -> None:
+        """Index symbol directories already on disk and remove superseded file generations"""
+        for meta_file in self.root.glob("*/meta.json"):
+            try:
+                meta = json.loads(meta_file.read_text())
+                self.directories[meta['symbol']] = meta_file.parent
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Skipping unreadable partition {meta_file.parent}: {e}")
+                continue
+            
+            current = set(_column_files(meta_file.parent, meta.get('generation', 0)))
+            for path in meta_file.parent.glob("*.npy"):
+                if path not in current:
+                    self._unlink(path)
+    
+    def _partition(self, symbol: str, create: bool = False) -> Optional[OHLCVPartition]:
+        """Open (or create) a symbol's partition"""
+        partition = self.partitions.get(symbol)
+        if partition is not None:
+            return partition
+        
+        path = self.directories.get(symbol)
+        if path is not None:
+            meta = json.loads((path / "meta.json").read_text())
+            generation = meta.get('generation', 0)
+            timestamp_file, values_file = _column_files(path, generation)
+            partition = OHLCVPartition(
+                symbol=symbol,
+                path=path,
+                timestamps=np.load(timestamp_file, mmap_mode='r+'),
+                values=np.load(values_file, mmap_mode='r+'),
+                size=meta['size'],
+                generation=generation
+            )
+        elif create:
+            # Percent-encoded so distinct symbols ("EURUSD=X", "EURUSD_X") never share a directory
+            path = self.root / quote(symbol, safe='')
+            used = set(self.directories.values())
+            while path in used:
+                # Directory of a symbol stored under the old naming; a lone trailing % never comes from quote()
+                path = path.with_name(path.name + '%')
+            path.mkdir(parents=True, exist_ok=True)
+            timestamps, values = self._allocate(path, self.config['initial_capacity'])
+            partition = OHLCVPartition(symbol=symbol, path=path, timestamps=timestamps, values=values, size=0)
+            self.directories[symbol] = path
+            self._write_meta(partition)
+        else:
+            return None
+        
+        self.partitions[symbol] = partition
+        return partition
+    
+    def _allocate(self, path: Path, capacity: int, generation: int = 0) -> tuple:
+        """Create empty timestamp and value files with room for `capacity` bars"""
+        timestamp_file, values_file = _column_files(path, generation)
+        timestamps = np.lib.format.open_memmap(timestamp_file, mode='w+', dtype=np.int64, shape=(capacity,))
+        values = np.lib.format.open_memmap(
+            values_file, mode='w+', dtype=np.float64, shape=(len(PRICE_COLUMNS), capacity)
+        )
+        return timestamps, values
+    
+    def _append(self, partition: OHLCVPartition, timestamps: np.ndarray, values: np.ndarray) -> OHLCVPartition:
+        """Write bars after the current end, growing the files if needed; returns the live partition"""
+        needed = partition.size + len(timestamps)
+        if needed > partition.capacity:
+            capacity = max(needed, int(partition.capacity * self.config['growth_factor']))
+            partition = self._replace_files(
+                partition, capacity,
+                partition.timestamps[:partition.size], partition.values[:, :partition.size]
+            )
+        
+        partition.timestamps[partition.size:needed] = timestamps
+        partition.values[:, partition.size:needed] = values
+        partition.size = needed
+        return partition
+    
+    def _merge(self, partition: OHLCVPartition, timestamps: np.ndarray, values: np.ndarray) -> OHLCVPartition:
+        """Merge bars into existing history; later writes replace bars with the same time"""
+        combined_timestamps = np.concatenate([partition.timestamps[:partition.size], timestamps])
+        combined_values = np.concatenate([partition.values[:, :partition.size], values], axis=1)
+        
+        order = np.argsort(combined_timestamps, kind='stable')
+        combined_timestamps = combined_timestamps[order]
+        # Keep the last of each run of equal timestamps (the newest write)
+        keep = np.append(combined_timestamps[1:] != combined_timestamps[:-1], True)
+        
+        return self._rewrite(partition, combined_timestamps[keep], combined_values[:, order[keep]])
+    
+    def _rewrite(self, partition: OHLCVPartition, timestamps: np.ndarray, values: np.ndarray) -> OHLCVPartition:
+        """Replace a partition's contents"""
+        capacity = max(len(timestamps), self.config['initial_capacity'])
+        return self._replace_files(partition, capacity, timestamps, values)
+    
+    def _replace_files(self, partition: OHLCVPartition, capacity: int,
+                       timestamps: np.ndarray, values: np.ndarray) -> OHLCVPartition:
+        """Write bars into the next generation of files and publish it as the symbol's partition"""
+        generation = partition.generation + 1
+        new_timestamps, new_values = self._allocate(partition.path, capacity, generation)
+        new_timestamps[:len(timestamps)] = timestamps
+        new_values[:, :len(timestamps)] = values
+        new_timestamps.flush()
+        new_values.flush()
+        
+        replacement = OHLCVPartition(
+            symbol=partition.symbol,
+            path=partition.path,
+            timestamps=new_timestamps,
+            values=new_values,
+            size=len(timestamps),
+            generation=generation
+        )
+        # meta.json switches to the new files in one rename, then readers get the new partition in one assignment
+        self._write_meta(replacement)
+        self.partitions[partition.symbol] = replacement
+        self._retire(partition)
+        return replacement
+    
+    def _retire(self, partition: OHLCVPartition) -> None:
+        """Release a superseded generation's maps and delete its files where nothing still maps them"""
+        # Never mmap.close() here: NumPy views do not pin the map, so reading them would crash.
+        # Dropping the store's references unmaps the files once callers release their views.
+        partition.timestamps = partition.values = None
+        for path in _column_files(partition.path, partition.generation):
+            self._unlink(path)
+    
+    def _unlink(self, path: Path) -> None:
+        """Delete a file, leaving it for the next _scan if it is still mapped (Windows)"""
+        try:
+            path.unlink()
+        except OSError as e:
+            self.logger.debug(f"Deferring removal of {path}: {e}")
+    
+    def _write_meta(self, partition: OHLCVPartition) -> None:
+        """Persist the partition's bar count"""
+        meta_file = partition.path / "meta.json"
+        temporary = partition.path / "meta.tmp.json"
+        temporary.write_text(json.dumps({
+            'symbol': partition.symbol,
+            'size': partition.size,
+            'columns': list(PRICE_COLUMNS),
+            'generation': partition.generation
+        }))
+        temporary.replace(meta_file)
+        partition.dirty = False
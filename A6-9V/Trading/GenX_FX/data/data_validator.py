@@ -3,18 +3,45 @@ GenX-FX Data Validator
 Data validation and quality checks for autonomous trading
 """
 
+import logging
 import pandas as pd
 import numpy as np
+from enum import IntFlag
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+PRICE_FIELDS = ['open', 'high', 'low', 'close']
+
+
+class Violation(IntFlag):
+    """Per-bar data quality problems, combined into a bitmask"""
+    NONE = 0
+    NULL = 1
+    NON_POSITIVE_PRICE = 2
+    EXTREME_PRICE = 4
+    NEGATIVE_VOLUME = 8
+    HIGH_INCONSISTENT = 16  # high below open, low or close
+    LOW_INCONSISTENT = 32  # low above open, high or close
+    DUPLICATE_TIMESTAMP = 64
+    STALE_TIMESTAMP = 128  # earlier than the previous bar
+    GAP = 256  # more than max_gap_seconds after the previous bar
+    SPIKE = 512  # close moved more than spike_threshold from the previous close
+
+
+# Problems a bar cannot be used with; GAP only marks missing history
+REJECT = (
+    Violation.NULL | Violation.NON_POSITIVE_PRICE | Violation.EXTREME_PRICE | Violation.NEGATIVE_VOLUME |
+    Violation.HIGH_INCONSISTENT | Violation.LOW_INCONSISTENT | Violation.DUPLICATE_TIMESTAMP |
+    Violation.STALE_TIMESTAMP | Violation.SPIKE
+)
+
 
 class DataValidator:
     """Data validator for market data quality checks"""
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
-        self.validation_rules = self._default_validation_rules()
+        self.validation_rules = {**self._default_validation_rules(), **self.config}
     
     def _default_validation_rules(self) -> Dict[str, Any]:
         """Default validation rules for market data"""
@@ -23,10 +50,75 @@ class DataValidator:
             'price_range_check': True,
             'volume_check': True,
             'timestamp_check': True,
+            'timestamp_order_check': False,  # flag duplicate and out-of-order timestamps
             'null_check': True,
-            'ohlc_consistency': True
+            'ohlc_consistency': True,
+            'max_price': 1000000,  # arbitrary large value check
+            'spike_threshold': None,  # max absolute close-to-close return; None disables
+            'max_gap_seconds': None  # max time between bars; None disables
         }
     
+    def violations(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Violation bitmask per row (int32, 0 = clean), computed in one
+        vectorized pass over the NumPy columns
+        """
+        rules = self.validation_rules
+        masks = np.zeros(len(data), dtype=np.int32)
+        if len(data) == 0:
+            return masks
+        
+        columns = {
+            name: data[name].to_numpy(dtype=np.float64, na_value=np.nan)
+            for name in PRICE_FIELDS + ['volume'] if name in data.columns
+        }
+        
+        if rules.get('null_check', True):
+            null = np.zeros(len(data), dtype=bool)
+            for values in columns.values():
+                null |= np.isnan(values)
+            masks[null] |= Violation.NULL
+        
+        if rules.get('ohlc_consistency', True) and all(name in columns for name in PRICE_FIELDS):
+            high, low = columns['high'], columns['low']
+            others = (columns['open'], columns['close'])
+            masks[(high < low) | (high < others[0]) | (high < others[1])] |= Violation.HIGH_INCONSISTENT
+            masks[(low > high) | (low > others[0]) | (low > others[1])] |= Violation.LOW_INCONSISTENT
+        
+        if rules.get('price_range_check', True):
+            for name in PRICE_FIELDS:
+                if name in columns:
+                    masks[columns[name] <= 0] |= Violation.NON_POSITIVE_PRICE
+                    masks[columns[name] > rules['max_price']] |= Violation.EXTREME_PRICE
+        
+        if rules.get('volume_check', True) and 'volume' in columns:
+            masks[columns['volume'] < 0] |= Violation.NEGATIVE_VOLUME
+        
+        if rules.get('spike_threshold') is not None and 'close' in columns and len(data) > 1:
+            close = columns['close']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = np.abs(close[1:] / close[:-1] - 1)
+            masks[1:][change > rules['spike_threshold']] |= Violation.SPIKE
+        
+        timestamps = self._timestamps(data)
+        if rules.get('timestamp_check', True) and timestamps is not None and len(data) > 1:
+            delta = np.diff(timestamps)
+            if rules.get('timestamp_order_check', False):
+                masks[1:][delta == 0] |= Violation.DUPLICATE_TIMESTAMP
+                masks[1:][delta < 0] |= Violation.STALE_TIMESTAMP
+            if rules.get('max_gap_seconds') is not None:
+                masks[1:][delta > rules['max_gap_seconds'] * 1_000_000_000] |= Violation.GAP
+        
+        return masks
+    
+    def _timestamps(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """Bar times as epoch nanoseconds, from the index or a 'timestamp' column"""
+        if isinstance(data.index, pd.DatetimeIndex):
+            return data.index.values.astype('datetime64[ns]').view(np.int64)
+        if 'timestamp' in data.columns:
+            return pd.DatetimeIndex(pd.to_datetime(data['timestamp'])).values.astype('datetime64[ns]').view(np.int64)
+        return None
+    
     def validate_market_data(self, data: pd.DataFrame) -> Tuple[bool, List[str]]:
         """Validate market data DataFrame"""
         errors = []
@@ -38,43 +130,65 @@ class DataValidator:
             if missing_cols:
                 errors.append(f"Missing required columns: {missing_cols}")
         
-        # Check for null values
+        # Check for null values in every column
         if self.validation_rules.get('null_check', True):
-            null_counts = data.isnull().sum()
-            if null_counts.any():
-                errors.append(f"Null values found: {null_counts[null_counts > 0].to_dict()}")
+            null_counts = {col: int(pd.isnull(data[col].to_numpy()).sum()) for col in data.columns}
+            null_counts = {col: count for col, count in null_counts.items() if count}
+            if null_counts:
+                errors.append(f"Null values found: {null_counts}")
+        
+        masks = self.violations(data)
+        counts = {flag: int(np.count_nonzero(masks & flag)) for flag in Violation if flag}
         
         # Check OHLC consistency
-        if self.validation_rules.get('ohlc_consistency', True):
-            if all(col in data.columns for col in ['open', 'high', 'low', 'close']):
-                # High should be >= Open, Low, Close
-                high_violations = (data['high'] < data[['open', 'low', 'close']].max(axis=1)).sum()
-                # Low should be <= Open, High, Close  
-                low_violations = (data['low'] > data[['open', 'high', 'close']].min(axis=1)).sum()
-                
-                if high_violations > 0:
-                    errors.append(f"High price violations: {high_violations} rows")
-                if low_violations > 0:
-                    errors.append(f"Low price violations: {low_violations} rows")
+        if counts[Violation.HIGH_INCONSISTENT]:
+            errors.append(f"High price violations: {counts[Violation.HIGH_INCONSISTENT]} rows")
+        if counts[Violation.LOW_INCONSISTENT]:
+            errors.append(f"Low price violations: {counts[Violation.LOW_INCONSISTENT]} rows")
         
         # Check price ranges
         if self.validation_rules.get('price_range_check', True):
-            price_cols = ['open', 'high', 'low', 'close']
-            for col in price_cols:
+            for col in PRICE_FIELDS:
                 if col in data.columns:
-                    if (data[col] <= 0).any():
+                    values = data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                    if (values <= 0).any():
                         errors.append(f"Non-positive prices found in {col}")
-                    if (data[col] > 1000000).any():  # Arbitrary large value check
+                    if (values > self.validation_rules['max_price']).any():
                         errors.append(f"Extremely high prices found in {col}")
         
         # Check volume
-        if self.validation_rules.get('volume_check', True):
-            if 'volume' in data.columns:
-                if (data['volume'] < 0).any():
-                    errors.append("Negative volume values found")
+        if counts[Violation.NEGATIVE_VOLUME]:
+            errors.append("Negative volume values found")
+        
+        # Check bar sequence
+        if counts[Violation.DUPLICATE_TIMESTAMP]:
+            errors.append(f"Duplicate timestamps: {counts[Violation.DUPLICATE_TIMESTAMP]} rows")
+        if counts[Violation.STALE_TIMESTAMP]:
+            errors.append(f"Out-of-order timestamps: {counts[Violation.STALE_TIMESTAMP]} rows")
+        if counts[Violation.GAP]:
+            errors.append(f"Gaps between bars: {counts[Violation.GAP]} rows")
+        if counts[Violation.SPIKE]:
+            errors.append(f"Price spikes: {counts[Violation.SPIKE]} rows")
         
         return len(errors) == 0, errors
     
+    def drop_invalid(self, data: pd.DataFrame, masks: Optional[np.ndarray] = None,
+                     flags: int = REJECT) -> pd.DataFrame:
+        """Rows without any of the given violations"""
+        masks = self.violations(data) if masks is None else masks
+        return data[(masks & flags) == 0]
+    
+    def repair_ohlc(self, data: pd.DataFrame, masks: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Copy with high/low widened to cover open and close on inconsistent rows"""
+        masks = self.violations(data) if masks is None else masks
+        rows = (masks & (Violation.HIGH_INCONSISTENT | Violation.LOW_INCONSISTENT)) != 0
+        repaired = data.copy()
+        if rows.any():
+            prices = np.column_stack([data[col].to_numpy(dtype=np.float64) for col in PRICE_FIELDS])[rows]
+            repaired.loc[rows, 'high'] = np.nanmax(prices, axis=1)
+            repaired.loc[rows, 'low'] = np.nanmin(prices, axis=1)
+        return repaired
+    
     def validate_features(self, features: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """Validate feature data"""
         errors = []
@@ -112,4 +226,104 @@ class DataValidator:
         if age_minutes > max_age_minutes:
             return False, f"Data is {age_minutes:.1f} minutes old (max: {max_age_minutes})"
         
-        return True, f"Data is fresh ({age_minutes:.1f} minutes old)"
\ No newline at end of file
+        return True, f"Data is fresh ({age_minutes:.1f} minutes old)"
+
+
+class StreamingBarValidator:
+    """
+    O(1) checks of each incoming bar against the previous accepted bar of
+    the same key (symbol, or symbol and timeframe), before it is buffered.
+    A bar with the same timestamp as the previous one is an in-progress
+    update of that bar, not a duplicate.
+    """
+    
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**self._default_config(), **(config or {})}
+        self.logger = logging.getLogger(__name__)
+        
+        # key -> [timestamp_ns, close, consecutive spikes]
+        self.previous: Dict[Any, list] = {}
+        self.stats = {'checked': 0, 'rejected': 0, 'gaps': 0}
+        self.counts: Dict[str, int] = {}
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default streaming validation parameters"""
+        return {
+            'max_price': 1000000,
+            'spike_threshold': 0.2,  # max absolute return from the previous close
+            'spike_confirm_bars': 3,  # this many spikes in a row are a real level shift and accepted
+            'max_gap_seconds': None,  # flag (not reject) bars after a longer silence
+            'reject': int(REJECT)
+        }
+    
+    def check(self, key: Any, bar: Dict[str, Any]) -> int:
+        """Violation bitmask of one bar; the bar becomes the reference only if accepted"""
+        self.stats['checked'] += 1
+        cfg = self.config
+        flags = Violation.NONE
+        
+        open_, high, low, close = (float(bar[name]) for name in PRICE_FIELDS)
+        volume = float(bar.get('volume', 0.0))
+        timestamp = pd.Timestamp(bar['timestamp']).value
+        
+        if close != close or open_ != open_ or high != high or low != low or volume != volume:
+            flags |= Violation.NULL
+        if min(open_, high, low, close) <= 0:
+            flags |= Violation.NON_POSITIVE_PRICE
+        if max(open_, high, low, close) > cfg['max_price']:
+            flags |= Violation.EXTREME_PRICE
+        if volume < 0:
+            flags |= Violation.NEGATIVE_VOLUME
+        if high < max(open_, low, close):
+            flags |= Violation.HIGH_INCONSISTENT
+        if low > min(open_, high, close):
+            flags |= Violation.LOW_INCONSISTENT
+        
+        previous = self.previous.get(key)
+        spikes = 0
+        if previous is not None:
+            last_timestamp, last_close, spikes = previous
+            if timestamp < last_timestamp:
+                flags |= Violation.STALE_TIMESTAMP
+            elif cfg['max_gap_seconds'] is not None and timestamp - last_timestamp > cfg['max_gap_seconds'] * 1_000_000_000:
+                flags |= Violation.GAP
+            
+            if last_close > 0 and abs(close / last_close - 1) > cfg['spike_threshold']:
+                spikes += 1
+                if spikes < cfg['spike_confirm_bars']:
+                    flags |= Violation.SPIKE
+            else:
+                spikes = 0
+        
+        rejected = flags & cfg['reject']
+        if rejected:
+            self.stats['rejected'] += 1
+            if previous is not None and flags & Violation.SPIKE:
+                previous[2] = spikes
+            for flag in Violation:
+                if flag and rejected & flag:
+                    self.counts[flag.name] = self.counts.get(flag.name, 0) + 1
+        else:
+            self.previous[key] = [timestamp, close, 0]
+            if flags & Violation.GAP:
+                self.stats['gaps'] += 1
+        return int(flags)
+    
+    def seed(self, key: Any, timestamp: Any, close: float) -> None:
+        """Use a stored bar (e.g. the last one loaded at warm-up) as the reference for the next check"""
+        self.previous[key] = [pd.Timestamp(timestamp).value, float(close), 0]
+    
+    def accepts(self, key: Any, bar: Dict[str, Any]) -> bool:
+        """Check a bar and say whether it may enter the buffers"""
+        return not self.check(key, bar) & self.config['reject']
+    
+    def reset(self, key: Optional[Any] = None) -> None:
+        """Forget the reference bar of one key (all keys when None)"""
+        if key is None:
+            self.previous.clear()
+        else:
+            self.previous.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Validation statistics, with rejections by violation"""
+        return {**self.stats, 'rejections': dict(self.counts)}
@@ -0,0 +1,288 @@
+"""
+Historical Downloader - Concurrent, rate-limited, resumable history downloads
+Fetches only the (symbol, date-range) gaps not yet recorded in the checkpoint file
+"""
+
+import asyncio
+import json
+import logging
+import time
+import pandas as pd
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
+
+import yfinance as yf
+
+
+Interval = Tuple[datetime, datetime]  # [start, end)
+
+
+class HistoricalDataProvider(ABC):
+    """
+    Source of historical OHLCV bars.
+    fetch() is blocking and runs in the downloader's thread pool; it returns a
+    DataFrame indexed by time with Open/High/Low/Close/Volume columns.
+    """
+    
+    name = "provider"
+    requests_per_second: float = 0.0  # 0 disables rate limiting
+    
+    @abstractmethod
+    def fetch(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Bars in [start, end)"""
+
+
+class YahooFinanceProvider(HistoricalDataProvider):
+    """Yahoo Finance via yfinance"""
+    
+    name = "yahoo_finance"
+    
+    def __init__(self, interval: str = "1d", requests_per_second: float = 2.0):
+        self.interval = interval
+        self.requests_per_second = requests_per_second
+    
+    def fetch(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        return yf.Ticker(symbol).history(start=start, end=end, interval=self.interval)
+
+
+class CSVProvider(HistoricalDataProvider):
+    """Serves <directory>/<symbol>.csv files, e.g. canned data for tests"""
+    
+    name = "csv"
+    
+    def __init__(self, directory: str, requests_per_second: float = 0.0):
+        self.directory = Path(directory)
+        self.requests_per_second = requests_per_second
+        self._frames: Dict[str, pd.DataFrame] = {}
+    
+    def fetch(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        if symbol not in self._frames:
+            path = self.directory / f"{symbol}.csv"
+            if not path.exists():
+                return pd.DataFrame()
+            frame = pd.read_csv(path, index_col=0)
+            frame.index = pd.to_datetime(frame.index)
+            self._frames[symbol] = frame.sort_index()
+        
+        frame = self._frames[symbol]
+        index = frame.index.tz_localize(None) if frame.index.tz is not None else frame.index
+        return frame[(index >= pd.Timestamp(start)) & (index < pd.Timestamp(end))]
+
+
+class RateLimiter:
+    """Async token bucket shared by all requests to one provider"""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = float(max(burst, 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+@dataclass
+class DownloaderConfig:
+    """Configuration for the historical downloader"""
+    max_concurrency: int = 8
+    chunk_days: int = 365  # widest date range requested at once
+    min_gap_seconds: int = 60  # smaller missing ranges are not worth a request
+    max_retries: int = 3
+    retry_backoff: float = 1.0  # seconds, doubled per attempt
+    checkpoint_path: str = "market_data/download_checkpoints.json"
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Union of [start, end) intervals, sorted"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_intervals(start: datetime, end: datetime, covered: List[Interval]) -> List[Interval]:
+    """Parts of [start, end) not covered by any interval"""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class HistoricalDownloader:
+    """
+    Downloads history for many symbols concurrently.
+    Work is split into (symbol, date-range) chunks; each stored chunk is
+    checkpointed so a restart only requests the ranges still missing.
+    """
+    
+    def __init__(self, provider: HistoricalDataProvider,
+                 store: Callable[[str, pd.DataFrame], Awaitable[Any]],
+                 config: Optional[DownloaderConfig] = None):
+        self.provider = provider
+        self.store = store
+        self.config = config or DownloaderConfig()
+        self.logger = logging.getLogger(__name__)
+        
+        self.rate_limiter = RateLimiter(provider.requests_per_second)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.max_concurrency,
+            thread_name_prefix=f"genx-download-{provider.name}"
+        )
+        
+        self.checkpoint_path = Path(self.config.checkpoint_path)
+        self.checkpoints: Dict[str, List[Interval]] = self._load_checkpoints()
+        self.stats = {'chunks_fetched': 0, 'chunks_failed': 0, 'rows': 0, 'retries': 0, 'seconds': 0.0}
+    
+    def plan(self, symbols: List[str], start: datetime, end: datetime) -> List[Tuple[str, datetime, datetime]]:
+        """(symbol, start, end) chunks not yet downloaded"""
+        chunk = timedelta(days=self.config.chunk_days)
+        tasks = []
+        for symbol in symbols:
+            for gap_start, gap_end in missing_intervals(start, end, self.checkpoints.get(symbol, [])):
+                if (gap_end - gap_start).total_seconds() < self.config.min_gap_seconds:
+                    continue
+                cursor = gap_start
+                while cursor < gap_end:
+                    tasks.append((symbol, cursor, min(cursor + chunk, gap_end)))
+                    cursor += chunk
+        return tasks
+    
+    async def download(self, symbols: List[str], start: datetime, end: Optional[datetime] = None) -> Dict[str, int]:
+        """Fetch and store every missing chunk; returns rows stored per symbol"""
+        end = end or datetime.now()
+        tasks = self.plan(symbols, start, end)
+        rows: Dict[str, int] = {symbol: 0 for symbol in symbols}
+        if not tasks:
+            return rows
+        
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        
+        async def run(symbol: str, chunk_start: datetime, chunk_end: datetime) -> None:
+            async with semaphore:
+                data = await self._fetch_with_retry(symbol, chunk_start, chunk_end)
+            if data is None:
+                return
+            if not data.empty:
+                try:
+                    await self.store(symbol, data)
+                except Exception as e:
+                    self.logger.error(f"Error storing {symbol} {chunk_start:%Y-%m-%d}..{chunk_end:%Y-%m-%d}: {e}")
+                    self.stats['chunks_failed'] += 1
+                    return
+                rows[symbol] += len(data)
+                self.stats['rows'] += len(data)
+            # An empty range (holidays, before listing) is still complete
+            self._mark_done(symbol, chunk_start, chunk_end)
+            self.stats['chunks_fetched'] += 1
+        
+        await asyncio.gather(*(run(*task) for task in tasks))
+        
+        elapsed = time.perf_counter() - started
+        self.stats['seconds'] += elapsed
+        self.logger.info(
+            f"Downloaded {len(tasks)} chunks for {len(symbols)} symbols from {self.provider.name} "
+            f"in {elapsed:.1f}s ({sum(rows.values())} rows)"
+        )
+        return rows
+    
+    async def _fetch_with_retry(self, symbol: str, start: datetime, end: datetime) -> Optional[pd.DataFrame]:
+        """Rate-limited fetch in the thread pool, retried with exponential backoff"""
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.config.max_retries + 1):
+            await self.rate_limiter.acquire()
+            try:
+                return await loop.run_in_executor(self.executor, self.provider.fetch, symbol, start, end)
+            except Exception as e:
+                if attempt == self.config.max_retries:
+                    self.logger.error(f"Error downloading {symbol} {start:%Y-%m-%d}..{end:%Y-%m-%d}: {e}")
+                    self.stats['chunks_failed'] += 1
+                    return None
+                self.stats['retries'] += 1
+                await asyncio.sleep(self.config.retry_backoff * 2 ** attempt)
+    
+    def _mark_done(self, symbol: str, start: datetime, end: datetime) -> None:
+        """Record a stored chunk and persist the checkpoint file"""
+        self.checkpoints[symbol] = merge_intervals(self.checkpoints.get(symbol, []) + [(start, end)])
+        self._save_checkpoints()
+    
+    def _load_checkpoints(self) -> Dict[str, List[Interval]]:
+        """Completed ranges for this provider"""
+        if not self.checkpoint_path.exists():
+            return {}
+        try:
+            saved = json.loads(self.checkpoint_path.read_text()).get(self.provider.name, {})
+            return {
+                symbol: [(datetime.fromisoformat(start), datetime.fromisoformat(end)) for start, end in intervals]
+                for symbol, intervals in saved.items()
+            }
+        except (ValueError, KeyError) as e:
+            self.logger.warning(f"Ignoring unreadable download checkpoints: {e}")
+            return {}
+    
+    def _save_checkpoints(self) -> None:
+        """Write checkpoints atomically, keeping other providers' entries"""
+        saved = {}
+        if self.checkpoint_path.exists():
+            try:
+                saved = json.loads(self.checkpoint_path.read_text())
+            except ValueError:
+                saved = {}
+        saved[self.provider.name] = {
+            symbol: [[start.isoformat(), end.isoformat()] for start, end in intervals]
+            for symbol, intervals in self.checkpoints.items()
+        }
+        
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.checkpoint_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(saved, indent=2))
+        temporary.replace(self.checkpoint_path)
+    
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Forget completed ranges so they are downloaded again"""
+        if symbol is None:
+            self.checkpoints.clear()
+        else:
+            self.checkpoints.pop(symbol, None)
+        self._save_checkpoints()
+    
+    def shutdown(self) -> None:
+        """Stop the download threads"""
+        self.executor.shutdown(wait=False)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get downloader status"""
+        return {
+            'provider': self.provider.name,
+            'max_concurrency': self.config.max_concurrency,
+            'symbols_checkpointed': len(self.checkpoints),
+            **self.stats
+        }
@@ -0,0 +1,328 @@
+"""
+GenX-FX Feature Pipeline
+Declarative model features computed identically over history (batch) and per bar (streaming)
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .indicators import IndicatorEngine, RollingRSI, RollingWindow, RunningEMA
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Declarative definition of one feature column"""
+    name: str
+    kind: str  # value, mean, std, change, sma_ratio, rsi, macd, bb_position, hour, weekday (UTC)
+    source: str = 'close'
+    period: int = 1
+
+
+def _as_utc(timestamp: Any) -> pd.Timestamp:
+    """Bar time in UTC; naive times are taken as UTC, as the stores write them"""
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize('UTC') if timestamp.tz is None else timestamp.tz_convert('UTC')
+
+
+def default_feature_specs(lookback: int = 100) -> List[FeatureSpec]:
+    """Feature set used by the ML strategy for both training and live inference"""
+    specs = [
+        FeatureSpec('price', 'value'),
+        FeatureSpec('mean_price', 'mean', period=lookback),
+        FeatureSpec('volatility', 'std', period=lookback),
+        FeatureSpec('total_return', 'change', period=lookback),
+    ]
+    
+    for period in [5, 10, 20, 50]:
+        specs.append(FeatureSpec(f'sma_{period}', 'mean', period=period))
+        specs.append(FeatureSpec(f'price_vs_sma_{period}', 'sma_ratio', period=period))
+    
+    specs.extend([
+        FeatureSpec('rsi', 'rsi', period=14),
+        FeatureSpec('macd', 'macd', period=26),
+        FeatureSpec('bb_position', 'bb_position', period=20),
+        FeatureSpec('volume', 'value', source='volume'),
+        FeatureSpec('volume_mean', 'mean', source='volume', period=lookback),
+        FeatureSpec('volume_std', 'std', source='volume', period=lookback),
+        FeatureSpec('hour_of_day', 'hour'),
+        FeatureSpec('day_of_week', 'weekday'),
+    ])
+    
+    return specs
+
+
+class FeaturePipeline:
+    """
+    Runs a list of FeatureSpec in batch mode (vectorized over a whole history)
+    or streaming mode (O(1) per bar via StreamingFeatureState). Both modes
+    produce the same columns in the same order. Time features use UTC in
+    both modes and are NaN for bars without a timestamp.
+    """
+    
+    # Rows per chunk when materializing sliding windows, bounds temporary memory
+    CHUNK_ROWS = 65536
+    
+    def __init__(self, config: Optional[Dict] = None, specs: Optional[List[FeatureSpec]] = None):
+        self.config = {**self._default_config(), **(config or {})}
+        self.specs = specs or default_feature_specs(self.config['lookback'])
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default pipeline parameters"""
+        return {
+            'lookback': 100,
+            'bb_std_dev': 2,
+            'macd_fast': 12,
+            'macd_slow': 26
+        }
+    
+    @property
+    def feature_names(self) -> List[str]:
+        return [spec.name for spec in self.specs]
+    
+    @property
+    def warmup_bars(self) -> int:
+        """Bars required before a row is valid"""
+        periods = [spec.period + 1 if spec.kind == 'rsi' else spec.period for spec in self.specs]
+        return max([self.config['lookback'], *periods])
+    
+    @property
+    def history_bars(self) -> int:
+        """Trailing bars needed to reproduce the latest row (EMA convergence included)"""
+        return max(self.warmup_bars, IndicatorEngine({'macd_slow': self.config['macd_slow']}).history_bars)
+    
+    # Batch mode
+    
+    def transform(self, close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                  timestamps: Optional[Sequence[Any]] = None) -> np.ndarray:
+        """Feature matrix (bars x features); rows before warm-up are NaN"""
+        sources = {'close': np.asarray(close, dtype=np.float64)}
+        n_bars = len(sources['close'])
+        sources['volume'] = (
+            np.asarray(volume, dtype=np.float64) if volume is not None and len(volume) == n_bars
+            else np.zeros(n_bars)
+        )
+        times = self._to_datetime_index(timestamps, n_bars)
+        
+        matrix = np.empty((n_bars, len(self.specs)))
+        for column, spec in enumerate(self.specs):
+            matrix[:, column] = self._batch_feature(spec, sources, times)
+        
+        matrix[:self.warmup_bars - 1] = np.nan
+        return matrix
+    
+    def transform_latest(self, close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                         timestamps: Optional[Sequence[Any]] = None) -> Optional[np.ndarray]:
+        """Feature row (1 x features) for the last bar, or None before warm-up"""
+        if len(close) < self.warmup_bars:
+            return None
+        
+        bars = self.history_bars
+        close = np.asarray(close, dtype=np.float64)[-bars:]
+        if volume is not None and len(volume) >= len(close):
+            volume = np.asarray(volume, dtype=np.float64)[-len(close):]
+        else:
+            volume = None
+        if timestamps is not None and len(timestamps) >= len(close):
+            timestamps = list(timestamps[-len(close):])
+        else:
+            timestamps = None
+        
+        return self.transform(close, volume, timestamps)[-1:]
+    
+    def _batch_feature(self, spec: FeatureSpec, sources: Dict[str, np.ndarray],
+                       times: Optional[pd.DatetimeIndex]) -> np.ndarray:
+        """Compute one feature column over the full history"""
+        values = sources[spec.source]
+        kind = spec.kind
+        
+        if kind == 'value':
+            return values.copy()
+        if kind == 'mean':
+            return self._rolling(values, spec.period, 'mean')
+        if kind == 'std':
+            return self._rolling(values, spec.period, 'std')
+        if kind == 'change':
+            base = self._shift(values, spec.period - 1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return (values - base) / base
+        if kind == 'sma_ratio':
+            sma = self._rolling(values, spec.period, 'mean')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return (values - sma) / sma
+        if kind == 'rsi':
+            return self._batch_rsi(values, spec.period)
+        if kind == 'macd':
+            fast = pd.Series(values).ewm(span=self.config['macd_fast'], adjust=False).mean().to_numpy()
+            slow = pd.Series(values).ewm(span=self.config['macd_slow'], adjust=False).mean().to_numpy()
+            macd = fast - slow
+            macd[:self.config['macd_slow'] - 1] = 0.0
+            return macd
+        if kind == 'bb_position':
+            mean = self._rolling(values, spec.period, 'mean')
+            std = self._rolling(values, spec.period, 'std')
+            upper = mean + std * self.config['bb_std_dev']
+            lower = mean - std * self.config['bb_std_dev']
+            with np.errstate(divide='ignore', invalid='ignore'):
+                position = np.where(upper != lower, (values - lower) / (upper - lower), 0.5)
+            return np.where(np.isnan(mean), 0.5, position)
+        if kind in ('hour', 'weekday') and times is None:
+            return np.full(len(values), np.nan)
+        if kind == 'hour':
+            return times.hour.to_numpy(dtype=np.float64) / 24
+        if kind == 'weekday':
+            return times.weekday.to_numpy(dtype=np.float64) / 7
+        
+        raise ValueError(f"Unknown feature kind: {kind}")
+    
+    def _rolling(self, values: np.ndarray, period: int, reduction: str) -> np.ndarray:
+        """Trailing-window mean/std aligned to the window end, NaN before the first full window"""
+        result = np.full(len(values), np.nan)
+        if len(values) < period:
+            return result
+        
+        windows = sliding_window_view(values, period)
+        for start in range(0, len(windows), self.CHUNK_ROWS):
+            chunk = windows[start:start + self.CHUNK_ROWS]
+            reduced = chunk.mean(axis=1) if reduction == 'mean' else chunk.std(axis=1)
+            result[start + period - 1:start + period - 1 + len(chunk)] = reduced
+        
+        return result
+    
+    def _shift(self, values: np.ndarray, lag: int) -> np.ndarray:
+        """Value `lag` bars earlier, NaN where unavailable"""
+        shifted = np.full(len(values), np.nan)
+        if lag < len(values):
+            shifted[lag:] = values[:len(values) - lag]
+        return shifted
+    
+    def _batch_rsi(self, values: np.ndarray, period: int) -> np.ndarray:
+        """RSI from simple averages of the last `period` changes, 50 before warm-up"""
+        rsi = np.full(len(values), 50.0)
+        if len(values) < period + 1:
+            return rsi
+        
+        deltas = np.diff(values)
+        avg_gain = self._rolling(np.where(deltas > 0, deltas, 0.0), period, 'mean')[period - 1:]
+        avg_loss = self._rolling(np.where(deltas < 0, -deltas, 0.0), period, 'mean')[period - 1:]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values_rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi[period:] = np.where(avg_loss == 0, 100.0, values_rsi)
+        return rsi
+    
+    def _to_datetime_index(self, timestamps: Optional[Sequence[Any]], n_bars: int) -> Optional[pd.DatetimeIndex]:
+        """Bar timestamps in UTC, or None when they are not available for every bar"""
+        if timestamps is None or len(timestamps) != n_bars:
+            return None
+        if isinstance(timestamps, pd.DatetimeIndex):
+            return timestamps.tz_localize('UTC') if timestamps.tz is None else timestamps.tz_convert('UTC')
+        return pd.DatetimeIndex(pd.to_datetime(list(timestamps), utc=True))
+    
+    # Streaming mode
+    
+    def create_state(self) -> 'StreamingFeatureState':
+        """New per-symbol streaming state for this pipeline"""
+        return StreamingFeatureState(self)
+
+
+class StreamingFeatureState:
+    """Per-symbol incremental state that emits one feature row per bar"""
+    
+    def __init__(self, pipeline: FeaturePipeline):
+        self.pipeline = pipeline
+        self.bars = 0
+        self.latest: Optional[np.ndarray] = None
+        
+        # One rolling window per (source, period), shared between features
+        self.windows: Dict[tuple, RollingWindow] = {}
+        for spec in pipeline.specs:
+            if spec.kind in ('mean', 'std', 'change', 'sma_ratio', 'bb_position'):
+                key = (spec.source, spec.period)
+                self.windows.setdefault(key, RollingWindow(spec.period))
+        
+        self.rsi = {spec.period: RollingRSI(spec.period) for spec in pipeline.specs if spec.kind == 'rsi'}
+        self.ema_fast = RunningEMA(pipeline.config['macd_fast'])
+        self.ema_slow = RunningEMA(pipeline.config['macd_slow'])
+    
+    def update(self, bar: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Fold in a bar and return its feature row (None before warm-up)"""
+        values = self._fold(bar['close'], bar.get('volume', 0))
+        return self._emit(values, bar.get('timestamp'))
+    
+    def warm_up(self, close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                timestamps: Optional[Sequence[Any]] = None) -> Optional[np.ndarray]:
+        """Seed the state from the trailing pipeline.history_bars of a history; returns the latest row"""
+        start = max(0, len(close) - self.pipeline.history_bars)
+        values = None
+        for i in range(start, len(close)):
+            values = self._fold(close[i], volume[i] if volume is not None else 0)
+        if values is None:
+            return None
+        return self._emit(values, timestamps[-1] if timestamps is not None and len(timestamps) else None)
+    
+    def _fold(self, close: float, volume: Any) -> Dict[str, float]:
+        """Add one bar to the rolling state"""
+        values = {
+            'close': float(close),
+            'volume': float(volume or 0)
+        }
+        self.bars += 1
+        
+        for (source, _), window in self.windows.items():
+            window.update(values[source])
+        for rsi in self.rsi.values():
+            rsi.update(values['close'])
+        self.ema_fast.update(values['close'])
+        self.ema_slow.update(values['close'])
+        return values
+    
+    def _emit(self, values: Dict[str, float], timestamp: Any) -> Optional[np.ndarray]:
+        """Feature row for the bar just folded in"""
+        if self.bars < self.pipeline.warmup_bars:
+            self.latest = None
+            return None
+        
+        timestamp = _as_utc(timestamp) if timestamp is not None else None
+        self.latest = np.array([self._feature(spec, values, timestamp) for spec in self.pipeline.specs])
+        return self.latest
+    
+    def _feature(self, spec: FeatureSpec, values: Dict[str, float], timestamp: Optional[pd.Timestamp]) -> float:
+        """Current value of one feature"""
+        kind = spec.kind
+        value = values[spec.source]
+        
+        if kind == 'value':
+            return value
+        if kind == 'mean':
+            return self.windows[(spec.source, spec.period)].mean
+        if kind == 'std':
+            return self.windows[(spec.source, spec.period)].std
+        if kind == 'change':
+            base = self.windows[(spec.source, spec.period)].values[0]
+            return (value - base) / base if base != 0 else float('nan')
+        if kind == 'sma_ratio':
+            sma = self.windows[(spec.source, spec.period)].mean
+            return (value - sma) / sma if sma != 0 else float('nan')
+        if kind == 'rsi':
+            return self.rsi[spec.period].value
+        if kind == 'macd':
+            if self.bars < self.pipeline.config['macd_slow']:
+                return 0.0
+            return self.ema_fast.value - self.ema_slow.value
+        if kind == 'bb_position':
+            window = self.windows[(spec.source, spec.period)]
+            std_dev = self.pipeline.config['bb_std_dev']
+            upper = window.mean + window.std * std_dev
+            lower = window.mean - window.std * std_dev
+            return (value - lower) / (upper - lower) if upper != lower else 0.5
+        if kind in ('hour', 'weekday') and timestamp is None:
+            return float('nan')
+        if kind == 'hour':
+            return timestamp.hour / 24
+        if kind == 'weekday':
+            return timestamp.weekday() / 7
+        
+        raise ValueError(f"Unknown feature kind: {kind}")
@@ -3,19 +3,190 @@ GenX-FX Feature Store
 Feature engineering and storage for autonomous trading
 """
 
+import io
+import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import quote, unquote
+
+from .feature_pipeline import FeaturePipeline, StreamingFeatureState
+
+
+FeatureKey = Tuple[str, str, int]  # (symbol, feature, version)
+
+
+def to_nanoseconds(timestamps: Any) -> np.ndarray:
+    """Convert datetimes, pandas timestamps or epoch nanoseconds to an int64 array"""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.int64:
+        return timestamps
+    if np.isscalar(timestamps) or isinstance(timestamps, datetime):
+        timestamps = [timestamps]
+    index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(list(timestamps)))
+    return index.values.astype('datetime64[ns]').view(np.int64)
+
+
+def append_npy(path: Path, rows: np.ndarray) -> bool:
+    """
+    Append rows to a 1-D .npy file in place: the data goes after the existing
+    rows, then the header's shape is rewritten. Returns False (file untouched)
+    when the new header would not fit in the old one's padding.
+    """
+    with open(path, 'r+b') as handle:
+        version = np.lib.format.read_magic(handle)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(handle)
+        offset = handle.tell()
+        
+        header = io.BytesIO()
+        write_header = np.lib.format.write_array_header_1_0 if version == (1, 0) else np.lib.format.write_array_header_2_0
+        write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': fortran_order,
+                              'shape': (shape[0] + len(rows),)})
+        if len(shape) != 1 or header.tell() != offset:
+            return False
+        
+        # Data before header: a crash in between leaves ignored trailing bytes, never a short file
+        handle.seek(offset + shape[0] * dtype.itemsize)
+        handle.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+        handle.truncate()
+        handle.flush()
+        handle.seek(0)
+        handle.write(header.getvalue())
+    return True
+
+
+@dataclass
+class FeatureColumn:
+    """
+    Time-indexed feature values held as contiguous NumPy arrays. Columns
+    memory-mapped from the disk tier stay mapped: appends go to a small owned
+    tail that the store appends to the files, never copying the mapped rows.
+    """
+    timestamps: np.ndarray  # int64 epoch nanoseconds, ascending
+    values: np.ndarray
+    size: int = -1
+    dirty: bool = True  # not yet written to the disk tier
+    tail_timestamps: Optional[np.ndarray] = None
+    tail_values: Optional[np.ndarray] = None
+    tail_size: int = 0
+    
+    def __post_init__(self):
+        if self.size < 0:
+            self.size = min(len(self.timestamps), len(self.values))
+    
+    @property
+    def mapped(self) -> bool:
+        return isinstance(self.timestamps, np.memmap)
+    
+    @property
+    def length(self) -> int:
+        return self.size + self.tail_size
+    
+    @property
+    def index(self) -> np.ndarray:
+        if self.tail_size:
+            return np.concatenate((self.timestamps[:self.size], self.tail_timestamps[:self.tail_size]))
+        return self.timestamps[:self.size]
+    
+    @property
+    def data(self) -> np.ndarray:
+        if self.tail_size:
+            return np.concatenate((self.values[:self.size], self.tail_values[:self.tail_size]))
+        return self.values[:self.size]
+    
+    @property
+    def nbytes(self) -> int:
+        # Memory-mapped arrays live on disk, only owned buffers count
+        arrays = (self.timestamps, self.values, self.tail_timestamps, self.tail_values)
+        return sum(array.nbytes for array in arrays if array is not None and not isinstance(array, np.memmap))
+    
+    def append(self, timestamp: int, value: float) -> None:
+        """Append one observation, growing the (tail) buffers geometrically"""
+        if self.mapped:
+            if self.tail_timestamps is None or self.tail_size == len(self.tail_timestamps):
+                self.tail_timestamps, self.tail_values = self._grow(
+                    self.tail_timestamps, self.tail_values, self.tail_size)
+            self.tail_timestamps[self.tail_size] = timestamp
+            self.tail_values[self.tail_size] = value
+            self.tail_size += 1
+        else:
+            if self.size == len(self.timestamps):
+                self.timestamps, self.values = self._grow(self.timestamps, self.values, self.size)
+            self.timestamps[self.size] = timestamp
+            self.values[self.size] = value
+            self.size += 1
+        self.dirty = True
+    
+    def remap(self, timestamps: np.memmap, values: np.memmap) -> None:
+        """Swap in the re-mapped disk files once the tail has been appended to them"""
+        self.timestamps, self.values = timestamps, values
+        self.size = min(len(timestamps), len(values))
+        self.tail_size = 0
+        self.dirty = False
+    
+    def _grow(self, timestamps: Optional[np.ndarray], values: Optional[np.ndarray],
+              size: int) -> Tuple[np.ndarray, np.ndarray]:
+        capacity = max(16, size * 2)
+        grown_timestamps = np.empty(capacity, dtype=np.int64)
+        grown_values = np.empty(capacity, dtype=self.values.dtype)
+        if size:
+            grown_timestamps[:size] = timestamps[:size]
+            grown_values[:size] = values[:size]
+        return grown_timestamps, grown_values
+    
+    def to_series(self) -> pd.Series:
+        return pd.Series(self.data, index=pd.to_datetime(self.index, unit='ns'))
 
 
 class FeatureStore:
-    """Feature store for managing trading features and indicators"""
+    """
+    Feature store for managing trading features and indicators.
+    
+    Features are keyed by (symbol, feature, version) and stored as float
+    columns with an int64 nanosecond timestamp index. The memory tier is an
+    LRU bounded by `max_memory_bytes`; when `storage_path` is set, evicted
+    columns are written to .npy files and reloaded memory-mapped on demand.
+    Appends to a mapped column are buffered in memory and appended to its
+    files every `tail_rows` rows, so live updates never reload the history.
+    """
     
     def __init__(self, config: Optional[Dict] = None):
-        self.config = config or {}
+        self.config = {**self._default_config(), **(config or {})}
+        self.logger = logging.getLogger(__name__)
+        
+        # Arbitrary named objects (reports, frames) kept for backwards compatibility
         self.features = {}
         self.metadata = {}
+        
+        # Columnar tiers
+        self.columns: 'OrderedDict[FeatureKey, FeatureColumn]' = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_keys: Dict[FeatureKey, Path] = {}
+        self.storage_path = Path(self.config['storage_path']) if self.config['storage_path'] else None
+        self.dtype = np.dtype(self.config['dtype'])
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'disk_loads': 0}
+        if self.storage_path is not None:
+            self._scan_disk_tier()
+        
+        # Model features shared by training (batch) and live inference (streaming)
+        self.pipeline = FeaturePipeline(self.config.get('pipeline'))
+        self.streaming_state: Dict[str, StreamingFeatureState] = {}
+        self.latest: Dict[str, Dict[str, float]] = {}
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default feature store configuration"""
+        return {
+            'max_memory_bytes': 256 * 1024 * 1024,
+            'storage_path': None,  # directory for the on-disk tier, None keeps memory only
+            'dtype': 'float64',
+            'tail_rows': 1024,  # rows buffered per memory-mapped column before appending to disk
+            'version': 1,  # version written by compute_features/update_streaming
+            'pipeline': None
+        }
     
     def add_feature(self, name: str, data: Any, metadata: Optional[Dict] = None):
         """Add a feature to the store"""
@@ -27,9 +198,280 @@ class FeatureStore:
         """Retrieve a feature by name"""
         return self.features.get(name)
     
-    def list_features(self) -> List[str]:
+    def list_features(self, symbol: Optional[str] = None) -> List[str]:
         """List all available features"""
-        return list(self.features.keys())
+        if symbol is None:
+            return list(self.features.keys()) + sorted({key[1] for key in self._all_keys()})
+        return sorted({key[1] for key in self._all_keys() if key[0] == symbol})
+    
+    def list_symbols(self) -> List[str]:
+        """Symbols with at least one stored column"""
+        return sorted({key[0] for key in self._all_keys()})
+    
+    def list_versions(self, symbol: str, feature: str) -> List[int]:
+        """Stored versions of a feature"""
+        return sorted(key[2] for key in self._all_keys() if key[:2] == (symbol, feature))
+    
+    # Columnar API
+    
+    def put(self, symbol: str, feature: str, timestamps: Any, values: Any,
+            version: Optional[int] = None) -> FeatureColumn:
+        """Store a feature column, replacing any existing column for the same key"""
+        key = (symbol, feature, version if version is not None else self.config['version'])
+        index = to_nanoseconds(timestamps)
+        data = np.asarray(values, dtype=self.dtype)
+        if len(index) != len(data):
+            raise ValueError(f"Feature {key}: {len(index)} timestamps for {len(data)} values")
+        
+        if len(index) > 1 and np.any(np.diff(index) < 0):
+            order = np.argsort(index, kind='stable')
+            index, data = index[order], data[order]
+        
+        column = FeatureColumn(np.ascontiguousarray(index), np.ascontiguousarray(data))
+        self._drop(key)
+        self._insert(key, column)
+        return column
+    
+    def append(self, symbol: str, feature: str, timestamp: Any, value: float,
+               version: Optional[int] = None) -> None:
+        """Append one observation to a feature column (timestamps as datetimes or epoch ns)"""
+        key = (symbol, feature, version if version is not None else self.config['version'])
+        column = self._load(key)
+        if column is None:
+            self.put(symbol, feature, [timestamp], [value], key[2])
+            return
+        
+        if not isinstance(timestamp, (int, np.integer)):
+            timestamp = int(to_nanoseconds(timestamp)[0])
+        
+        before = column.nbytes
+        column.append(timestamp, value)
+        if column.tail_size >= self.config['tail_rows']:
+            self._persist(key, column)
+        self.memory_bytes += column.nbytes - before
+        self._evict()
+    
+    def get(self, symbol: str, feature: str, version: Optional[int] = None,
+            start: Any = None, end: Any = None) -> Optional[FeatureColumn]:
+        """Feature column (latest version by default), optionally sliced to [start, end]"""
+        if version is None:
+            versions = self.list_versions(symbol, feature)
+            if not versions:
+                self.stats['misses'] += 1
+                return None
+            version = versions[-1]
+        
+        column = self._load((symbol, feature, version))
+        if column is not None and column.tail_size:
+            # Append the tail so readers get views of the mapped files rather than a copy
+            self._persist((symbol, feature, version), column)
+        if column is None or (start is None and end is None):
+            return column
+        
+        index = column.index
+        lo = np.searchsorted(index, to_nanoseconds(start)[0], side='left') if start is not None else 0
+        hi = np.searchsorted(index, to_nanoseconds(end)[0], side='right') if end is not None else len(index)
+        return FeatureColumn(index[lo:hi], column.data[lo:hi], dirty=False)
+    
+    def get_series(self, symbol: str, feature: str, version: Optional[int] = None,
+                   start: Any = None, end: Any = None) -> Optional[pd.Series]:
+        """Feature column as a pandas Series indexed by timestamp"""
+        column = self.get(symbol, feature, version, start, end)
+        return column.to_series() if column is not None else None
+    
+    def get_as_of(self, symbols: Any, times: Any, features: List[str],
+                  version: Optional[int] = None, tolerance: Optional[timedelta] = None) -> np.ndarray:
+        """
+        Point-in-time lookup: for each (symbol, time) pair, the latest value of
+        each feature timestamped at or before that time (NaN if none, or if
+        older than `tolerance`). Returns an array of shape (pairs, features).
+        """
+        query_times = to_nanoseconds(times)
+        if isinstance(symbols, str):
+            symbols = np.full(len(query_times), symbols, dtype=object)
+        symbols = np.asarray(symbols, dtype=object)
+        if len(symbols) != len(query_times):
+            raise ValueError(f"{len(symbols)} symbols for {len(query_times)} timestamps")
+        
+        result = np.full((len(query_times), len(features)), np.nan)
+        if len(query_times) == 0:
+            return result
+        max_age = int(tolerance.total_seconds() * 1e9) if tolerance is not None else None
+        
+        # Group pairs by symbol so each column is binary-searched once per symbol
+        unique_symbols, groups = np.unique(symbols.astype(str), return_inverse=True)
+        order = np.argsort(groups, kind='stable')
+        bounds = np.searchsorted(groups[order], np.arange(len(unique_symbols) + 1))
+        
+        for group, symbol in enumerate(unique_symbols):
+            rows = order[bounds[group]:bounds[group + 1]]
+            query = query_times[rows]
+            
+            for j, feature in enumerate(features):
+                column = self.get(symbol, feature, version)
+                if column is None or column.length == 0:
+                    continue
+                
+                index = column.index
+                positions = np.searchsorted(index, query, side='right') - 1
+                valid = positions >= 0
+                if max_age is not None:
+                    valid &= query - index[positions.clip(0)] <= max_age
+                result[rows[valid], j] = column.data[positions[valid]]
+        
+        return result
+    
+    def get_as_of_frame(self, symbols: Any, times: Any, features: List[str],
+                        version: Optional[int] = None, tolerance: Optional[timedelta] = None) -> pd.DataFrame:
+        """`get_as_of` as a DataFrame with symbol and timestamp columns"""
+        query_times = to_nanoseconds(times)
+        values = self.get_as_of(symbols, query_times, features, version, tolerance)
+        frame = pd.DataFrame(values, columns=features)
+        frame.insert(0, 'timestamp', pd.to_datetime(query_times, unit='ns'))
+        frame.insert(0, 'symbol', symbols if not isinstance(symbols, str) else [symbols] * len(frame))
+        return frame
+    
+    def delete(self, symbol: str, feature: Optional[str] = None, version: Optional[int] = None) -> int:
+        """Remove matching columns from both tiers, returning the number removed"""
+        removed = 0
+        for key in list(self._all_keys()):
+            if key[0] == symbol and feature in (None, key[1]) and version in (None, key[2]):
+                self._drop(key)
+                path = self.disk_keys.pop(key, None)
+                if path is not None:
+                    for suffix in ('ts', 'values'):
+                        path.with_name(f"{path.name}_{suffix}.npy").unlink(missing_ok=True)
+                removed += 1
+        return removed
+    
+    def flush(self) -> int:
+        """Write every unsaved in-memory column to the disk tier"""
+        if self.storage_path is None:
+            return 0
+        
+        written = 0
+        for key, column in self.columns.items():
+            if column.dirty:
+                self._persist(key, column)
+                written += 1
+        return written
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache and tier statistics"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_ratio': self.stats['hits'] / lookups if lookups else 0.0,
+            'memory_columns': len(self.columns),
+            'memory_bytes': self.memory_bytes,
+            'max_memory_bytes': self.config['max_memory_bytes'],
+            'disk_columns': len(self.disk_keys)
+        }
+    
+    def _all_keys(self):
+        return set(self.columns) | set(self.disk_keys)
+    
+    def _insert(self, key: FeatureKey, column: FeatureColumn) -> None:
+        """Add a column to the memory tier as most recently used"""
+        self.columns[key] = column
+        self.memory_bytes += column.nbytes
+        self._evict(keep=key)
+    
+    def _drop(self, key: FeatureKey) -> None:
+        """Remove a column from the memory tier without persisting it"""
+        column = self.columns.pop(key, None)
+        if column is not None:
+            self.memory_bytes -= column.nbytes
+    
+    def _load(self, key: FeatureKey) -> Optional[FeatureColumn]:
+        """Column from memory, falling back to a memory-mapped read from disk"""
+        column = self.columns.get(key)
+        if column is not None:
+            self.columns.move_to_end(key)
+            self.stats['hits'] += 1
+            return column
+        
+        path = self.disk_keys.get(key)
+        if path is None:
+            self.stats['misses'] += 1
+            return None
+        
+        self.stats['disk_loads'] += 1
+        column = FeatureColumn(*self._map_column(path), dirty=False)
+        self._insert(key, column)
+        return column
+    
+    def _evict(self, keep: Optional[FeatureKey] = None) -> None:
+        """Evict least recently used columns until under the memory budget"""
+        while self.memory_bytes > self.config['max_memory_bytes'] and len(self.columns) > 1:
+            key = next(iter(self.columns))
+            if key == keep:
+                self.columns.move_to_end(key)
+                key = next(iter(self.columns))
+            
+            column = self.columns[key]
+            if self.storage_path is not None and column.dirty:
+                self._persist(key, column)
+            elif self.storage_path is None:
+                self.logger.debug(f"Dropping feature column {key} (no disk tier)")
+            
+            self._drop(key)
+            self.stats['evictions'] += 1
+    
+    def _column_path(self, key: FeatureKey) -> Path:
+        """Base path of a column's files in the disk tier (names percent-encoded, so reversible)"""
+        symbol, feature, version = key
+        return self.storage_path / quote(str(symbol), safe='') / quote(str(feature), safe='') / f"v{version}"
+    
+    def _map_column(self, path: Path) -> Tuple[np.memmap, np.memmap]:
+        return (np.load(path.with_name(f"{path.name}_ts.npy"), mmap_mode='r'),
+                np.load(path.with_name(f"{path.name}_values.npy"), mmap_mode='r'))
+    
+    def _persist(self, key: FeatureKey, column: FeatureColumn) -> None:
+        """Write a dirty column to the disk tier, appending only the tail of a mapped column"""
+        path = self.disk_keys.get(key)
+        if column.mapped and column.tail_size and path is not None:
+            rows = column.tail_size
+            try:
+                appended = all(append_npy(path.with_name(f"{path.name}_{suffix}.npy"), array[:rows])
+                               for suffix, array in (('ts', column.tail_timestamps), ('values', column.tail_values)))
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Error appending to feature column {key}: {e}")
+                appended = False
+            
+            if appended:
+                timestamps, values = self._map_column(path)
+                if min(len(timestamps), len(values)) == column.size + rows:
+                    column.remap(timestamps, values)
+                    return
+        
+        self._write_column(key, column)
+    
+    def _write_column(self, key: FeatureKey, column: FeatureColumn) -> None:
+        """Persist a column as a pair of .npy files"""
+        path = self._column_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write to temporary names first so a crash never leaves a partial column
+        for suffix, array in (('ts', column.index), ('values', column.data)):
+            target = path.with_name(f"{path.name}_{suffix}.npy")
+            temporary = path.with_name(f"{path.name}_{suffix}.tmp.npy")
+            np.save(temporary, np.ascontiguousarray(array))
+            temporary.replace(target)
+        
+        column.dirty = False
+        self.disk_keys[key] = path
+    
+    def _scan_disk_tier(self) -> None:
+        """Index columns already present in the storage directory"""
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        for values_file in self.storage_path.glob("*/*/v*_values.npy"):
+            version = values_file.name[1:-len("_values.npy")]
+            if version.isdigit():
+                key = (unquote(values_file.parent.parent.name), unquote(values_file.parent.name), int(version))
+                self.disk_keys[key] = values_file.with_name(f"v{version}")
+    
+    # Feature computation
     
     def compute_technical_indicators(self, price_data: pd.DataFrame) -> Dict[str, pd.Series]:
         """Compute basic technical indicators"""
@@ -52,5 +494,62 @@ class FeatureStore:
     def update_features(self, market_data: Dict[str, Any]):
         """Update features with new market data"""
         if isinstance(market_data, dict) and 'price_data' in market_data:
-            indicators = self.compute_technical_indicators(market_data['price_data'])
-            self.features.update(indicators)
\ No newline at end of file
+            price_data = market_data['price_data']
+            symbol = market_data.get('symbol', 'default')
+            indicators = self.compute_technical_indicators(price_data)
+            for name, series in indicators.items():
+                self.put(symbol, name, series.index, series.to_numpy())
+    
+    def compute_features(self, symbol: str, close: List[float], volume: Optional[List[float]] = None,
+                         timestamps: Optional[List[Any]] = None) -> pd.DataFrame:
+        """Compute pipeline features over a full history and store them"""
+        matrix = self.pipeline.transform(close, volume, timestamps)
+        index = None
+        if timestamps is not None and len(timestamps) == len(matrix):
+            index = timestamps if isinstance(timestamps, pd.DatetimeIndex) else pd.DatetimeIndex(pd.to_datetime(list(timestamps)))
+        frame = pd.DataFrame(matrix, columns=self.pipeline.feature_names, index=index)
+        
+        if index is not None:
+            for column, name in enumerate(self.pipeline.feature_names):
+                self.put(symbol, name, index, matrix[:, column])
+        return frame
+    
+    def update_streaming(self, symbol: str, bar: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """Fold a new bar into the symbol's pipeline state and return its feature row"""
+        if symbol not in self.streaming_state:
+            self.streaming_state[symbol] = self.pipeline.create_state()
+        
+        row = self.streaming_state[symbol].update(bar)
+        if row is None:
+            return None
+        
+        values = dict(zip(self.pipeline.feature_names, row.tolist()))
+        self.latest[symbol] = values
+        
+        timestamp = int(to_nanoseconds(bar.get('timestamp') or datetime.now())[0])
+        for name, value in values.items():
+            self.append(symbol, name, timestamp, value)
+        return values
+    
+    def warm_up_streaming(self, symbol: str, close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                          timestamps: Optional[Sequence[Any]] = None) -> Optional[Dict[str, float]]:
+        """
+        Seed a symbol's streaming state from history: feature columns come from
+        one batch transform, the state from the trailing pipeline.history_bars.
+        """
+        self.compute_features(symbol, close, volume, timestamps)
+        
+        state = self.pipeline.create_state()
+        row = state.warm_up(close, volume, timestamps)
+        self.streaming_state[symbol] = state
+        if row is None:
+            self.latest.pop(symbol, None)
+            return None
+        
+        values = dict(zip(self.pipeline.feature_names, row.tolist()))
+        self.latest[symbol] = values
+        return values
+    
+    def get_latest_features(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Most recent streaming feature row for a symbol"""
+        return self.latest.get(symbol)
@@ -0,0 +1,365 @@
+"""
+Market Data Feeds - Multiplexed real-time bar sources
+One connection or batched request per provider, fanned out to subscribers
+"""
+
+import asyncio
+import json
+import logging
+import time
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Set
+
+import websockets
+import yfinance as yf
+
+from .bar_aggregator import parse_timeframe
+
+
+Bar = Dict[str, Any]  # symbol, open, high, low, close, volume, timestamp
+EmitFn = Callable[[List[Bar]], Awaitable[None]]
+
+
+class MarketFeed(ABC):
+    """
+    Source of real-time bars for many symbols at once.
+    run() streams batches of bars to `emit` until stop() is called.
+    """
+    
+    name = "feed"
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.running = False
+    
+    @abstractmethod
+    async def run(self, symbols: List[str], emit: EmitFn) -> None:
+        """Stream bars of `symbols` to `emit` until stopped"""
+    
+    async def stop(self) -> None:
+        self.running = False
+
+
+class YahooQuoteFeed(MarketFeed):
+    """
+    Polls Yahoo Finance for the bars closed since the last poll.
+    yfinance has no batched quote endpoint, so each download still costs one
+    HTTP request per symbol; polling is therefore limited to once per bar
+    interval. Only WebSocketFeed streams all symbols over a single connection.
+    """
+    
+    name = "yahoo_finance"
+    
+    def __init__(self, update_frequency: float = 1.0, interval: str = "1m", batch_size: int = 200):
+        super().__init__()
+        self.update_frequency = update_frequency
+        self.interval = interval
+        self.batch_size = batch_size
+        self.width = pd.Timedelta(parse_timeframe(interval), unit='ns')
+        # No new bar can close sooner, so polling faster only repeats downloads
+        self.poll_interval = max(update_frequency, self.width.total_seconds())
+        self.last_emitted: Dict[str, pd.Timestamp] = {}
+    
+    async def run(self, symbols: List[str], emit: EmitFn) -> None:
+        loop = asyncio.get_running_loop()
+        self.running = True
+        while self.running:
+            started = time.monotonic()
+            for first in range(0, len(symbols), self.batch_size):
+                batch = symbols[first:first + self.batch_size]
+                try:
+                    bars = await loop.run_in_executor(None, self._fetch_closed_bars, batch)
+                    if bars:
+                        await emit(bars)
+                except Exception as e:
+                    self.logger.error(f"Error polling {self.name} quotes: {e}")
+            await asyncio.sleep(max(0.0, self.poll_interval - (time.monotonic() - started)))
+    
+    def _fetch_closed_bars(self, symbols: List[str]) -> List[Bar]:
+        """Bars that closed since the last emitted one, oldest first; the forming bar is left for the next poll"""
+        known = [self.last_emitted[symbol] for symbol in symbols if symbol in self.last_emitted]
+        if len(known) == len(symbols):
+            # Only the bars after the oldest one already emitted
+            window = {'start': min(known).tz_convert('UTC').to_pydatetime()}
+        else:
+            window = {'period': "1d"}
+        data = yf.download(symbols, interval=self.interval, group_by="ticker",
+                           progress=False, threads=False, **window)
+        if data is None or data.empty:
+            return []
+        
+        now = pd.Timestamp.now(tz='UTC')
+        bars = []
+        for symbol in symbols:
+            frame = data[symbol] if isinstance(data.columns, pd.MultiIndex) else data
+            frame = frame.dropna()
+            if frame.empty:
+                continue
+            
+            index = frame.index.tz_localize('UTC') if frame.index.tz is None else frame.index.tz_convert('UTC')
+            closed = (index + self.width) <= now
+            last = self.last_emitted.get(symbol)
+            if last is not None:
+                closed &= index > last
+            if not closed.any():
+                continue
+            
+            rows = frame[closed]
+            for timestamp, row in zip(rows.index, rows[['Open', 'High', 'Low', 'Close', 'Volume']].to_numpy()):
+                bars.append({
+                    'symbol': symbol,
+                    'open': float(row[0]),
+                    'high': float(row[1]),
+                    'low': float(row[2]),
+                    'close': float(row[3]),
+                    'volume': float(row[4]),
+                    'timestamp': timestamp.to_pydatetime()
+                })
+            self.last_emitted[symbol] = index[closed][-1]
+        return bars
+
+
+class WebSocketFeed(MarketFeed):
+    """
+    One WebSocket carrying every subscribed symbol.
+    Subclasses supply the provider's handshake and message format.
+    """
+    
+    name = "websocket"
+    
+    def __init__(self, url: str, reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0):
+        super().__init__()
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.socket = None
+    
+    def handshake(self, symbols: List[str]) -> List[str]:
+        """Messages sent after connecting (authentication, subscriptions)"""
+        return [json.dumps({'action': 'subscribe', 'symbols': symbols})]
+    
+    @abstractmethod
+    def parse(self, message: Any) -> List[Bar]:
+        """Bars contained in one message"""
+    
+    async def run(self, symbols: List[str], emit: EmitFn) -> None:
+        self.running = True
+        delay = self.reconnect_delay
+        while self.running:
+            try:
+                async with websockets.connect(self.url) as socket:
+                    self.socket = socket
+                    for message in self.handshake(symbols):
+                        await socket.send(message)
+                    delay = self.reconnect_delay
+                    
+                    async for message in socket:
+                        bars = self.parse(message)
+                        if bars:
+                            await emit(bars)
+                        if not self.running:
+                            break
+                
+            except Exception as e:
+                if not self.running:
+                    break
+                self.logger.error(f"{self.name} feed disconnected: {e}; reconnecting in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                self.socket = None
+    
+    async def stop(self) -> None:
+        self.running = False
+        if self.socket is not None:
+            await self.socket.close()
+
+
+class AlpacaBarFeed(WebSocketFeed):
+    """Alpaca market data stream: minute bars (and optionally trade ticks) for all symbols over one socket"""
+    
+    name = "alpaca"
+    
+    def __init__(self, api_key: str, secret_key: str,
+                 url: str = "wss://stream.data.alpaca.markets/v2/iex", trades: bool = False, **kwargs):
+        super().__init__(url, **kwargs)
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.trades = trades  # also stream ticks for the bar aggregator
+    
+    def handshake(self, symbols: List[str]) -> List[str]:
+        subscription = {'action': 'subscribe', 'bars': symbols}
+        if self.trades:
+            subscription['trades'] = symbols
+        return [
+            json.dumps({'action': 'auth', 'key': self.api_key, 'secret': self.secret_key}),
+            json.dumps(subscription)
+        ]
+    
+    def parse(self, message: Any) -> List[Bar]:
+        bars = []
+        for event in json.loads(message):
+            if event.get('T') == 'b':
+                bars.append({
+                    'symbol': event['S'],
+                    'open': event['o'],
+                    'high': event['h'],
+                    'low': event['l'],
+                    'close': event['c'],
+                    'volume': event['v'],
+                    'timestamp': pd.Timestamp(event['t']).to_pydatetime()
+                })
+            elif event.get('T') == 't':
+                bars.append({
+                    'symbol': event['S'],
+                    'price': event['p'],
+                    'size': event['s'],
+                    'timestamp': pd.Timestamp(event['t']).to_pydatetime()
+                })
+            elif event.get('T') == 'error':
+                self.logger.error(f"Alpaca stream error {event.get('code')}: {event.get('msg')}")
+        return bars
+
+
+class ReplayFeed(MarketFeed):
+    """
+    Replays stored bars in time order, one batch per timestamp.
+    speed is a multiple of real time; 0 replays as fast as the subscribers allow.
+    """
+    
+    name = "replay"
+    
+    def __init__(self, data: Dict[str, pd.DataFrame], speed: float = 0.0):
+        super().__init__()
+        self.speed = speed
+        
+        frames = []
+        for symbol, frame in data.items():
+            frame = frame.rename(columns=str.lower)[['open', 'high', 'low', 'close', 'volume']]
+            frames.append(frame.assign(symbol=symbol))
+        self.bars = pd.concat(frames).sort_index(kind='stable') if frames else pd.DataFrame()
+        self.position = 0
+    
+    async def run(self, symbols: List[str], emit: EmitFn) -> None:
+        self.running = True
+        if self.bars.empty:
+            return
+        
+        bars = self.bars[self.bars['symbol'].isin(symbols)]
+        timestamps = bars.index
+        # Batch boundaries: every change of timestamp
+        boundaries = np.flatnonzero(timestamps[1:] != timestamps[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(bars)]])
+        
+        records = bars.to_dict('records')
+        previous = None
+        for start, end in zip(starts[self.position:], ends[self.position:]):
+            if not self.running:
+                break
+            timestamp = timestamps[start].to_pydatetime()
+            if self.speed > 0 and previous is not None:
+                await asyncio.sleep((timestamp - previous).total_seconds() / self.speed)
+            previous = timestamp
+            
+            await emit([{**record, 'timestamp': timestamp} for record in records[start:end]])
+            self.position += 1
+            if self.speed <= 0:
+                await asyncio.sleep(0)
+        
+        self.running = False
+
+
+class SimulatedFeed(MarketFeed):
+    """Random-walk bars for every symbol, for running without a data provider"""
+    
+    name = "simulated"
+    
+    def __init__(self, update_frequency: float = 1.0, volatility: float = 0.001,
+                 initial_price: float = 100.0, seed: Optional[int] = None):
+        super().__init__()
+        self.update_frequency = update_frequency
+        self.volatility = volatility
+        self.initial_price = initial_price
+        self.rng = np.random.default_rng(seed)
+    
+    async def run(self, symbols: List[str], emit: EmitFn) -> None:
+        self.running = True
+        prices = np.full(len(symbols), self.initial_price)
+        while self.running:
+            opens = prices
+            prices = opens * np.exp(self.rng.normal(0, self.volatility, len(symbols)))
+            spread = np.abs(self.rng.normal(0, self.volatility / 2, len(symbols)))
+            highs = np.maximum(opens, prices) * (1 + spread)
+            lows = np.minimum(opens, prices) * (1 - spread)
+            volumes = self.rng.lognormal(10, 0.5, len(symbols))
+            timestamp = datetime.now()
+            
+            await emit([
+                {'symbol': symbol, 'open': o, 'high': h, 'low': l, 'close': c, 'volume': v, 'timestamp': timestamp}
+                for symbol, o, h, l, c, v in zip(symbols, opens.tolist(), highs.tolist(), lows.tolist(),
+                                                 prices.tolist(), volumes.tolist())
+            ])
+            await asyncio.sleep(self.update_frequency)
+
+
+class FeedHub:
+    """Runs one task per feed and fans each batch of bars out to subscribers"""
+    
+    def __init__(self, feeds: List[MarketFeed]):
+        self.feeds = feeds
+        self.logger = logging.getLogger(__name__)
+        
+        self.subscribers: List[tuple] = []  # (callback, symbols or None for all)
+        self.tasks: List[asyncio.Task] = []
+        self.stats = {'batches': 0, 'bars': 0, 'subscriber_errors': 0}
+    
+    def subscribe(self, callback: EmitFn, symbols: Optional[Set[str]] = None) -> None:
+        """Receive batches of bars, optionally only for some symbols"""
+        self.subscribers.append((callback, set(symbols) if symbols is not None else None))
+    
+    async def start(self, symbols: List[str]) -> None:
+        """Start every feed for the given symbols"""
+        for feed in self.feeds:
+            self.tasks.append(asyncio.create_task(self._run_feed(feed, symbols)))
+    
+    async def _run_feed(self, feed: MarketFeed, symbols: List[str]) -> None:
+        try:
+            await feed.run(symbols, self._publish)
+        except Exception as e:
+            self.logger.error(f"Feed {feed.name} stopped: {e}")
+    
+    async def _publish(self, bars: List[Bar]) -> None:
+        """Deliver a batch to each subscriber"""
+        self.stats['batches'] += 1
+        self.stats['bars'] += len(bars)
+        for callback, symbols in self.subscribers:
+            selected = bars if symbols is None else [bar for bar in bars if bar['symbol'] in symbols]
+            if not selected:
+                continue
+            try:
+                await callback(selected)
+            except Exception as e:
+                self.stats['subscriber_errors'] += 1
+                self.logger.error(f"Error in feed subscriber: {e}")
+    
+    async def stop(self) -> None:
+        """Stop all feeds and wait for their tasks"""
+        for feed in self.feeds:
+            await feed.stop()
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get feed status"""
+        return {
+            'feeds': [feed.name for feed in self.feeds],
+            'running': sum(1 for task in self.tasks if not task.done()),
+            'subscribers': len(self.subscribers),
+            **self.stats
+        }
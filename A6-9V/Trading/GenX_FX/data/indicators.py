@@ -0,0 +1,733 @@
+"""
+GenX-FX Indicator Engine
+Vectorized technical indicators computed for many symbols in one pass
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+
+def stack_series(series: Sequence[Sequence[float]], max_bars: Optional[int] = None) -> np.ndarray:
+    """Stack per-symbol histories into a (symbols x bars) matrix, left-padded with NaN"""
+    arrays = [np.asarray(s, dtype=np.float64) for s in series]
+    if max_bars is not None:
+        arrays = [a[-max_bars:] for a in arrays]
+    
+    width = max((len(a) for a in arrays), default=0)
+    matrix = np.full((len(arrays), width), np.nan)
+    
+    for row, values in enumerate(arrays):
+        if len(values):
+            matrix[row, width - len(values):] = values
+    
+    return matrix
+
+
+def series_lengths(prices: np.ndarray) -> np.ndarray:
+    """Number of valid (non-padded) bars in each row"""
+    return np.count_nonzero(~np.isnan(prices), axis=1)
+
+
+def last_values(prices: np.ndarray) -> np.ndarray:
+    """Latest value of each row (NaN for empty rows)"""
+    if prices.shape[1] == 0:
+        return np.full(prices.shape[0], np.nan)
+    return prices[:, -1].copy()
+
+
+def batch_sma(prices: np.ndarray, period: int) -> np.ndarray:
+    """SMA of the last `period` bars; rows shorter than `period` return their last value"""
+    lengths = series_lengths(prices)
+    last = last_values(prices)
+    if prices.shape[1] < period:
+        return last
+    
+    sma = prices[:, -period:].mean(axis=1)
+    return np.where(lengths >= period, sma, last)
+
+
+def batch_ema(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA seeded with each row's first valid bar, evaluated at the last bar.
+    Computed as a weighted sum instead of a per-bar recursion, which gives
+    the same result as the iterative update for every row at once.
+    """
+    n_rows, width = prices.shape
+    lengths = series_lengths(prices)
+    last = last_values(prices)
+    if width == 0:
+        return last
+    
+    multiplier = 2 / (period + 1)
+    decay = 1 - multiplier
+    exponents = np.arange(width - 1, -1, -1, dtype=np.float64)
+    weights = multiplier * decay ** exponents
+    
+    start = width - lengths
+    columns = np.arange(width)
+    after_seed = columns[None, :] > start[:, None]
+    
+    ema = np.where(after_seed, prices, 0.0) @ weights
+    
+    has_data = lengths > 0
+    seed_index = np.minimum(start, width - 1)
+    seed = prices[np.arange(n_rows), seed_index]
+    ema = ema + np.where(has_data, decay ** (width - 1 - seed_index) * seed, 0.0)
+    
+    return np.where(lengths >= period, ema, last)
+
+
+def batch_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI over the last `period` price changes; rows without enough history return 50"""
+    lengths = series_lengths(prices)
+    if prices.shape[1] < period + 1:
+        return np.full(prices.shape[0], 50.0)
+    
+    deltas = np.diff(prices[:, -(period + 1):], axis=1)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    
+    avg_gain = gains.mean(axis=1)
+    avg_loss = losses.mean(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    rsi = np.where(avg_loss == 0, 100.0, rsi)
+    
+    return np.where(lengths >= period + 1, rsi, 50.0)
+
+
+def batch_macd(prices: np.ndarray, fast: int = 12, slow: int = 26) -> np.ndarray:
+    """MACD line (fast EMA - slow EMA); rows shorter than `slow` return 0"""
+    lengths = series_lengths(prices)
+    macd = batch_ema(prices, fast) - batch_ema(prices, slow)
+    return np.where(lengths >= slow, macd, 0.0)
+
+
+def batch_bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger bands; rows shorter than `period` collapse to their last value"""
+    lengths = series_lengths(prices)
+    last = last_values(prices)
+    if prices.shape[1] < period:
+        return last, last.copy(), last.copy()
+    
+    window = prices[:, -period:]
+    sma = window.mean(axis=1)
+    std = window.std(axis=1)
+    
+    enough = lengths >= period
+    upper = np.where(enough, sma + std * std_dev, last)
+    middle = np.where(enough, sma, last)
+    lower = np.where(enough, sma - std * std_dev, last)
+    
+    return upper, middle, lower
+
+
+def batch_rolling_max(values: np.ndarray, period: int, default: float = 0.0) -> np.ndarray:
+    """Max of the last `period` bars; rows shorter than `period` return `default`"""
+    lengths = series_lengths(values)
+    if values.shape[1] < period:
+        return np.full(values.shape[0], default)
+    return np.where(lengths >= period, values[:, -period:].max(axis=1), default)
+
+
+def batch_rolling_min(values: np.ndarray, period: int, default: float = 0.0) -> np.ndarray:
+    """Min of the last `period` bars; rows shorter than `period` return `default`"""
+    lengths = series_lengths(values)
+    if values.shape[1] < period:
+        return np.full(values.shape[0], default)
+    return np.where(lengths >= period, values[:, -period:].min(axis=1), default)
+
+
+# Market regime measures over (symbols x bars) matrices
+
+def _row_std(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Population std of the non-NaN values in each row, and their count"""
+    counts = np.count_nonzero(~np.isnan(values), axis=1)
+    mean = np.nansum(values, axis=1) / np.maximum(counts, 1)
+    variance = np.nansum((values - mean[:, None]) ** 2, axis=1) / np.maximum(counts, 1)
+    return np.sqrt(variance), counts
+
+
+def batch_volatility(prices: np.ndarray, periods_per_year: int = 252) -> np.ndarray:
+    """Annualized std of simple returns over each row's history; rows with < 2 bars return 0"""
+    if prices.shape[1] < 2:
+        return np.zeros(prices.shape[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(prices, axis=1) / prices[:, :-1]
+    std, counts = _row_std(returns)
+    return np.where(counts > 0, std * np.sqrt(periods_per_year), 0.0)
+
+
+def batch_trend(prices: np.ndarray) -> np.ndarray:
+    """Return from each row's first to last bar; rows with < 2 bars return 0"""
+    lengths = series_lengths(prices)
+    if prices.shape[1] == 0:
+        return np.zeros(prices.shape[0])
+    first = prices[np.arange(prices.shape[0]), np.minimum(prices.shape[1] - lengths, prices.shape[1] - 1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trend = (last_values(prices) - first) / first
+    return np.where((lengths >= 2) & np.isfinite(trend), trend, 0.0)
+
+
+def batch_volume_profile(volumes: np.ndarray) -> np.ndarray:
+    """Last volume relative to the row's mean; 0 for empty rows, 1 when the mean is 0"""
+    lengths = series_lengths(volumes)
+    if volumes.shape[1] == 0:
+        return np.zeros(volumes.shape[0])
+    mean = np.nansum(volumes, axis=1) / np.maximum(lengths, 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profile = np.where(mean > 0, last_values(volumes) / mean, 1.0)
+    return np.where(lengths > 0, profile, 0.0)
+
+
+def batch_realized_volatility(prices: np.ndarray, window: int = 20, periods_per_year: int = 252) -> np.ndarray:
+    """Annualized std of the last `window` log returns; rows without enough history return 0"""
+    lengths = series_lengths(prices)
+    if prices.shape[1] < window + 1:
+        return np.zeros(prices.shape[0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(np.log(prices[:, -(window + 1):]), axis=1)
+    realized = returns.std(axis=1) * np.sqrt(periods_per_year)
+    return np.where((lengths >= window + 1) & np.isfinite(realized), realized, 0.0)
+
+
+def batch_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average true range of the last `period` bars; rows without enough history return 0"""
+    lengths = series_lengths(close)
+    if close.shape[1] < period + 1:
+        return np.zeros(close.shape[0])
+    previous = close[:, -(period + 1):-1]
+    high, low = high[:, -period:], low[:, -period:]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    return np.where(lengths >= period + 1, true_range.mean(axis=1), 0.0)
+
+
+def batch_hurst(prices: np.ndarray, lags: Sequence[int] = (2, 4, 8, 16, 32)) -> np.ndarray:
+    """
+    Hurst exponent from how the spread of log-price changes grows with the lag:
+    ~0.5 random walk, > 0.5 trending, < 0.5 mean reverting. Rows without
+    2 * max(lags) bars return 0.5.
+    """
+    lags = [lag for lag in lags if lag < prices.shape[1]]
+    lengths = series_lengths(prices)
+    if len(lags) < 2:
+        return np.full(prices.shape[0], 0.5)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_prices = np.log(prices)
+        spreads = np.column_stack([_row_std(log_prices[:, lag:] - log_prices[:, :-lag])[0] for lag in lags])
+        log_spreads = np.log(spreads)
+        
+        # Least-squares slope of log spread against log lag, per row
+        log_lags = np.log(np.asarray(lags, dtype=np.float64))
+        centered = log_lags - log_lags.mean()
+        slope = (log_spreads - log_spreads.mean(axis=1, keepdims=True)) @ centered / (centered @ centered)
+    return np.where((lengths >= 2 * max(lags)) & np.isfinite(slope), slope, 0.5)
+
+
+class IndicatorEngine:
+    """Batched indicator engine shared by the decision engine strategies"""
+    
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**self._default_config(), **(config or {})}
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default indicator parameters"""
+        return {
+            'rsi_period': 14,
+            'macd_fast': 12,
+            'macd_slow': 26,
+            'sma_periods': [20, 50],
+            'bb_period': 20,
+            'bb_std_dev': 2,
+            'breakout_period': 20,
+            # EMA weights older than this fraction are below float64 resolution
+            'ema_tolerance': np.finfo(np.float64).eps
+        }
+    
+    @property
+    def history_bars(self) -> int:
+        """Number of trailing bars needed to reproduce full-history indicator values"""
+        decay = 1 - 2 / (self.config['macd_slow'] + 1)
+        ema_bars = math.ceil(math.log(self.config['ema_tolerance']) / math.log(decay)) + 1
+        windows = [
+            self.config['rsi_period'] + 1,
+            self.config['bb_period'],
+            self.config['breakout_period'],
+            *self.config['sma_periods']
+        ]
+        return max(ema_bars, *windows)
+    
+    @property
+    def params_key(self) -> Tuple:
+        """Hashable indicator parameters; values computed under equal keys are interchangeable"""
+        return tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(self.config.items())
+        )
+    
+    def compute(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+                low: Optional[np.ndarray] = None, volume: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Compute all strategy indicators for a (symbols x bars) price matrix"""
+        cfg = self.config
+        indicators = {
+            'close': last_values(close),
+            'rsi': batch_rsi(close, cfg['rsi_period']),
+            'macd': batch_macd(close, cfg['macd_fast'], cfg['macd_slow'])
+        }
+        
+        for period in cfg['sma_periods']:
+            indicators[f'sma_{period}'] = batch_sma(close, period)
+        
+        upper, middle, lower = batch_bollinger_bands(close, cfg['bb_period'], cfg['bb_std_dev'])
+        indicators['bb_upper'] = upper
+        indicators['bb_middle'] = middle
+        indicators['bb_lower'] = lower
+        
+        breakout_period = cfg['breakout_period']
+        if high is not None:
+            indicators['breakout_high'] = batch_rolling_max(high, breakout_period)
+        if low is not None:
+            indicators['breakout_low'] = batch_rolling_min(low, breakout_period)
+        if volume is not None:
+            last_volume = np.nan_to_num(last_values(volume))
+            indicators['volume'] = last_volume
+            indicators['avg_volume'] = np.where(
+                series_lengths(volume) >= breakout_period,
+                batch_sma(volume, breakout_period),
+                last_volume
+            )
+        
+        return indicators
+    
+    def compute_for_series(self, close: Sequence[Sequence[float]],
+                           high: Optional[Sequence[Sequence[float]]] = None,
+                           low: Optional[Sequence[Sequence[float]]] = None,
+                           volume: Optional[Sequence[Sequence[float]]] = None) -> List[Dict[str, float]]:
+        """Compute indicators for ragged per-symbol histories, one dict per symbol"""
+        max_bars = self.history_bars
+        matrices = {
+            name: stack_series(values, max_bars) if values is not None else None
+            for name, values in (('close', close), ('high', high), ('low', low), ('volume', volume))
+        }
+        return self.compute_for_rows(matrices['close'], matrices['high'], matrices['low'], matrices['volume'])
+    
+    def compute_for_rows(self, close: np.ndarray, high: Optional[np.ndarray] = None,
+                         low: Optional[np.ndarray] = None,
+                         volume: Optional[np.ndarray] = None) -> List[Dict[str, float]]:
+        """Compute indicators for left-padded (symbols x bars) matrices, one dict per row"""
+        max_bars = self.history_bars
+        indicators = self.compute(*(
+            matrix[:, -max_bars:] if matrix is not None else None for matrix in (close, high, low, volume)
+        ))
+        
+        return [
+            {name: float(values[row]) for name, values in indicators.items()}
+            for row in range(close.shape[0])
+        ]
+    
+    def compute_history(self, close: Sequence[float], high: Optional[Sequence[float]] = None,
+                        low: Optional[Sequence[float]] = None,
+                        volume: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        Indicator values at every bar of one symbol's history, equal to
+        calling `compute` on each prefix (used to replay history in backtests)
+        """
+        cfg = self.config
+        close_series = pd.Series(np.asarray(close, dtype=np.float64))
+        close_values = close_series.to_numpy()
+        bars = np.arange(1, len(close_values) + 1)
+        
+        deltas = close_series.diff()
+        avg_gain = deltas.clip(lower=0).rolling(cfg['rsi_period']).mean().to_numpy()
+        avg_loss = (-deltas).clip(lower=0).rolling(cfg['rsi_period']).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi = np.where(avg_loss == 0, 100.0, rsi)
+        
+        ema_fast = close_series.ewm(span=cfg['macd_fast'], adjust=False).mean().to_numpy()
+        ema_slow = close_series.ewm(span=cfg['macd_slow'], adjust=False).mean().to_numpy()
+        
+        indicators = {
+            'close': close_values,
+            'rsi': np.where(bars >= cfg['rsi_period'] + 1, rsi, 50.0),
+            'macd': np.where(bars >= cfg['macd_slow'], ema_fast - ema_slow, 0.0)
+        }
+        
+        for period in cfg['sma_periods']:
+            sma = close_series.rolling(period).mean().to_numpy()
+            indicators[f'sma_{period}'] = np.where(bars >= period, sma, close_values)
+        
+        window = close_series.rolling(cfg['bb_period'])
+        mean = window.mean().to_numpy()
+        std = window.std(ddof=0).to_numpy()
+        enough = bars >= cfg['bb_period']
+        indicators['bb_upper'] = np.where(enough, mean + std * cfg['bb_std_dev'], close_values)
+        indicators['bb_middle'] = np.where(enough, mean, close_values)
+        indicators['bb_lower'] = np.where(enough, mean - std * cfg['bb_std_dev'], close_values)
+        
+        breakout_period = cfg['breakout_period']
+        enough = bars >= breakout_period
+        if high is not None:
+            rolling_high = pd.Series(np.asarray(high, dtype=np.float64)).rolling(breakout_period).max().to_numpy()
+            indicators['breakout_high'] = np.where(enough, rolling_high, 0.0)
+        if low is not None:
+            rolling_low = pd.Series(np.asarray(low, dtype=np.float64)).rolling(breakout_period).min().to_numpy()
+            indicators['breakout_low'] = np.where(enough, rolling_low, 0.0)
+        if volume is not None:
+            volume_series = pd.Series(np.nan_to_num(np.asarray(volume, dtype=np.float64)))
+            avg_volume = volume_series.rolling(breakout_period).mean().to_numpy()
+            indicators['volume'] = volume_series.to_numpy()
+            indicators['avg_volume'] = np.where(enough, avg_volume, indicators['volume'])
+        
+        return indicators
+
+
+
+@dataclass
+class IndicatorSnapshot:
+    """Indicator values for one symbol as of one bar"""
+    symbol: str
+    bar_key: Tuple
+    values: Dict[str, float]
+    created_at: datetime = field(default_factory=datetime.now)
+    
+    def __getitem__(self, name: str) -> float:
+        return self.values[name]
+    
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+
+class IndicatorCache:
+    """Latest indicator snapshot per symbol, invalidated when a new bar arrives"""
+    
+    def __init__(self):
+        self.snapshots: Dict[str, IndicatorSnapshot] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, symbol: str, bar_key: Tuple) -> Optional[IndicatorSnapshot]:
+        """Return the cached snapshot if it was computed for the same bar"""
+        snapshot = self.snapshots.get(symbol)
+        if snapshot is not None and snapshot.bar_key == bar_key:
+            self.hits += 1
+            return snapshot
+        
+        self.misses += 1
+        return None
+    
+    def put(self, symbol: str, bar_key: Tuple, values: Dict[str, float]) -> IndicatorSnapshot:
+        """Store a freshly computed snapshot, replacing the previous bar's"""
+        snapshot = IndicatorSnapshot(symbol=symbol, bar_key=bar_key, values=values)
+        self.snapshots[symbol] = snapshot
+        return snapshot
+    
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop one symbol's snapshot, or all of them"""
+        if symbol is None:
+            self.snapshots.clear()
+        else:
+            self.snapshots.pop(symbol, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.snapshots)
+        }
+
+# Incremental (streaming) indicators
+#
+# Each object holds just enough state to update in O(1) when a new bar
+# arrives, and reports the same values as the batch functions above.
+
+class RunningEMA:
+    """Exponential moving average seeded with the first observed value"""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self.ema = None
+        self.last = None
+    
+    def update(self, value: float) -> float:
+        """Add a value and return the current EMA"""
+        self.count += 1
+        self.last = value
+        if self.ema is None:
+            self.ema = value
+        else:
+            self.ema = value * self.multiplier + self.ema * (1 - self.multiplier)
+        return self.value
+    
+    @property
+    def value(self) -> Optional[float]:
+        """EMA, or the latest value until `period` bars have been seen"""
+        if self.count < self.period:
+            return self.last
+        return self.ema
+
+
+class RollingWindow:
+    """Fixed-length window with running sum and sum of squares"""
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+    
+    def update(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full"""
+        if len(self.values) == self.period:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        
+        # Resync once per window to stop floating point drift (amortized O(1))
+        self._updates += 1
+        if self._updates % self.period == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+    
+    @property
+    def is_full(self) -> bool:
+        return len(self.values) == self.period
+    
+    @property
+    def last(self) -> Optional[float]:
+        return self.values[-1] if self.values else None
+    
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else float('nan')
+    
+    @property
+    def std(self) -> float:
+        if not self.values:
+            return float('nan')
+        mean = self.mean
+        return math.sqrt(max(self.total_sq / len(self.values) - mean * mean, 0.0))
+
+
+class RollingExtreme:
+    """Rolling max or min over the last `period` values using a monotonic deque"""
+    
+    def __init__(self, period: int, mode: str = 'max'):
+        if mode not in ('max', 'min'):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.period = period
+        self.mode = mode
+        self.window = deque()
+        self.count = 0
+    
+    def update(self, value: float) -> None:
+        """Add a value to the window"""
+        if self.mode == 'max':
+            while self.window and self.window[-1][1] <= value:
+                self.window.pop()
+        else:
+            while self.window and self.window[-1][1] >= value:
+                self.window.pop()
+        
+        self.window.append((self.count, value))
+        self.count += 1
+        
+        if self.window[0][0] <= self.count - 1 - self.period:
+            self.window.popleft()
+    
+    @property
+    def is_full(self) -> bool:
+        return self.count >= self.period
+    
+    @property
+    def value(self) -> Optional[float]:
+        return self.window[0][1] if self.window else None
+
+
+class RollingRSI:
+    """RSI from simple averages of the last `period` gains and losses"""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.previous = None
+    
+    def update(self, price: float) -> float:
+        """Add a price and return the current RSI"""
+        if self.previous is not None:
+            delta = price - self.previous
+            self.gains.update(max(delta, 0.0))
+            self.losses.update(max(-delta, 0.0))
+        self.previous = price
+        return self.value
+    
+    @property
+    def value(self) -> float:
+        if not self.gains.is_full:
+            return 50.0
+        avg_loss = self.losses.mean
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.gains.mean / avg_loss))
+
+
+class WilderRSI:
+    """RSI with Wilder's smoothing, seeded from the first `period` changes"""
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+    
+    def update(self, price: float) -> float:
+        """Add a price and return the current RSI"""
+        if self.previous is not None:
+            delta = price - self.previous
+            gain = max(delta, 0.0)
+            loss = max(-delta, 0.0)
+            self.count += 1
+            
+            if self.count <= self.period:
+                # Simple average until the first full window
+                self.avg_gain += (gain - self.avg_gain) / self.count
+                self.avg_loss += (loss - self.avg_loss) / self.count
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        
+        self.previous = price
+        return self.value
+    
+    @property
+    def value(self) -> float:
+        if self.count < self.period:
+            return 50.0
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+
+class StreamingIndicators:
+    """
+    Per-symbol indicator state updated in O(1) per bar.
+    `snapshot()` returns the same keys as `IndicatorEngine.compute`.
+    """
+    
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = {**IndicatorEngine().config, 'rsi_method': 'simple', **(config or {})}
+        cfg = self.config
+        
+        rsi_class = WilderRSI if cfg['rsi_method'] == 'wilder' else RollingRSI
+        self.rsi = rsi_class(cfg['rsi_period'])
+        self.ema_fast = RunningEMA(cfg['macd_fast'])
+        self.ema_slow = RunningEMA(cfg['macd_slow'])
+        self.sma = {period: RollingWindow(period) for period in cfg['sma_periods']}
+        self.bollinger = self.sma.get(cfg['bb_period']) or RollingWindow(cfg['bb_period'])
+        self.breakout_high = RollingExtreme(cfg['breakout_period'], 'max')
+        self.breakout_low = RollingExtreme(cfg['breakout_period'], 'min')
+        self.volume = RollingWindow(cfg['breakout_period'])
+        
+        self.bars = 0
+        self.last_close = None
+    
+    @property
+    def history_bars(self) -> int:
+        """Trailing bars whose replay reproduces the full-history state"""
+        bars = IndicatorEngine(self.config).history_bars
+        if self.config['rsi_method'] == 'wilder':
+            # Wilder averages decay by (period - 1) / period after a simple-average seed
+            decay = 1 - 1 / self.config['rsi_period']
+            wilder_bars = math.ceil(math.log(self.config['ema_tolerance']) / math.log(decay))
+            bars = max(bars, wilder_bars + self.config['rsi_period'] + 1)
+        return bars
+    
+    @property
+    def params_key(self) -> Tuple:
+        """IndicatorEngine.params_key of the batch values these match (Wilder RSI matches none)"""
+        key = IndicatorEngine({name: self.config[name] for name in IndicatorEngine().config}).params_key
+        if self.config['rsi_method'] != 'simple':
+            key += (('rsi_method', self.config['rsi_method']),)
+        return key
+    
+    def update(self, bar: Dict[str, Any]) -> None:
+        """Fold a new OHLCV bar into the indicator state"""
+        close = float(bar['close'])
+        self.bars += 1
+        self.last_close = close
+        
+        self.rsi.update(close)
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        for window in self.sma.values():
+            window.update(close)
+        if self.bollinger.period not in self.sma:
+            self.bollinger.update(close)
+        
+        self.breakout_high.update(float(bar.get('high', close)))
+        self.breakout_low.update(float(bar.get('low', close)))
+        self.volume.update(float(bar.get('volume', 0) or 0))
+    
+    def warm_up(self, close: Sequence[float], high: Optional[Sequence[float]] = None,
+                low: Optional[Sequence[float]] = None, volume: Optional[Sequence[float]] = None) -> None:
+        """Seed the state by replaying the trailing history_bars of a history"""
+        start = max(0, len(close) - self.history_bars)
+        for i in range(start, len(close)):
+            price = close[i]
+            self.update({
+                'close': price,
+                'high': high[i] if high is not None else price,
+                'low': low[i] if low is not None else price,
+                'volume': volume[i] if volume is not None else 0
+            })
+    
+    def snapshot(self) -> Optional[Dict[str, float]]:
+        """Current indicator values, or None before the first bar"""
+        if self.last_close is None:
+            return None
+        
+        cfg = self.config
+        close = self.last_close
+        snapshot = {
+            'close': close,
+            'rsi': self.rsi.value,
+            'macd': self.ema_fast.value - self.ema_slow.value if self.bars >= cfg['macd_slow'] else 0.0
+        }
+        
+        for period, window in self.sma.items():
+            snapshot[f'sma_{period}'] = window.mean if window.is_full else close
+        
+        if self.bollinger.is_full:
+            mean = self.bollinger.mean
+            std = self.bollinger.std
+            snapshot['bb_upper'] = mean + std * cfg['bb_std_dev']
+            snapshot['bb_middle'] = mean
+            snapshot['bb_lower'] = mean - std * cfg['bb_std_dev']
+        else:
+            snapshot['bb_upper'] = snapshot['bb_middle'] = snapshot['bb_lower'] = close
+        
+        snapshot['breakout_high'] = self.breakout_high.value if self.breakout_high.is_full else 0.0
+        snapshot['breakout_low'] = self.breakout_low.value if self.breakout_low.is_full else 0.0
+        snapshot['volume'] = self.volume.last
+        snapshot['avg_volume'] = self.volume.mean if self.volume.is_full else self.volume.last
+        
+        return snapshot
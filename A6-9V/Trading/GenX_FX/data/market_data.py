@@ -4,19 +4,38 @@ Handles real-time data ingestion, storage, and feature engineering
 """
 
 import asyncio
+import itertools
 import logging
+import threading
+import time
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
 from enum import Enum
 import json
 import sqlite3
 from pathlib import Path
 import websockets
 import aiohttp
-import yfinance as yf
+
+from .indicators import (
+    StreamingIndicators, stack_series, batch_volatility, batch_trend, batch_volume_profile,
+    batch_realized_volatility, batch_atr, batch_hurst
+)
+from .feature_store import FeatureStore
+from .columnar_store import ColumnarOHLCVStore, PRICE_COLUMNS
+from .downloader import HistoricalDownloader, HistoricalDataProvider, YahooFinanceProvider, DownloaderConfig
+from .feeds import FeedHub, MarketFeed, YahooQuoteFeed
+from .ring_buffer import BarRingBuffers
+from .bar_aggregator import BarAggregator, is_tick
+from .write_behind import WriteBehindWriter, WriteBehindConfig
+from .partitions import PartitionedTable
+from .range_cache import RangeCache
+from .training_loader import TrainingDataLoader, TrainingLoaderConfig, TrainingBatch
+from .snapshot import MarketSnapshot
+from .data_validator import StreamingBarValidator
 
 # Import statements moved to avoid circular imports
 
@@ -40,6 +59,34 @@ class DataType(Enum):
     SENTIMENT = "sentiment"
 
 
+def isoformat_index(index: pd.DatetimeIndex) -> List[str]:
+    """Vectorized Timestamp.isoformat() for a whole index, matching rows written one at a time"""
+    wall_clock = index.tz_localize(None) if index.tz is not None else index
+    seconds = wall_clock.values.astype('datetime64[s]')
+    if (seconds != wall_clock.values).any():
+        return [timestamp.isoformat() for timestamp in index]
+    
+    stamps = np.datetime_as_string(seconds, unit='s')
+    if index.tz is None:
+        return stamps.tolist()
+    
+    # UTC offsets take few distinct values; format each once
+    offsets = (wall_clock - index.tz_convert('UTC').tz_localize(None)).total_seconds().astype(int) // 60
+    suffixes = {
+        minutes: f"{'+' if minutes >= 0 else '-'}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+        for minutes in np.unique(offsets)
+    }
+    return [stamp + suffixes[minutes] for stamp, minutes in zip(stamps.tolist(), offsets.tolist())]
+
+
+def utc_timestamp(value: Any) -> pd.Timestamp:
+    """A time as a UTC Timestamp; naive datetimes are local time, as datetime.astimezone() assumes"""
+    timestamp = pd.Timestamp(value)
+    if timestamp.tz is None:
+        timestamp = pd.Timestamp(timestamp.to_pydatetime().astimezone(timezone.utc))
+    return timestamp.tz_convert('UTC')
+
+
 @dataclass
 class MarketDataConfig:
     """Market data configuration"""
@@ -50,6 +97,33 @@ class MarketDataConfig:
     storage_path: str = "market_data"
     real_time_enabled: bool = True
     backup_enabled: bool = True
+    feature_lookback: int = 100  # must match DecisionEngineConfig.lookback_period
+    storage_backend: str = "sqlite"  # "sqlite" rows or "columnar" memory-mapped files
+    ingest_batch_size: int = 50000  # rows per executemany call during bulk ingestion
+    download_concurrency: int = 8  # symbols/date ranges fetched in parallel
+    download_chunk_days: int = 365  # widest date range per provider request
+    ring_buffer_depth: int = 500  # recent bars kept in memory per symbol (>= feature_lookback)
+    bar_timeframes: List[str] = field(default_factory=lambda: ['1s', '1m', '5m', '1h'])  # built from ticks
+    primary_timeframe: str = "1m"  # aggregated timeframe stored in ohlcv_data and used for signals
+    write_sync_interval_ms: int = 200  # real-time rows are committed at least this often
+    write_max_batch_rows: int = 5000  # or as soon as this many are queued
+    write_synchronous: str = "NORMAL"  # SQLite PRAGMA synchronous for the writer ("FULL" fsyncs every commit)
+    # Retention horizon and partition size per data type; expired partitions are dropped whole
+    retention_days: Dict[str, int] = field(default_factory=lambda: {
+        'ohlcv': 365, 'ohlcv_bars': 30, 'market_conditions': 365
+    })
+    partition_periods: Dict[str, str] = field(default_factory=lambda: {
+        'ohlcv': 'month', 'ohlcv_bars': 'day', 'market_conditions': 'month'
+    })
+    regime_window: int = 20  # bars of log returns in the realized volatility
+    atr_period: int = 14
+    range_cache_bytes: int = 256 * 1024 * 1024  # memory for cached historical range queries
+    range_cache_ttl_seconds: float = 300.0
+    training_chunk_symbols: int = 64  # symbols per batch from iter_training_batches()
+    training_workers: int = 4  # threads extracting training columns
+    validate_bars: bool = True  # check each real-time bar against the previous one before buffering it
+    bar_spike_threshold: float = 0.2  # reject closes that move more than this from the previous close
+    bar_max_gap_seconds: Optional[float] = None  # flag bars arriving after a longer gap
 
 
 class MarketDataManager:
@@ -58,7 +132,8 @@ class MarketDataManager:
     Handles real-time data ingestion, storage, and processing
     """
     
-    def __init__(self, config: MarketDataConfig):
+    def __init__(self, config: MarketDataConfig, provider: Optional[HistoricalDataProvider] = None,
+                 feed: Optional[MarketFeed] = None):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
@@ -72,15 +147,89 @@ class MarketDataManager:
         # Database connection
         self.db_path = self.storage_path / "market_data.db"
         self.db_connection = None
+        # Read-only connections of worker threads that query history off the event loop
+        self._read_local = threading.local()
+        self._read_connections: List[sqlite3.Connection] = []
+        self._read_connections_lock = threading.Lock()
+        self.partitioned_tables = self._create_partitioned_tables()
+        
+        # Real-time rows are committed in batches by a background writer thread
+        self.writer = WriteBehindWriter(self.db_path, WriteBehindConfig(
+            sync_interval_ms=config.write_sync_interval_ms,
+            max_batch_rows=config.write_max_batch_rows,
+            synchronous=config.write_synchronous
+        ))
+        
+        # Hot historical ranges served from memory instead of re-reading SQLite
+        self.range_cache = RangeCache(config.range_cache_bytes, config.range_cache_ttl_seconds)
+        
+        # Columnar OHLCV backend; market conditions stay in SQLite
+        self.columnar_store = None
+        if config.storage_backend == "columnar":
+            self.columnar_store = ColumnarOHLCVStore({'storage_path': str(self.storage_path / "ohlcv")})
         
         # Real-time data
         self.current_data = {}
-        self.data_streams = {}
         self.is_streaming = False
         
+        # Fixed-size recent history per symbol, updated in place by the feed
+        self.bar_buffers = BarRingBuffers(config.ring_buffer_depth)
+        self.snapshot: Optional[MarketSnapshot] = None  # rebuilt only when a buffer changes
+        self.bar_validator = StreamingBarValidator({
+            'spike_threshold': config.bar_spike_threshold,
+            'max_gap_seconds': config.bar_max_gap_seconds
+        }) if config.validate_bars else None
+        
+        # Tick-to-bar aggregation; secondary timeframes get their own buffers and storage
+        self.bar_aggregator = BarAggregator(config.bar_timeframes)
+        secondary = [timeframe for timeframe in config.bar_timeframes if timeframe != config.primary_timeframe]
+        self.timeframe_buffers = {timeframe: BarRingBuffers(config.ring_buffer_depth) for timeframe in secondary}
+        self.timeframe_stores = {}
+        if config.storage_backend == "columnar":
+            self.timeframe_stores = {
+                timeframe: ColumnarOHLCVStore({'storage_path': str(self.storage_path / "ohlcv_bars" / timeframe)})
+                for timeframe in secondary
+            }
+        
+        # One multiplexed feed for all symbols, fanned out to subscribers
+        self.feed_hub = FeedHub([feed or self._create_feed()])
+        self.feed_hub.subscribe(self._on_feed_bars)
+        
         # Data processing
         self.feature_cache = {}
         self.last_update = {}
+        self.ingest_stats = {'rows': 0, 'seconds': 0.0, 'last_rows_per_second': 0.0}
+        
+        # Incremental indicator state, updated once per new bar
+        self.streaming_indicators: Dict[str, StreamingIndicators] = {}
+        self.indicator_params = StreamingIndicators().params_key
+        
+        # Streaming model features, computed by the same pipeline used for training
+        self.feature_store = FeatureStore({
+            'pipeline': {'lookback': config.feature_lookback},
+            'storage_path': str(self.storage_path / "features")
+        })
+        
+        # Concurrent, resumable history downloads
+        self.downloader = HistoricalDownloader(
+            provider or self._create_provider(),
+            self._ingest,
+            DownloaderConfig(
+                max_concurrency=config.download_concurrency,
+                chunk_days=config.download_chunk_days,
+                checkpoint_path=str(self.storage_path / "download_checkpoints.json")
+            )
+        )
+        
+        # Training arrays built in parallel, optionally streamed in symbol chunks
+        self.training_loader = TrainingDataLoader(
+            self._load_history,
+            TrainingLoaderConfig(
+                days=365,
+                chunk_symbols=config.training_chunk_symbols,
+                max_workers=config.training_workers
+            )
+        )
         
         # Background tasks
         self.is_running = False
@@ -116,122 +265,211 @@ class MarketDataManager:
             self.logger.error(f"Failed to initialize market data manager: {e}")
             return False
     
-    async def get_latest_data(self) -> Dict[str, Any]:
-        """Get latest market data for all symbols"""
+    async def get_latest_data(self) -> MarketSnapshot:
+        """Get latest market data for all symbols (a MarketSnapshot, which also reads like the old dict)"""
+        return await self.get_snapshot()
+    
+    async def get_snapshot(self) -> MarketSnapshot:
+        """
+        Recent bars, indicators and features of every symbol in one snapshot.
+        The bar matrices are views of the ring buffers the feed writes into;
+        only the per-symbol indicator and feature rows are rebuilt when the
+        data changes.
+        """
         try:
-            latest_data = {}
+            version = (self.bar_buffers.version, *(buffers.version for buffers in self.timeframe_buffers.values()))
+            if self.snapshot is not None and self.snapshot.version == version:
+                return self.snapshot
             
             for symbol in self.config.symbols:
-                symbol_data = await self._get_symbol_data(symbol)
-                if symbol_data:
-                    latest_data[symbol] = symbol_data
-            
-            return latest_data
+                if not self.bar_buffers.count(symbol):
+                    # Seeds the buffer from storage once
+                    await self._get_symbol_data(symbol)
+            
+            indicators, features, timeframes = [], [], []
+            for symbol in self.bar_buffers.symbols():
+                # The O(1) indicator snapshot, so consumers need not rescan history
+                indicators.append(self._get_streaming_indicators(symbol))
+                features.append(self.feature_store.get_latest_features(symbol))
+                # Secondary timeframes aggregated from ticks
+                symbol_timeframes = {timeframe: self.get_bars(symbol, timeframe) for timeframe in self.timeframe_buffers}
+                timeframes.append({
+                    timeframe: bars for timeframe, bars in symbol_timeframes.items() if bars is not None
+                } or None)
+            
+            # Seeding empty buffers above changes the version; key the snapshot by the final one
+            version = (self.bar_buffers.version, *(buffers.version for buffers in self.timeframe_buffers.values()))
+            self.snapshot = MarketSnapshot.from_buffers(
+                self.bar_buffers, indicators=indicators, features=features, timeframes=timeframes,
+                indicator_params=self.indicator_params, version=version
+            )
+            return self.snapshot
             
         except Exception as e:
-            self.logger.error(f"Error getting latest data: {e}")
-            return {}
+            self.logger.error(f"Error building market snapshot: {e}")
+            return MarketSnapshot.from_windows([], [])
     
-    async def get_training_data(self) -> Dict[str, Any]:
-        """Get training data for ML models"""
+    async def get_training_data(self) -> List[TrainingBatch]:
+        """
+        Get training data for ML models as packed batches of at most
+        training_chunk_symbols symbols. Holds every batch at once; consumers
+        that can work chunk by chunk should use iter_training_batches().
+        """
         try:
-            training_data = {}
-            
-            for symbol in self.config.symbols:
-                # Get historical data
-                historical_data = await self._get_historical_data(symbol, days=365)
-                
-                if historical_data:
-                    # Process data for training
-                    processed_data = await self._process_training_data(historical_data)
-                    training_data[symbol] = processed_data
-            
-            return training_data
+            return [batch async for batch in self.iter_training_batches()]
             
         except Exception as e:
             self.logger.error(f"Error getting training data: {e}")
-            return {}
+            return []
+    
+    async def iter_training_batches(self, chunk_symbols: Optional[int] = None) -> AsyncIterator[TrainingBatch]:
+        """Stream training data in (symbol, time, feature) batches of `chunk_symbols` symbols"""
+        async for batch in self.training_loader.iter_batches(self.config.symbols, chunk_symbols):
+            yield batch
     
     async def get_market_conditions(self) -> Dict[str, Any]:
         """Get current market conditions"""
         try:
-            conditions = {}
-            
-            for symbol in self.config.symbols:
-                symbol_data = await self._get_symbol_data(symbol)
-                if symbol_data:
-                    # Calculate market conditions
-                    volatility = await self._calculate_volatility(symbol_data)
-                    trend = await self._calculate_trend(symbol_data)
-                    volume_profile = await self._calculate_volume_profile(symbol_data)
-                    
-                    conditions[symbol] = {
-                        'volatility': volatility,
-                        'trend': trend,
-                        'volume_profile': volume_profile,
-                        'timestamp': datetime.now()
-                    }
-            
-            return conditions
+            return await self._compute_market_conditions()
             
         except Exception as e:
             self.logger.error(f"Error getting market conditions: {e}")
             return {}
     
+    async def _compute_market_conditions(self) -> Dict[str, Dict[str, Any]]:
+        """Conditions and regime measures for every symbol in one vectorized pass over the ring buffers"""
+        windows = {}
+        for symbol in self.config.symbols:
+            symbol_data = await self._get_symbol_data(symbol)
+            if symbol_data:
+                windows[symbol] = symbol_data
+        if not windows:
+            return {}
+        
+        symbols = list(windows)
+        close, high, low, volume = (
+            stack_series([windows[symbol][column] for symbol in symbols])
+            for column in ('close', 'high', 'low', 'volume')
+        )
+        columns = {
+            'volatility': batch_volatility(close),
+            'trend': batch_trend(close),
+            'volume_profile': batch_volume_profile(volume),
+            'realized_volatility': batch_realized_volatility(close, self.config.regime_window),
+            'atr': batch_atr(high, low, close, self.config.atr_period),
+            'hurst': batch_hurst(close)
+        }
+        columns = {name: values.tolist() for name, values in columns.items()}
+        
+        timestamp = datetime.now()
+        return {
+            symbol: {**{name: values[row] for name, values in columns.items()}, 'timestamp': timestamp}
+            for row, symbol in enumerate(symbols)
+        }
+    
     async def _initialize_database(self) -> None:
         """Initialize SQLite database"""
         try:
             self.db_connection = sqlite3.connect(self.db_path)
-            cursor = self.db_connection.cursor()
             
-            # Create tables
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ohlcv_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    open REAL NOT NULL,
-                    high REAL NOT NULL,
-                    low REAL NOT NULL,
-                    close REAL NOT NULL,
-                    volume INTEGER NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS market_conditions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    volatility REAL,
-                    trend REAL,
-                    volume_profile REAL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
+            # WAL lets bulk ingestion write from a worker thread while the loop keeps reading
+            self.db_connection.execute('PRAGMA journal_mode=WAL').fetchall()
             
-            # Create indexes
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_symbol_timestamp ON ohlcv_data(symbol, timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_symbol_conditions ON market_conditions(symbol, timestamp)')
+            # Time-partitioned tables behind views of the same names
+            for table in self.partitioned_tables.values():
+                table.initialize(self.db_connection)
             
             self.db_connection.commit()
+            
+            if self.columnar_store is not None:
+                self._migrate_to_columnar()
+            
+            self.writer.start()
+            
             self.logger.info("Database initialized successfully")
             
         except Exception as e:
             self.logger.error(f"Error initializing database: {e}")
             raise
     
+    def _create_partitioned_tables(self) -> Dict[str, PartitionedTable]:
+        """Time-partitioned tables, keyed by data type"""
+        periods = self.config.partition_periods
+        return {
+            'ohlcv': PartitionedTable(
+                'ohlcv_data',
+                ['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume'],
+                '''symbol TEXT NOT NULL, timestamp DATETIME NOT NULL,
+                   open REAL NOT NULL, high REAL NOT NULL, low REAL NOT NULL, close REAL NOT NULL,
+                   volume INTEGER NOT NULL, created_at DATETIME DEFAULT CURRENT_TIMESTAMP''',
+                key=['symbol', 'timestamp'],
+                period=periods.get('ohlcv', 'month')
+            ),
+            'ohlcv_bars': PartitionedTable(
+                'ohlcv_bars',
+                ['symbol', 'timeframe', 'timestamp', 'open', 'high', 'low', 'close', 'volume'],
+                '''symbol TEXT NOT NULL, timeframe TEXT NOT NULL, timestamp DATETIME NOT NULL,
+                   open REAL NOT NULL, high REAL NOT NULL, low REAL NOT NULL, close REAL NOT NULL,
+                   volume REAL NOT NULL''',
+                key=['symbol', 'timeframe', 'timestamp'],
+                period=periods.get('ohlcv_bars', 'day')
+            ),
+            'market_conditions': PartitionedTable(
+                'market_conditions',
+                ['symbol', 'timestamp', 'volatility', 'trend', 'volume_profile',
+                 'realized_volatility', 'atr', 'hurst'],
+                '''symbol TEXT NOT NULL, timestamp DATETIME NOT NULL,
+                   volatility REAL, trend REAL, volume_profile REAL,
+                   realized_volatility REAL, atr REAL, hurst REAL,
+                   created_at DATETIME DEFAULT CURRENT_TIMESTAMP''',
+                index=['symbol', 'timestamp'],
+                period=periods.get('market_conditions', 'month')
+            )
+        }
+    
+    def _migrate_to_columnar(self) -> None:
+        """Copy bars from ohlcv_data into the columnar store the first time it is used"""
+        if self.columnar_store.list_symbols():
+            return
+        
+        cursor = self.db_connection.cursor()
+        symbols = [row[0] for row in cursor.execute('SELECT DISTINCT symbol FROM ohlcv_data')]
+        for symbol in symbols:
+            cursor.execute('''
+                SELECT timestamp, open, high, low, close, volume
+                FROM ohlcv_data
+                WHERE symbol = ?
+                ORDER BY timestamp
+            ''', (symbol,))
+            timestamps, *columns = zip(*cursor.fetchall())
+            self.columnar_store.write(symbol, timestamps, dict(zip(PRICE_COLUMNS, columns)))
+        
+        if symbols:
+            self.logger.info(f"Migrated OHLCV history for {len(symbols)} symbols to columnar storage")
+    
+    def _create_provider(self) -> HistoricalDataProvider:
+        """Historical data provider for the configured data sources"""
+        if self.config.data_sources and DataSource.YAHOO_FINANCE not in self.config.data_sources:
+            self.logger.warning(
+                f"No historical provider for {[source.value for source in self.config.data_sources]}, "
+                f"using Yahoo Finance"
+            )
+        return YahooFinanceProvider()
+    
+    def _create_feed(self) -> MarketFeed:
+        """Real-time feed for the configured data sources"""
+        return YahooQuoteFeed(update_frequency=self.config.update_frequency)
+    
     async def _load_historical_data(self) -> None:
         """Load historical data for all symbols"""
         try:
+            # Fetch only the date ranges not downloaded before
+            start = datetime.now() - timedelta(days=self.config.history_days)
+            await self.downloader.download(self.config.symbols, start)
+            
             for symbol in self.config.symbols:
-                # Check if data exists
-                existing_data = await self._get_historical_data(symbol, days=1)
-                
-                if not existing_data:
-                    # Download historical data
-                    await self._download_historical_data(symbol)
+                # Seed incremental indicators from stored history
+                await self._warm_up_streaming_indicators(symbol)
                 
                 self.logger.info(f"Historical data loaded for {symbol}")
             
@@ -241,305 +479,356 @@ class MarketDataManager:
     async def _download_historical_data(self, symbol: str) -> None:
         """Download historical data for a symbol"""
         try:
-            # Use yfinance for historical data
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=f"{self.config.history_days}d")
-            
-            if data.empty:
-                self.logger.warning(f"No historical data found for {symbol}")
-                return
+            start = datetime.now() - timedelta(days=self.config.history_days)
+            rows = await self.downloader.download([symbol], start)
             
-            # Store in database
-            await self._store_historical_data(symbol, data)
-            
-            self.logger.info(f"Historical data downloaded for {symbol}")
+            self.logger.info(f"Historical data downloaded for {symbol} ({rows[symbol]} new bars)")
             
         except Exception as e:
             self.logger.error(f"Error downloading historical data for {symbol}: {e}")
     
     async def _store_historical_data(self, symbol: str, data: pd.DataFrame) -> None:
         """Store historical data in database"""
+        await self.ingest_historical_data(symbol, data)
+    
+    async def ingest_historical_data(self, symbol: str, data: pd.DataFrame) -> Dict[str, float]:
+        """Bulk-write a DataFrame of bars off the event loop; returns rows and rows/sec"""
         try:
-            cursor = self.db_connection.cursor()
-            
-            for timestamp, row in data.iterrows():
-                cursor.execute('''
-                    INSERT OR REPLACE INTO ohlcv_data 
-                    (symbol, timestamp, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    symbol,
-                    timestamp.isoformat(),
-                    row['Open'],
-                    row['High'],
-                    row['Low'],
-                    row['Close'],
-                    row['Volume']
-                ))
-            
-            self.db_connection.commit()
+            return await self._ingest(symbol, data)
             
         except Exception as e:
             self.logger.error(f"Error storing historical data for {symbol}: {e}")
+            return {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+    
+    async def _ingest(self, symbol: str, data: pd.DataFrame) -> Dict[str, float]:
+        """Bulk write that raises on failure, so the downloader only checkpoints stored chunks"""
+        started = time.perf_counter()
+        
+        loop = asyncio.get_running_loop()
+        if self.columnar_store is not None:
+            rows = await loop.run_in_executor(None, self.columnar_store.write_frame, symbol, data)
+        else:
+            rows = await loop.run_in_executor(None, self._write_ohlcv_rows, symbol, data)
+            self.range_cache.invalidate([symbol])
+        
+        seconds = time.perf_counter() - started
+        rate = rows / seconds if seconds > 0 else 0.0
+        self.ingest_stats['rows'] += rows
+        self.ingest_stats['seconds'] += seconds
+        self.ingest_stats['last_rows_per_second'] = rate
+        
+        self.logger.info(f"Ingested {rows} bars for {symbol} in {seconds:.2f}s ({rate:,.0f} rows/sec)")
+        if self.metrics:
+            await self.metrics.record_metric('market_data_ingest_rows_per_second', rate, {'symbol': symbol})
+        
+        return {'rows': rows, 'seconds': seconds, 'rows_per_second': rate}
+    
+    def _write_ohlcv_rows(self, symbol: str, data: pd.DataFrame) -> int:
+        """Insert all bars in one transaction on a dedicated connection (runs in a worker thread)"""
+        lookup = {name.lower(): name for name in data.columns}
+        columns = [data[lookup[column]].tolist() for column in PRICE_COLUMNS]
+        timestamps = isoformat_index(pd.DatetimeIndex(data.index))
+        
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                batch = self.config.ingest_batch_size
+                for start in range(0, len(timestamps), batch):
+                    end = start + batch
+                    self.partitioned_tables['ohlcv'].insert(connection, list(zip(
+                        itertools.repeat(symbol), timestamps[start:end], *(column[start:end] for column in columns)
+                    )))
+        finally:
+            connection.close()
+        
+        return len(timestamps)
     
     async def _get_historical_data(self, symbol: str, days: int = 30) -> Optional[pd.DataFrame]:
-        """Get historical data for a symbol"""
+        """Get historical data for a symbol (read-only frame; copy before modifying)"""
         try:
-            cursor = self.db_connection.cursor()
-            
-            # Calculate start date
-            start_date = datetime.now() - timedelta(days=days)
-            
-            cursor.execute('''
-                SELECT timestamp, open, high, low, close, volume
-                FROM ohlcv_data
-                WHERE symbol = ? AND timestamp >= ?
-                ORDER BY timestamp
-            ''', (symbol, start_date.isoformat()))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
-                return None
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
-            
-            return df
+            start = utc_timestamp(datetime.now(timezone.utc) - timedelta(days=days))
+            data = self._cached_history(symbol, start)
+            if data is None and self.columnar_store is None:
+                # Cache miss: query and parse in a worker thread
+                loop = asyncio.get_running_loop()
+                data = await loop.run_in_executor(None, self._query_history, symbol, start)
+            return data
             
         except Exception as e:
             self.logger.error(f"Error getting historical data for {symbol}: {e}")
             return None
     
-    async def _get_symbol_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Get latest data for a symbol"""
+    async def _get_recent_bars(self, symbol: str, bars: int) -> Optional[pd.DataFrame]:
+        """The latest `bars` stored bars of a symbol, oldest first"""
         try:
-            # Get from real-time data if available
-            if symbol in self.current_data:
-                return self.current_data[symbol]
+            if self.columnar_store is not None:
+                data = self.columnar_store.read_frame(symbol)
+                return data.iloc[-bars:] if data is not None else None
             
-            # Get from database
-            historical_data = await self._get_historical_data(symbol, days=1)
-            if historical_data is not None and not historical_data.empty:
-                latest_row = historical_data.iloc[-1]
-                return {
-                    'symbol': symbol,
-                    'open': latest_row['open'],
-                    'high': latest_row['high'],
-                    'low': latest_row['low'],
-                    'close': latest_row['close'],
-                    'volume': latest_row['volume'],
-                    'timestamp': latest_row.name
-                }
-            
-            return None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._query_recent_bars, symbol, bars)
             
         except Exception as e:
-            self.logger.error(f"Error getting symbol data for {symbol}: {e}")
+            self.logger.error(f"Error getting recent bars for {symbol}: {e}")
             return None
     
-    async def _start_data_streams(self) -> None:
-        """Start real-time data streams"""
-        try:
-            self.is_streaming = True
-            
-            # Start WebSocket connections for each symbol
-            for symbol in self.config.symbols:
-                asyncio.create_task(self._start_symbol_stream(symbol))
-            
-            self.logger.info("Real-time data streams started")
-            
-        except Exception as e:
-            self.logger.error(f"Error starting data streams: {e}")
+    def _query_recent_bars(self, symbol: str, bars: int) -> Optional[pd.DataFrame]:
+        """Read only the newest rows of a symbol from SQLite (blocking; runs in worker threads)"""
+        rows = self._read_connection().execute('''
+            SELECT timestamp, open, high, low, close, volume
+            FROM ohlcv_data
+            WHERE symbol = ?
+            ORDER BY timestamp DESC
+            LIMIT ?
+        ''', (symbol, bars)).fetchall()
+        return self._ohlcv_frame(rows[::-1]) if rows else None
     
-    async def _start_symbol_stream(self, symbol: str) -> None:
-        """Start real-time data stream for a symbol"""
+    def _load_history(self, symbol: str, days: int) -> Optional[pd.DataFrame]:
+        """Blocking _get_historical_data for worker pools such as the training loader"""
         try:
-            # This is a simplified implementation
-            # In practice, you'd connect to real WebSocket feeds
+            start = utc_timestamp(datetime.now(timezone.utc) - timedelta(days=days))
+            data = self._cached_history(symbol, start)
+            if data is None and self.columnar_store is None:
+                data = self._query_history(symbol, start)
+            return data
             
-            while self.is_streaming:
-                # Simulate real-time data updates
-                await self._update_real_time_data(symbol)
-                await asyncio.sleep(self.config.update_frequency)
-                
         except Exception as e:
-            self.logger.error(f"Error in symbol stream for {symbol}: {e}")
+            self.logger.error(f"Error loading historical data for {symbol}: {e}")
+            return None
     
-    async def _update_real_time_data(self, symbol: str) -> None:
-        """Update real-time data for a symbol"""
-        try:
-            # Get latest data from API
-            latest_data = await self._fetch_latest_data(symbol)
-            
-            if latest_data:
-                # Update current data
-                self.current_data[symbol] = latest_data
-                
-                # Store in database
-                await self._store_real_time_data(symbol, latest_data)
-                
-                # Update last update time
-                self.last_update[symbol] = datetime.now()
-                
-        except Exception as e:
-            self.logger.error(f"Error updating real-time data for {symbol}: {e}")
+    def _cached_history(self, symbol: str, start: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """Bars since `start` available without querying SQLite, or None"""
+        if self.columnar_store is not None:
+            # Zero-copy view of the memory-mapped columns
+            return self.columnar_store.read_frame(symbol, start=start)
+        return self.range_cache.get(symbol, start.value, timeframe=self.config.primary_timeframe)
+    
+    def _query_history(self, symbol: str, start: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """Read bars since `start` from SQLite and cache them (blocking; runs in worker threads)"""
+        generation = self.range_cache.generation(symbol)
+        rows = self._read_connection().execute('''
+            SELECT timestamp, open, high, low, close, volume
+            FROM ohlcv_data
+            WHERE symbol = ? AND timestamp >= ?
+            ORDER BY timestamp
+        ''', (symbol, start.isoformat())).fetchall()
+        
+        if not rows:
+            return None
+        return self.range_cache.put(
+            symbol, start.value, None, self.config.primary_timeframe, self._ohlcv_frame(rows), generation
+        )
+    
+    def _ohlcv_frame(self, rows: List[tuple]) -> pd.DataFrame:
+        """DataFrame indexed in UTC from (timestamp, open, high, low, close, volume) rows"""
+        df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, format='ISO8601')
+        return df.set_index('timestamp')
+    
+    def _read_connection(self) -> sqlite3.Connection:
+        """Read-only connection owned by the calling thread"""
+        connection = getattr(self._read_local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, timeout=30, check_same_thread=False
+            )
+            self._read_local.connection = connection
+            with self._read_connections_lock:
+                self._read_connections.append(connection)
+        return connection
     
-    async def _fetch_latest_data(self, symbol: str) -> Optional[Dict[str, Any]]:
-        """Fetch latest data from API"""
+    async def _get_symbol_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Recent bars for a symbol as zero-copy views of its ring buffer"""
         try:
-            # Use yfinance for real-time data
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            
-            if 'regularMarketPrice' in info:
-                return {
-                    'symbol': symbol,
-                    'open': info.get('open', 0),
-                    'high': info.get('dayHigh', 0),
-                    'low': info.get('dayLow', 0),
-                    'close': info.get('regularMarketPrice', 0),
-                    'volume': info.get('volume', 0),
-                    'timestamp': datetime.now()
-                }
+            window = self.bar_buffers.window(symbol)
+            if window is None:
+                # Seed from storage once; afterwards the feed keeps the buffer current
+                self.bar_buffers.seed(symbol, await self._get_recent_bars(symbol, self.bar_buffers.depth))
+                window = self.bar_buffers.window(symbol)
             
-            return None
+            if window is None:
+                return None
+            return {'symbol': symbol, **window}
             
         except Exception as e:
-            self.logger.error(f"Error fetching latest data for {symbol}: {e}")
+            self.logger.error(f"Error getting symbol data for {symbol}: {e}")
             return None
     
-    async def _store_real_time_data(self, symbol: str, data: Dict[str, Any]) -> None:
-        """Store real-time data in database"""
+    async def _start_data_streams(self) -> None:
+        """Start the multiplexed real-time feed for all symbols"""
         try:
-            cursor = self.db_connection.cursor()
+            self.is_streaming = True
+            await self.feed_hub.start(self.config.symbols)
+            asyncio.create_task(self._bar_close_loop())
             
-            cursor.execute('''
-                INSERT OR REPLACE INTO ohlcv_data 
-                (symbol, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                symbol,
-                data['timestamp'].isoformat(),
-                data['open'],
-                data['high'],
-                data['low'],
-                data['close'],
-                data['volume']
-            ))
-            
-            self.db_connection.commit()
+            self.logger.info(
+                f"Real-time data streams started: {len(self.feed_hub.feeds)} feed(s) "
+                f"for {len(self.config.symbols)} symbols"
+            )
             
         except Exception as e:
-            self.logger.error(f"Error storing real-time data for {symbol}: {e}")
+            self.logger.error(f"Error starting data streams: {e}")
     
-    async def _process_training_data(self, data: pd.DataFrame) -> Dict[str, Any]:
-        """Process data for ML training"""
+    async def _on_feed_bars(self, records: List[Dict[str, Any]]) -> None:
+        """Handle one batch of bars or ticks from the feed"""
         try:
-            processed_data = {
-                'close': data['close'].tolist(),
-                'high': data['high'].tolist(),
-                'low': data['low'].tolist(),
-                'open': data['open'].tolist(),
-                'volume': data['volume'].tolist(),
-                'timestamp': data.index.tolist()
-            }
+            # Ticks become bars for every configured timeframe
+            ticks = [record for record in records if is_tick(record)]
+            if ticks:
+                records = [record for record in records if not is_tick(record)] + self.bar_aggregator.add_ticks(ticks)
+            
+            primary = self.config.primary_timeframe
+            bars = [record for record in records if record.get('timeframe', primary) == primary]
+            if len(bars) < len(records):
+                await self._on_timeframe_bars([record for record in records if record.get('timeframe', primary) != primary])
+            
+            # Bad bars never reach the buffers, indicators or storage
+            if self.bar_validator is not None:
+                bars = [bar for bar in bars if self.bar_validator.accepts(bar['symbol'], bar)]
+            if not bars:
+                return
             
-            # Add technical indicators
-            processed_data['sma_20'] = data['close'].rolling(window=20).mean().tolist()
-            processed_data['sma_50'] = data['close'].rolling(window=50).mean().tolist()
-            processed_data['rsi'] = self._calculate_rsi_series(data['close']).tolist()
-            processed_data['macd'] = self._calculate_macd_series(data['close']).tolist()
+            now = datetime.now()
+            for bar in bars:
+                symbol = bar['symbol']
+                self.current_data[symbol] = bar
+                self.bar_buffers.update(symbol, bar)
+                
+                # Fold the new bar into the incremental indicators
+                self._update_streaming_indicators(symbol, bar)
+                self.last_update[symbol] = now
             
-            return processed_data
+            # Store the whole batch at once
+            await self._store_real_time_bars(bars)
             
         except Exception as e:
-            self.logger.error(f"Error processing training data: {e}")
-            return {}
+            self.logger.error(f"Error updating real-time data: {e}")
     
-    def _calculate_rsi_series(self, prices: pd.Series, period: int = 14) -> pd.Series:
-        """Calculate RSI series"""
+    async def _on_timeframe_bars(self, bars: List[Dict[str, Any]]) -> None:
+        """Buffer and store aggregated bars of the secondary timeframes"""
         try:
-            deltas = prices.diff()
-            gains = deltas.where(deltas > 0, 0)
-            losses = -deltas.where(deltas < 0, 0)
+            if self.bar_validator is not None:
+                bars = [bar for bar in bars if self.bar_validator.accepts((bar['symbol'], bar['timeframe']), bar)]
+            if not bars:
+                return
             
-            avg_gains = gains.rolling(window=period).mean()
-            avg_losses = losses.rolling(window=period).mean()
+            for bar in bars:
+                self.timeframe_buffers[bar['timeframe']].update(bar['symbol'], bar)
             
-            rs = avg_gains / avg_losses
-            rsi = 100 - (100 / (1 + rs))
+            if self.timeframe_stores:
+                for bar in bars:
+                    self.timeframe_stores[bar['timeframe']].append(bar['symbol'], bar)
+                return
             
-            return rsi.fillna(50)
+            self.writer.submit(self.partitioned_tables['ohlcv_bars'].insert, [
+                (bar['symbol'], bar['timeframe'], bar['timestamp'].isoformat(),
+                 bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'])
+                for bar in bars
+            ])
             
         except Exception as e:
-            self.logger.error(f"Error calculating RSI: {e}")
-            return pd.Series([50] * len(prices), index=prices.index)
+            self.logger.error(f"Error storing timeframe bars: {e}")
     
-    def _calculate_macd_series(self, prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
-        """Calculate MACD series"""
-        try:
-            ema_fast = prices.ewm(span=fast).mean()
-            ema_slow = prices.ewm(span=slow).mean()
-            macd = ema_fast - ema_slow
-            
-            return macd
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating MACD: {e}")
-            return pd.Series([0] * len(prices), index=prices.index)
+    async def _bar_close_loop(self) -> None:
+        """Emit aggregated bars whose period has ended even if no later tick arrived"""
+        while self.is_streaming:
+            try:
+                completed = self.bar_aggregator.close_due()
+                if completed:
+                    await self._on_feed_bars(completed)
+                
+                await asyncio.sleep(1)
+                
+            except Exception as e:
+                self.logger.error(f"Error closing aggregated bars: {e}")
+                await asyncio.sleep(1)
+    
+    def get_bars(self, symbol: str, timeframe: Optional[str] = None,
+                 bars: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Recent bars of one timeframe as zero-copy views (primary timeframe by default)"""
+        if timeframe is None or timeframe == self.config.primary_timeframe:
+            return self.bar_buffers.window(symbol, bars)
+        buffers = self.timeframe_buffers.get(timeframe)
+        return buffers.window(symbol, bars) if buffers is not None else None
     
-    async def _calculate_volatility(self, data: Dict[str, Any]) -> float:
-        """Calculate volatility for market conditions"""
+    async def _warm_up_streaming_indicators(self, symbol: str) -> None:
+        """Seed incremental indicator state from stored history"""
         try:
-            # Simplified volatility calculation
-            close_prices = data.get('close', [])
-            if len(close_prices) < 2:
-                return 0.0
+            indicators = StreamingIndicators()
+            historical_data = await self._get_historical_data(symbol, days=self.config.history_days)
             
-            returns = np.diff(close_prices) / close_prices[:-1]
-            volatility = np.std(returns) * np.sqrt(252)  # Annualized volatility
+            if historical_data is not None and not historical_data.empty:
+                self.bar_buffers.seed(symbol, historical_data)
+                if self.bar_validator is not None:
+                    # The first live bar is checked against the last stored one
+                    self.bar_validator.seed(symbol, historical_data.index[-1], historical_data['close'].iloc[-1])
+                
+                # Replays only the trailing indicators.history_bars, off the event loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    None, indicators.warm_up,
+                    historical_data['close'].to_numpy(),
+                    historical_data['high'].to_numpy(),
+                    historical_data['low'].to_numpy(),
+                    historical_data['volume'].to_numpy()
+                )
+                
+                # Seed the feature pipeline from the same history (streams have not started yet)
+                await loop.run_in_executor(
+                    None, self.feature_store.warm_up_streaming, symbol,
+                    historical_data['close'].to_numpy(),
+                    historical_data['volume'].to_numpy(),
+                    historical_data.index
+                )
             
-            return float(volatility)
+            self.streaming_indicators[symbol] = indicators
             
         except Exception as e:
-            self.logger.error(f"Error calculating volatility: {e}")
-            return 0.0
+            self.logger.error(f"Error warming up indicators for {symbol}: {e}")
     
-    async def _calculate_trend(self, data: Dict[str, Any]) -> float:
-        """Calculate trend for market conditions"""
+    def _update_streaming_indicators(self, symbol: str, bar: Dict[str, Any]) -> None:
+        """Update incremental indicators with a new bar in O(1)"""
         try:
-            close_prices = data.get('close', [])
-            if len(close_prices) < 2:
-                return 0.0
-            
-            # Simple trend calculation
-            trend = (close_prices[-1] - close_prices[0]) / close_prices[0]
-            return float(trend)
+            if symbol not in self.streaming_indicators:
+                self.streaming_indicators[symbol] = StreamingIndicators()
+            self.streaming_indicators[symbol].update(bar)
+            self.feature_store.update_streaming(symbol, bar)
             
         except Exception as e:
-            self.logger.error(f"Error calculating trend: {e}")
-            return 0.0
+            self.logger.error(f"Error updating indicators for {symbol}: {e}")
+    
+    def _get_streaming_indicators(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Current incremental indicator values for a symbol"""
+        indicators = self.streaming_indicators.get(symbol)
+        return indicators.snapshot() if indicators is not None else None
+    
+    async def _store_real_time_data(self, symbol: str, data: Dict[str, Any]) -> None:
+        """Store real-time data in database"""
+        await self._store_real_time_bars([{**data, 'symbol': symbol}])
     
-    async def _calculate_volume_profile(self, data: Dict[str, Any]) -> float:
-        """Calculate volume profile for market conditions"""
+    async def _store_real_time_bars(self, bars: List[Dict[str, Any]]) -> None:
+        """Queue a batch of real-time bars for the writer thread"""
         try:
-            volumes = data.get('volume', [])
-            if not volumes:
-                return 0.0
+            if self.columnar_store is not None:
+                for bar in bars:
+                    self.columnar_store.append(bar['symbol'], bar)
+                return
             
-            # Calculate volume profile
-            avg_volume = np.mean(volumes)
-            current_volume = volumes[-1] if volumes else 0
+            # Cached ranges go stale once the rows are committed
+            symbols = list({bar['symbol'] for bar in bars})
+            self.writer.submit(self.partitioned_tables['ohlcv'].insert, [
+                (bar['symbol'], bar['timestamp'].isoformat(),
+                 bar['open'], bar['high'], bar['low'], bar['close'], bar['volume'])
+                for bar in bars
+            ], on_commit=lambda: self.range_cache.invalidate(symbols))
             
-            volume_profile = current_volume / avg_volume if avg_volume > 0 else 1.0
-            return float(volume_profile)
+            if self.metrics:
+                stats = self.writer.get_stats()
+                await self.metrics.record_metric('market_data_write_queue_depth', stats['queue_depth'])
+                await self.metrics.record_metric('market_data_write_flush_ms', stats['last_flush_ms'])
             
         except Exception as e:
-            self.logger.error(f"Error calculating volume profile: {e}")
-            return 1.0
+            self.logger.error(f"Error storing real-time data: {e}")
     
     async def _data_processing_loop(self) -> None:
         """Background data processing loop"""
@@ -560,61 +849,48 @@ class MarketDataManager:
     async def _update_market_conditions(self) -> None:
         """Update market conditions for all symbols"""
         try:
-            for symbol in self.config.symbols:
-                symbol_data = await self._get_symbol_data(symbol)
-                if symbol_data:
-                    # Calculate conditions
-                    volatility = await self._calculate_volatility(symbol_data)
-                    trend = await self._calculate_trend(symbol_data)
-                    volume_profile = await self._calculate_volume_profile(symbol_data)
-                    
-                    # Store conditions
-                    await self._store_market_conditions(symbol, volatility, trend, volume_profile)
-                    
+            conditions = await self._compute_market_conditions()
+            if conditions:
+                await self._store_market_conditions(conditions)
+                
         except Exception as e:
             self.logger.error(f"Error updating market conditions: {e}")
     
-    async def _store_market_conditions(self, symbol: str, volatility: float, trend: float, volume_profile: float) -> None:
-        """Store market conditions in database"""
+    async def _store_market_conditions(self, conditions: Dict[str, Dict[str, Any]]) -> None:
+        """Queue one row per symbol, written by the writer thread in a single transaction"""
         try:
-            cursor = self.db_connection.cursor()
-            
-            cursor.execute('''
-                INSERT INTO market_conditions 
-                (symbol, timestamp, volatility, trend, volume_profile)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                symbol,
-                datetime.now().isoformat(),
-                volatility,
-                trend,
-                volume_profile
-            ))
-            
-            self.db_connection.commit()
+            self.writer.submit(self.partitioned_tables['market_conditions'].insert, [
+                (symbol, values['timestamp'].isoformat(), values['volatility'], values['trend'],
+                 values['volume_profile'], values['realized_volatility'], values['atr'], values['hurst'])
+                for symbol, values in conditions.items()
+            ])
             
         except Exception as e:
-            self.logger.error(f"Error storing market conditions for {symbol}: {e}")
+            self.logger.error(f"Error storing market conditions: {e}")
     
     async def _cleanup_old_data(self) -> None:
-        """Clean up old data to manage storage"""
+        """Apply per-type retention by dropping whole expired partitions"""
         try:
-            cursor = self.db_connection.cursor()
-            
-            # Keep only last 365 days of data
-            cutoff_date = datetime.now() - timedelta(days=365)
-            
-            cursor.execute('''
-                DELETE FROM ohlcv_data 
-                WHERE timestamp < ?
-            ''', (cutoff_date.isoformat(),))
+            now = datetime.now()
+            retention = self.config.retention_days
             
-            cursor.execute('''
-                DELETE FROM market_conditions 
-                WHERE timestamp < ?
-            ''', (cutoff_date.isoformat(),))
+            for kind, table in self.partitioned_tables.items():
+                cutoff = now - timedelta(days=retention.get(kind, 365))
+                dropped = table.drop_before(self.db_connection, cutoff)
+                if dropped:
+                    self.logger.info(f"Dropped {len(dropped)} expired {table.name} partitions ({dropped[0]}..{dropped[-1]})")
             
             self.db_connection.commit()
+            self.range_cache.invalidate()
+            
+            if self.columnar_store is not None:
+                # Truncate at partition boundaries so files are rewritten once per period, not every run
+                for kind, stores in (('ohlcv', [self.columnar_store]), ('ohlcv_bars', self.timeframe_stores.values())):
+                    table = self.partitioned_tables[kind]
+                    cutoff = table.period_start(now - timedelta(days=retention.get(kind, 365)))
+                    for store in stores:
+                        store.truncate_before(cutoff)
+                        store.flush()
             
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
@@ -641,9 +917,22 @@ class MarketDataManager:
             # Create backup file
             backup_file = backup_path / f"market_data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
             
-            # Copy database
+            # Copy database, including rows still queued for the writer
             import shutil
-            shutil.copy2(self.db_path, backup_file)
+            await asyncio.get_running_loop().run_in_executor(None, self.writer.flush)
+            
+            # The backup API also captures pages still in the WAL file
+            target = sqlite3.connect(backup_file)
+            try:
+                self.db_connection.backup(target)
+            finally:
+                target.close()
+            if self.columnar_store is not None:
+                self.columnar_store.flush()
+                shutil.copytree(self.columnar_store.root, backup_file.with_suffix(".ohlcv"))
+                for timeframe, store in self.timeframe_stores.items():
+                    store.flush()
+                    shutil.copytree(store.root, backup_file.with_suffix(f".ohlcv_{timeframe}"))
             
             self.logger.info(f"Data backup created: {backup_file}")
             
@@ -655,8 +944,23 @@ class MarketDataManager:
         try:
             self.is_running = False
             self.is_streaming = False
-            
-            # Close database connection
+            await self.feed_hub.stop()
+            
+            # Persist feature columns still held only in memory
+            self.feature_store.flush()
+            if self.columnar_store is not None:
+                self.columnar_store.flush()
+            for store in self.timeframe_stores.values():
+                store.flush()
+            self.downloader.shutdown()
+            self.training_loader.shutdown()
+            self.writer.stop()
+            
+            # Close database connections
+            with self._read_connections_lock:
+                for connection in self._read_connections:
+                    connection.close()
+                self._read_connections.clear()
             if self.db_connection:
                 self.db_connection.close()
             
@@ -671,9 +975,24 @@ class MarketDataManager:
             'is_streaming': self.is_streaming,
             'symbols_count': len(self.config.symbols),
             'current_data_count': len(self.current_data),
+            'bar_buffers': self.bar_buffers.get_stats(),
             'last_updates': {
                 symbol: last_update.isoformat() 
                 for symbol, last_update in self.last_update.items()
             },
+            'feature_store': self.feature_store.get_stats(),
+            'ingest': self.ingest_stats,
+            'write_behind': self.writer.get_stats(),
+            'range_cache': self.range_cache.get_stats(),
+            'partitions': {
+                kind: table.get_stats(self.db_connection) for kind, table in self.partitioned_tables.items()
+            } if self.db_connection else None,
+            'downloader': self.downloader.get_status(),
+            'training_loader': self.training_loader.get_stats(),
+            'feeds': self.feed_hub.get_status(),
+            'bar_aggregator': self.bar_aggregator.get_stats(),
+            'bar_validation': self.bar_validator.get_stats() if self.bar_validator is not None else None,
+            'storage_backend': self.config.storage_backend,
+            'columnar_store': self.columnar_store.get_stats() if self.columnar_store is not None else None,
             'config': self.config.__dict__
         }
@@ -0,0 +1,206 @@
+"""
+Partitioned Tables - Time-partitioned SQLite storage
+One table per day or month behind a UNION ALL view; retention drops whole tables
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
+
+# Length of the ISO-8601 timestamp prefix that names a partition
+PERIOD_KEY_LENGTH = {'day': 10, 'month': 7}
+
+
+class PartitionedTable:
+    """
+    A logical table stored as <name>_p<period> tables, e.g. ohlcv_data_p202401.
+    Rows are routed by the ISO timestamp prefix; <name> is a read-only view over
+    all partitions, so existing queries keep working. Safe to share between
+    connections on different threads.
+    """
+    
+    def __init__(self, name: str, columns: Sequence[str], definitions: str,
+                 key: Optional[Sequence[str]] = None, index: Optional[Sequence[str]] = None,
+                 period: str = 'month', timestamp_column: str = 'timestamp'):
+        if period not in PERIOD_KEY_LENGTH:
+            raise ValueError(f"Invalid partition period: {period}")
+        
+        self.name = name
+        self.columns = list(columns)  # columns written by insert()
+        self.definitions = definitions  # column definitions for CREATE TABLE
+        self.key = list(key) if key else None  # unique key; inserts replace on conflict
+        self.index = list(index) if index else None  # secondary index for tables without a key
+        self.period = period
+        self.key_length = PERIOD_KEY_LENGTH[period]
+        self.timestamp_position = self.columns.index(timestamp_column)
+        self.logger = logging.getLogger(__name__)
+        
+        self.known: Optional[set] = None  # period keys with a table, loaded on first use
+        self.schema: Optional[List[tuple]] = None  # (name, type) per column, read from the definitions
+        self._lock = threading.Lock()
+        
+        conflict = "OR REPLACE " if self.key else ""
+        placeholders = ", ".join("?" for _ in self.columns)
+        self._insert_sql = f"INSERT {conflict}INTO {{table}} ({', '.join(self.columns)}) VALUES ({placeholders})"
+    
+    # Naming
+    
+    def period_key(self, timestamp: Any) -> str:
+        """Partition key ('YYYY-MM' or 'YYYY-MM-DD') of a timestamp or ISO string"""
+        text = timestamp if isinstance(timestamp, str) else timestamp.isoformat()
+        return text[:self.key_length]
+    
+    def table_name(self, period_key: str) -> str:
+        return f"{self.name}_p{period_key.replace('-', '')}"
+    
+    def period_start(self, timestamp: datetime) -> datetime:
+        """Start of the partition containing a timestamp"""
+        if self.period == 'day':
+            return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    # Schema
+    
+    def partitions(self, connection: sqlite3.Connection) -> List[str]:
+        """Period keys with a partition table, oldest first"""
+        prefix = f"{self.name}_p"
+        rows = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND substr(name, 1, ?) = ?",
+            (len(prefix), prefix)
+        ).fetchall()
+        keys = []
+        for (table,) in rows:
+            digits = table[len(prefix):]
+            if digits.isdigit() and len(digits) == self.key_length - (2 if self.period == 'day' else 1):
+                keys.append(f"{digits[:4]}-{digits[4:6]}" + (f"-{digits[6:]}" if self.period == 'day' else ""))
+        return sorted(keys)
+    
+    def initialize(self, connection: sqlite3.Connection) -> None:
+        """Create the view, moving rows out of a pre-partitioning table of the same name"""
+        types = [row[0] for row in connection.execute("SELECT type FROM sqlite_master WHERE name = ?", (self.name,))]
+        if types == ['table']:
+            self._migrate_legacy(connection)
+        with self._lock:
+            self.known = set(self.partitions(connection))
+        self._add_missing_columns(connection)
+        self._create_view(connection)
+    
+    def _schema(self, connection: sqlite3.Connection) -> List[tuple]:
+        """(name, declared type) of every column in the definitions"""
+        if self.schema is not None:
+            return self.schema
+        connection.execute(f"CREATE TEMP TABLE IF NOT EXISTS {self.name}_schema ({self.definitions})")
+        try:
+            self.schema = [(row[1], row[2]) for row in connection.execute(f"PRAGMA temp.table_info({self.name}_schema)")]
+            return self.schema
+        finally:
+            connection.execute(f"DROP TABLE temp.{self.name}_schema")
+    
+    def _table_columns(self, connection: sqlite3.Connection, table: str) -> List[str]:
+        return [row[1] for row in connection.execute(f"PRAGMA table_info({table})")]
+    
+    def _add_missing_columns(self, connection: sqlite3.Connection) -> None:
+        """Bring tables created under older definitions up to date (new columns are nullable)"""
+        schema = self._schema(connection)
+        tables = [f"{self.name}_template"] + [self.table_name(key) for key in self.known]
+        for table in tables:
+            existing = set(self._table_columns(connection, table))
+            if not existing:
+                continue
+            for name, declared_type in schema:
+                if name not in existing:
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declared_type}")
+    
+    def _create_partition(self, connection: sqlite3.Connection, period_key: str) -> None:
+        table = self.table_name(period_key)
+        constraint = f", PRIMARY KEY ({', '.join(self.key)})" if self.key else ""
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({self.definitions}{constraint})")
+        if self.index:
+            connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{table} ON {table}({', '.join(self.index)})")
+    
+    def _create_view(self, connection: sqlite3.Connection) -> None:
+        """Point the view at the current partitions (an empty template keeps it valid)"""
+        template = f"{self.name}_template"
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {template} ({self.definitions})")
+        # Explicit columns, since upgraded tables may order them differently
+        columns = ", ".join(name for name, _ in self._schema(connection))
+        selects = [f"SELECT {columns} FROM {template}"]
+        selects += [f"SELECT {columns} FROM {self.table_name(key)}" for key in self.partitions(connection)]
+        connection.execute(f"DROP VIEW IF EXISTS {self.name}")
+        connection.execute(f"CREATE VIEW {self.name} AS {' UNION ALL '.join(selects)}")
+    
+    def _migrate_legacy(self, connection: sqlite3.Connection) -> None:
+        """Copy a plain table into partitions in insertion order (later duplicates win), then drop it"""
+        legacy = f"{self.name}_legacy"
+        connection.execute(f"ALTER TABLE {self.name} RENAME TO {legacy}")
+        timestamp = self.columns[self.timestamp_position]
+        keys = [row[0] for row in connection.execute(
+            f"SELECT DISTINCT substr({timestamp}, 1, ?) FROM {legacy}", (self.key_length,)
+        )]
+        conflict = "OR REPLACE " if self.key else ""
+        legacy_columns = set(self._table_columns(connection, legacy))
+        columns = ", ".join(column for column in self.columns if column in legacy_columns)
+        for key in keys:
+            self._create_partition(connection, key)
+            connection.execute(
+                f"INSERT {conflict}INTO {self.table_name(key)} ({columns}) "
+                f"SELECT {columns} FROM {legacy} WHERE substr({timestamp}, 1, ?) = ? ORDER BY rowid",
+                (self.key_length, key)
+            )
+        # Its indexes go with it
+        connection.execute(f"DROP TABLE {legacy}")
+        self.logger.info(f"Moved {self.name} into {len(keys)} {self.period} partitions")
+    
+    # Data
+    
+    def insert(self, connection: sqlite3.Connection, rows: Sequence[tuple]) -> int:
+        """Write rows (in `columns` order) to their partitions; the caller commits"""
+        groups: Dict[str, List[tuple]] = {}
+        position, length = self.timestamp_position, self.key_length
+        for row in rows:
+            groups.setdefault(row[position][:length], []).append(row)
+        
+        if self.known is None:
+            with self._lock:
+                self.known = set(self.partitions(connection))
+        
+        new_partition = False
+        for key, group in groups.items():
+            # Idempotent, so another connection's uncommitted CREATE is never relied on
+            self._create_partition(connection, key)
+            if key not in self.known:
+                with self._lock:
+                    self.known.add(key)
+                new_partition = True
+            connection.executemany(self._insert_sql.format(table=self.table_name(key)), group)
+        
+        if new_partition:
+            self._create_view(connection)
+        return len(rows)
+    
+    def drop_before(self, connection: sqlite3.Connection, cutoff: datetime) -> List[str]:
+        """Drop every partition that ends at or before the cutoff; returns the dropped period keys"""
+        cutoff_key = self.period_key(cutoff)
+        dropped = [key for key in self.partitions(connection) if key < cutoff_key]
+        if not dropped:
+            return []
+        
+        for key in dropped:
+            connection.execute(f"DROP TABLE IF EXISTS {self.table_name(key)}")
+        with self._lock:
+            if self.known is not None:
+                self.known.difference_update(dropped)
+        self._create_view(connection)
+        return dropped
+    
+    def get_stats(self, connection: sqlite3.Connection) -> Dict[str, Any]:
+        """Partition layout"""
+        keys = self.partitions(connection)
+        return {
+            'period': self.period,
+            'partitions': len(keys),
+            'oldest': keys[0] if keys else None,
+            'newest': keys[-1] if keys else None
+        }
@@ -0,0 +1,160 @@
+"""
+Range Cache - Read-through cache for historical OHLCV range queries
+Byte-bounded LRU of read-only arrays; a cached range also serves any range inside it
+"""
+
+import threading
+import time
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+
+from .columnar_store import PRICE_COLUMNS
+
+RangeKey = Tuple[str, Optional[str], int, Optional[int]]  # symbol, timeframe, start ns, end ns (None = latest)
+
+
+@dataclass
+class CachedRange:
+    """Bars of one query, shared read-only with every caller"""
+    timestamps: np.ndarray  # int64 epoch ns (UTC), ascending
+    values: np.ndarray  # (columns x bars) float64
+    created: float = 0.0  # time.monotonic() when cached
+    
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.values.nbytes
+
+
+class RangeCache:
+    """
+    LRU of query results keyed by (symbol, timeframe, start, end).
+    A lookup is served by any cached range containing it, as a zero-copy
+    slice. Writes for a symbol invalidate its ranges; entries also expire
+    after `ttl_seconds` as a backstop for writes made by other processes.
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl_seconds: float = 300.0):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries: "OrderedDict[RangeKey, CachedRange]" = OrderedDict()
+        self.by_symbol: Dict[str, set] = {}
+        self.bytes = 0
+        # Bumped by invalidate(); a result read before a write must not be cached after it
+        self.generations: Dict[str, int] = {}
+        self.epoch = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+    
+    def get(self, symbol: str, start: int, end: Optional[int] = None,
+            timeframe: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Bars in [start, end] from a cached range that covers them, or None"""
+        now = time.monotonic()
+        with self._lock:
+            for key in list(self.by_symbol.get(symbol, ())):
+                _, cached_timeframe, cached_start, cached_end = key
+                if cached_timeframe != timeframe or cached_start > start:
+                    continue
+                if cached_end is not None and (end is None or end > cached_end):
+                    continue
+                if now - self.entries[key].created > self.ttl_seconds:
+                    self._remove(key)
+                    self.stats['expirations'] += 1
+                    continue
+                
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return self._frame(self.entries[key], start, end)
+            
+            self.stats['misses'] += 1
+            return None
+    
+    def generation(self, symbol: str) -> Tuple[int, int]:
+        """Token to take before querying storage and pass to put()"""
+        with self._lock:
+            return self.epoch, self.generations.get(symbol, 0)
+    
+    def put(self, symbol: str, start: int, end: Optional[int], timeframe: Optional[str],
+            data: pd.DataFrame, generation: Optional[Tuple[int, int]] = None) -> Optional[pd.DataFrame]:
+        """
+        Cache a query result; returns it as a frame over the cached arrays.
+        Skipped if the symbol was invalidated since `generation` was taken.
+        """
+        timestamps = np.ascontiguousarray(pd.DatetimeIndex(data.index).values.astype('datetime64[ns]').view(np.int64))
+        values = np.ascontiguousarray(data[list(PRICE_COLUMNS)].to_numpy(dtype=np.float64).T)
+        timestamps.flags.writeable = False
+        values.flags.writeable = False
+        entry = CachedRange(timestamps=timestamps, values=values, created=time.monotonic())
+        if entry.nbytes > self.max_bytes:
+            return self._frame(entry, start, end)
+        
+        key = (symbol, timeframe, start, end)
+        with self._lock:
+            if generation is not None and generation != (self.epoch, self.generations.get(symbol, 0)):
+                return self._frame(entry, start, end)
+            
+            # Ranges inside the new one are now redundant
+            for old_key in list(self.by_symbol.get(symbol, ())):
+                _, old_timeframe, old_start, old_end = old_key
+                if old_timeframe == timeframe and old_start >= start and (end is None or (old_end is not None and old_end <= end)):
+                    self._remove(old_key)
+            
+            self.entries[key] = entry
+            self.by_symbol.setdefault(symbol, set()).add(key)
+            self.bytes += entry.nbytes
+            
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.stats['evictions'] += 1
+        
+        return self._frame(entry, start, end)
+    
+    def invalidate(self, symbols: Optional[List[str]] = None) -> None:
+        """Drop cached ranges for some symbols (all when None)"""
+        with self._lock:
+            if symbols is None:
+                self.epoch += 1
+                keys = list(self.entries)
+            else:
+                for symbol in symbols:
+                    self.generations[symbol] = self.generations.get(symbol, 0) + 1
+                keys = [key for symbol in symbols for key in self.by_symbol.get(symbol, ())]
+            for key in keys:
+                self._remove(key)
+            self.stats['invalidations'] += len(keys)
+    
+    def _remove(self, key: RangeKey) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry.nbytes
+        keys = self.by_symbol.get(key[0])
+        keys.discard(key)
+        if not keys:
+            del self.by_symbol[key[0]]
+    
+    def _frame(self, entry: CachedRange, start: int, end: Optional[int]) -> Optional[pd.DataFrame]:
+        """Zero-copy DataFrame over the bars of an entry within [start, end]"""
+        first = int(np.searchsorted(entry.timestamps, start, side='left'))
+        last = int(np.searchsorted(entry.timestamps, end, side='right')) if end is not None else len(entry.timestamps)
+        if last <= first:
+            return None
+        
+        index = pd.DatetimeIndex(entry.timestamps[first:last].view('datetime64[ns]'), copy=False, name='timestamp')
+        return pd.DataFrame(
+            entry.values[:, first:last].T, index=index.tz_localize('UTC'), columns=list(PRICE_COLUMNS), copy=False
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit ratio and memory use"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            'entries': len(self.entries),
+            'bytes_cached': self.bytes,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+            'hit_ratio': self.stats['hits'] / lookups if lookups else 0.0,
+            **self.stats
+        }
@@ -0,0 +1,124 @@
+"""
+Bar Ring Buffers - Fixed-memory recent OHLCV history for all symbols
+One shared (symbols x depth) matrix per column, written in place by the feed
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple
+
+from .columnar_store import PRICE_COLUMNS
+from .feature_store import to_nanoseconds
+from .training_loader import MISSING_TIMESTAMP
+
+
+class BarRingBuffers:
+    """
+    The latest `depth` bars of every symbol in shared matrices: timestamps
+    (symbols x depth) and values (5 x symbols x depth, PRICE_COLUMNS order).
+    Rows are left-padded like stack_series() and a new bar shifts its row by
+    one column in place, so every symbol's latest bar is in the last column
+    and the matrices are handed out as views rather than packed per read.
+    """
+    
+    def __init__(self, depth: int = 500):
+        self.depth = depth
+        self.rows: Dict[str, int] = {}
+        self.timestamps = np.full((0, depth), MISSING_TIMESTAMP, dtype=np.int64)
+        self.values = np.full((len(PRICE_COLUMNS), 0, depth), np.nan)
+        self.counts = np.zeros(0, dtype=np.int64)  # bars of real data per row
+        self.version = 0  # bumped on every write, so readers can tell when contents changed
+    
+    def _row(self, symbol: str) -> int:
+        row = self.rows.get(symbol)
+        if row is None:
+            row = len(self.rows)
+            if row == len(self.counts):
+                self._grow(max(8, 2 * row))
+            self.rows[symbol] = row
+        return row
+    
+    def _grow(self, capacity: int) -> None:
+        """Make room for more symbols; views handed out earlier keep the old matrices"""
+        size = len(self.counts)
+        timestamps = np.full((capacity, self.depth), MISSING_TIMESTAMP, dtype=np.int64)
+        values = np.full((len(PRICE_COLUMNS), capacity, self.depth), np.nan)
+        counts = np.zeros(capacity, dtype=np.int64)
+        timestamps[:size] = self.timestamps
+        values[:, :size] = self.values
+        counts[:size] = self.counts
+        self.timestamps, self.values, self.counts = timestamps, values, counts
+    
+    def update(self, symbol: str, bar: Dict[str, Any]) -> None:
+        """Write one bar in place; a bar with the latest timestamp replaces it"""
+        row = self._row(symbol)
+        timestamp = pd.Timestamp(bar['timestamp']).value
+        if not (self.counts[row] and self.timestamps[row, -1] == timestamp):
+            # The oldest bar falls off the front of the row
+            self.timestamps[row, :-1] = self.timestamps[row, 1:]
+            self.values[:, row, :-1] = self.values[:, row, 1:]
+            self.counts[row] = min(self.counts[row] + 1, self.depth)
+        
+        self.timestamps[row, -1] = timestamp
+        self.values[:, row, -1] = [float(bar[column]) for column in PRICE_COLUMNS]
+        self.version += 1
+    
+    def seed(self, symbol: str, data: pd.DataFrame) -> None:
+        """Fill a symbol's row with the trailing `depth` bars of a history DataFrame with OHLCV columns"""
+        if data is None or data.empty:
+            return
+        lookup = {name.lower(): name for name in data.columns}
+        values = np.vstack([data[lookup[column]].to_numpy(dtype=np.float64) for column in PRICE_COLUMNS])
+        timestamps = to_nanoseconds(data.index)[-self.depth:]
+        size = len(timestamps)
+        
+        row = self._row(symbol)
+        self.timestamps[row, :self.depth - size] = MISSING_TIMESTAMP
+        self.values[:, row, :self.depth - size] = np.nan
+        self.timestamps[row, self.depth - size:] = timestamps
+        self.values[:, row, self.depth - size:] = values[:, -size:]
+        self.counts[row] = size
+        self.version += 1
+    
+    def window(self, symbol: str, bars: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        A symbol's last `bars` bars (all by default) as read-only views, oldest
+        first. Views see later updates; copy them to keep a snapshot.
+        """
+        row = self.rows.get(symbol)
+        if row is None:
+            return None
+        size = int(self.counts[row]) if bars is None else min(bars, int(self.counts[row]))
+        if size == 0:
+            return None
+        
+        arrays = {'timestamp': self.timestamps[row, self.depth - size:].view('datetime64[ns]')}
+        for index, column in enumerate(PRICE_COLUMNS):
+            arrays[column] = self.values[index, row, self.depth - size:]
+        for array in arrays.values():
+            array.flags.writeable = False
+        return arrays
+    
+    def matrices(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Symbols in row order with read-only views of the timestamp, value and count matrices"""
+        size = len(self.rows)
+        views = (self.timestamps[:size], self.values[:, :size], self.counts[:size])
+        for view in views:
+            view.flags.writeable = False
+        return (list(self.rows), *views)
+    
+    def count(self, symbol: str) -> int:
+        """Bars held for a symbol"""
+        row = self.rows.get(symbol)
+        return int(self.counts[row]) if row is not None else 0
+    
+    def symbols(self) -> List[str]:
+        return list(self.rows)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer statistics"""
+        return {
+            'symbols': len(self.rows),
+            'depth': self.depth,
+            'memory_bytes': self.timestamps.nbytes + self.values.nbytes + self.counts.nbytes
+        }
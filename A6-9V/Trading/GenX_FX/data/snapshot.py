@@ -0,0 +1,146 @@
+"""
+Market Snapshot - One immutable view of all symbols per trading cycle
+Struct-of-arrays OHLCV matrices shared by reference between modules
+"""
+
+import numpy as np
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from .columnar_store import PRICE_COLUMNS
+from .training_loader import MISSING_TIMESTAMP
+
+
+@dataclass(eq=False)
+class MarketSnapshot(Mapping):
+    """
+    Recent bars of every symbol as (symbols x bars) matrices, left-padded
+    with NaN like stack_series(), so the latest bar of each symbol is in the
+    last column and indicator functions run on the matrices directly.
+    
+    Arrays are read-only and shared; consumers must copy before modifying.
+    Snapshots built with from_buffers() are views of the feed's matrices and
+    see bars written after them; copy to keep a fixed picture.
+    For code written against the old dict layout it also behaves as a
+    read-only mapping: snapshot['symbols'] and snapshot[symbol] work as before.
+    """
+    symbols: List[str]
+    timestamps: np.ndarray  # (symbols x bars) int64 epoch ns (UTC), MISSING_TIMESTAMP where padded
+    ohlcv: np.ndarray  # (5 x symbols x bars) in PRICE_COLUMNS order
+    lengths: np.ndarray  # bars of real data per symbol
+    indicators: List[Optional[Dict[str, float]]] = field(default_factory=list)
+    features: List[Optional[Dict[str, float]]] = field(default_factory=list)
+    timeframes: List[Optional[Dict[str, Dict[str, np.ndarray]]]] = field(default_factory=list)
+    indicator_params: Optional[Tuple] = None  # IndicatorEngine.params_key the indicators were computed with
+    version: Any = None  # identifies the data the snapshot was built from
+    created: datetime = field(default_factory=datetime.now)
+    
+    def __post_init__(self):
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self._views: Dict[str, Dict[str, Any]] = {}
+        for array in (self.timestamps, self.ohlcv, self.lengths):
+            array.flags.writeable = False
+    
+    @classmethod
+    def from_buffers(cls, buffers: Any, **fields) -> 'MarketSnapshot':
+        """Views of a BarRingBuffers' shared matrices, without copying any bars"""
+        symbols, timestamps, values, counts = buffers.matrices()
+        return cls(symbols=symbols, timestamps=timestamps, ohlcv=values, lengths=counts, **fields)
+    
+    @classmethod
+    def from_windows(cls, symbols: List[str], windows: List[Dict[str, np.ndarray]], **fields) -> 'MarketSnapshot':
+        """Pack per-symbol windows (timestamp + OHLCV arrays, oldest first) into one snapshot"""
+        lengths = np.array([len(window['timestamp']) for window in windows], dtype=np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+        
+        timestamps = np.full((len(symbols), width), MISSING_TIMESTAMP, dtype=np.int64)
+        ohlcv = np.full((len(PRICE_COLUMNS), len(symbols), width), np.nan)
+        for row, (window, length) in enumerate(zip(windows, lengths)):
+            timestamps[row, width - length:] = np.asarray(window['timestamp']).view(np.int64)
+            for column, name in enumerate(PRICE_COLUMNS):
+                ohlcv[column, row, width - length:] = window[name]
+        
+        return cls(symbols=list(symbols), timestamps=timestamps, ohlcv=ohlcv, lengths=lengths, **fields)
+    
+    # Columns
+    
+    @property
+    def open(self) -> np.ndarray:
+        return self.ohlcv[0]
+    
+    @property
+    def high(self) -> np.ndarray:
+        return self.ohlcv[1]
+    
+    @property
+    def low(self) -> np.ndarray:
+        return self.ohlcv[2]
+    
+    @property
+    def close(self) -> np.ndarray:
+        return self.ohlcv[3]
+    
+    @property
+    def volume(self) -> np.ndarray:
+        return self.ohlcv[4]
+    
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.ohlcv.nbytes
+    
+    def row(self, symbol: str) -> Optional[int]:
+        """Row of a symbol in every matrix"""
+        return self.index.get(symbol)
+    
+    def latest(self, column: str = 'close') -> np.ndarray:
+        """Latest value of a column for every symbol (NaN for symbols without bars)"""
+        matrix = self.ohlcv[PRICE_COLUMNS.index(column)]
+        return matrix[:, -1] if matrix.shape[1] else np.full(len(self.symbols), np.nan)
+    
+    def latest_timestamps(self) -> np.ndarray:
+        """Time of every symbol's latest bar as datetime64[ns]"""
+        if not self.timestamps.shape[1]:
+            return np.full(len(self.symbols), np.datetime64('NaT'), dtype='datetime64[ns]')
+        return self.timestamps[:, -1].view('datetime64[ns]')
+    
+    def symbol_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """One symbol's bars (without padding) as views, in the get_latest_data() dict layout"""
+        view = self._views.get(symbol)
+        if view is not None:
+            return view
+        
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        
+        start = self.timestamps.shape[1] - self.lengths[row]
+        view = {'symbol': symbol, 'timestamp': self.timestamps[row, start:].view('datetime64[ns]')}
+        for column, name in enumerate(PRICE_COLUMNS):
+            view[name] = self.ohlcv[column, row, start:]
+        for name, values in (('indicators', self.indicators), ('features', self.features), ('timeframes', self.timeframes)):
+            if row < len(values) and values[row]:
+                view[name] = values[row]
+        if 'indicators' in view and self.indicator_params is not None:
+            view['indicator_params'] = self.indicator_params
+        
+        self._views[symbol] = view
+        return view
+    
+    # Read-only mapping over 'symbols' and each symbol
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'symbols':
+            return self.symbols
+        view = self.symbol_data(key)
+        if view is None:
+            raise KeyError(key)
+        return view
+    
+    def __iter__(self) -> Iterator[str]:
+        yield 'symbols'
+        yield from self.symbols
+    
+    def __len__(self) -> int:
+        return len(self.symbols) + 1
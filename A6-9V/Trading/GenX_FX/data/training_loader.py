@@ -0,0 +1,153 @@
+"""
+Training Data Loader - Parallel assembly of training arrays
+Reads symbol histories and extracts their training columns in a worker pool, then packs them into (symbol, time, feature) chunks
+"""
+
+import asyncio
+import logging
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+# Columns TrainingSetBuilder reads; its FeaturePipeline derives everything else
+TRAINING_FEATURES = ('close', 'volume')
+
+# Timestamp of padded bars (NaT as datetime64)
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+
+
+def training_features(data: pd.DataFrame, features: Sequence[str] = TRAINING_FEATURES) -> np.ndarray:
+    """
+    (bars x features) float64 matrix of the named OHLCV columns (any
+    capitalisation). Module-level so it can run in any worker pool.
+    """
+    lookup = {name.lower(): name for name in data.columns}
+    return np.column_stack([data[lookup[name]].to_numpy(dtype=np.float64) for name in features])
+
+
+@dataclass
+class TrainingLoaderConfig:
+    """Configuration for the training data loader"""
+    days: int = 365  # history per symbol
+    chunk_symbols: int = 64  # symbols per streamed batch; bounds peak memory
+    max_workers: int = 4  # column extraction threads
+    features: Tuple[str, ...] = TRAINING_FEATURES
+
+
+@dataclass
+class TrainingBatch:
+    """
+    Histories of several symbols as one contiguous (symbol, time, feature)
+    array. Shorter histories are left-padded with NaN (timestamps with NaT),
+    so the latest bar of every symbol is at the last time index.
+    """
+    symbols: List[str]
+    features: List[str]
+    timestamps: np.ndarray  # (symbols x bars) int64 epoch ns (UTC)
+    values: np.ndarray  # (symbols x bars x features) float64
+    lengths: np.ndarray  # bars of real data per symbol
+    
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.values.nbytes
+    
+    def symbol_data(self, index: int) -> Dict[str, np.ndarray]:
+        """Feature columns of one symbol (without padding) as views of the batch"""
+        start = self.values.shape[1] - self.lengths[index]
+        data = {name: self.values[index, start:, column] for column, name in enumerate(self.features)}
+        data['timestamp'] = self.timestamps[index, start:].view('datetime64[ns]')
+        return data
+    
+    def to_dict(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """{symbol: {feature: array}}, the layout get_training_data() has always returned"""
+        return {symbol: self.symbol_data(index) for index, symbol in enumerate(self.symbols)}
+
+
+class TrainingDataLoader:
+    """
+    Streams TrainingBatch chunks of a symbol universe. `load` is a blocking
+    read of one symbol's history; it runs in the worker pool together with
+    the column extraction, so the symbols of a chunk are read concurrently
+    and the event loop only packs the results.
+    """
+    
+    def __init__(self, load: Callable[[str, int], Optional[pd.DataFrame]],
+                 config: Optional[TrainingLoaderConfig] = None):
+        self.load = load
+        self.config = config or TrainingLoaderConfig()
+        self.logger = logging.getLogger(__name__)
+        
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers,
+            thread_name_prefix="genx-training-loader"
+        )
+        self.stats = {'batches': 0, 'symbols': 0, 'bars': 0, 'seconds': 0.0, 'last_batch_bytes': 0}
+    
+    async def iter_batches(self, symbols: Sequence[str],
+                           chunk_symbols: Optional[int] = None) -> AsyncIterator[TrainingBatch]:
+        """Yield one batch per chunk of symbols; only one chunk is held at a time"""
+        chunk_symbols = chunk_symbols or self.config.chunk_symbols
+        for offset in range(0, len(symbols), chunk_symbols):
+            batch = await self.load_batch(symbols[offset:offset + chunk_symbols])
+            if batch is not None:
+                yield batch
+    
+    async def load_batch(self, symbols: Sequence[str]) -> Optional[TrainingBatch]:
+        """Read a group of symbols into a single batch (callers bound the group size)"""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self._read_symbol, symbol) for symbol in symbols
+        ))
+        loaded = [(symbol, result) for symbol, result in zip(symbols, results) if result is not None]
+        if not loaded:
+            return None
+        
+        names = [symbol for symbol, _ in loaded]
+        batch = self._pack(names, [result[0] for _, result in loaded], [result[1] for _, result in loaded])
+        
+        self.stats['batches'] += 1
+        self.stats['symbols'] += len(names)
+        self.stats['bars'] += int(batch.lengths.sum())
+        self.stats['seconds'] += time.perf_counter() - started
+        self.stats['last_batch_bytes'] = batch.nbytes
+        return batch
+    
+    def _read_symbol(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Timestamps and training columns of one symbol (runs in the worker pool)"""
+        data = self.load(symbol, self.config.days)
+        if data is None or data.empty:
+            return None
+        timestamps = pd.DatetimeIndex(data.index).values.astype('datetime64[ns]').view(np.int64)
+        return timestamps, training_features(data, self.config.features)
+    
+    def _pack(self, symbols: List[str], timestamps: List[np.ndarray], matrices: List[np.ndarray]) -> TrainingBatch:
+        """Copy per-symbol results into one left-padded contiguous array"""
+        lengths = np.array([len(stamps) for stamps in timestamps])
+        width = int(lengths.max())
+        
+        packed_timestamps = np.full((len(symbols), width), MISSING_TIMESTAMP, dtype=np.int64)
+        values = np.full((len(symbols), width, len(self.config.features)), np.nan)
+        for row, (stamps, matrix) in enumerate(zip(timestamps, matrices)):
+            packed_timestamps[row, width - len(stamps):] = stamps
+            values[row, width - len(stamps):] = matrix
+        
+        return TrainingBatch(
+            symbols=symbols,
+            features=list(self.config.features),
+            timestamps=packed_timestamps,
+            values=values,
+            lengths=lengths
+        )
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool"""
+        self.executor.shutdown(wait=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Loader statistics"""
+        return {'chunk_symbols': self.config.chunk_symbols, 'max_workers': self.config.max_workers, **self.stats}
@@ -0,0 +1,250 @@
+"""
+GenX-FX Training Set Builder
+Vectorized construction of model training matrices from price history
+"""
+
+import hashlib
+import json
+import logging
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .feature_pipeline import FeaturePipeline
+from .training_loader import TrainingBatch
+
+
+class TrainingSetBuilder:
+    """
+    Builds (features, targets) for all symbols in one vectorized pass.
+    
+    Features per bar i: price, mean and std of the previous `window` prices,
+    and the one-bar return. When a FeaturePipeline is given, its batch mode
+    supplies the features instead so training matches live inference.
+    Target: 1 if the return over the next `horizon` bars exceeds
+    `target_threshold`, else 0.
+    """
+    
+    def __init__(self, config: Optional[Dict] = None, pipeline: Optional[FeaturePipeline] = None):
+        self.config = {**self._default_config(), **(config or {})}
+        self.pipeline = pipeline
+        self.logger = logging.getLogger(__name__)
+    
+    def _default_config(self) -> Dict[str, Any]:
+        """Default training set parameters"""
+        return {
+            'window': 20,
+            'horizon': 5,
+            'target_threshold': 0.01,
+            'min_history': 50,  # symbols need more bars than this
+            'cache_path': None  # directory for memory-mapped .npy caches
+        }
+    
+    def build(self, data: Any) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Build features and targets for every symbol, reusing a cached build if
+        available. `data` is {symbol: {column: array}} or TrainingBatch chunks.
+        """
+        series = self._collect_series(data)
+        if not series:
+            return None, None
+        
+        cache_path = self.config['cache_path']
+        if cache_path:
+            return self._build_cached(series, Path(cache_path))
+        
+        return self._build_arrays(series)
+    
+    def _collect_series(self, data: Any) -> List[Tuple[str, Dict[str, np.ndarray]]]:
+        """Close, volume and timestamps of symbols with enough history, in input order"""
+        series = []
+        for symbol, symbol_data in self._symbol_items(data):
+            if 'close' not in symbol_data or len(symbol_data['close']) <= self.config['min_history']:
+                continue
+            
+            close = np.asarray(symbol_data['close'], dtype=np.float64)
+            arrays = {'close': close}
+            if len(symbol_data.get('volume', [])) == len(close):
+                arrays['volume'] = np.asarray(symbol_data['volume'], dtype=np.float64)
+            if len(symbol_data.get('timestamp', [])) == len(close):
+                arrays['timestamp'] = pd.to_datetime(np.asarray(symbol_data['timestamp'])).values.astype('datetime64[ns]').view(np.int64)
+            series.append((symbol, arrays))
+        return series
+    
+    @staticmethod
+    def _symbol_items(data: Any):
+        """(symbol, columns) pairs of a dict, or views into TrainingBatch chunks"""
+        if isinstance(data, TrainingBatch):
+            data = [data]
+        if isinstance(data, Mapping):
+            yield from data.items()
+            return
+        for batch in data:
+            for index, symbol in enumerate(batch.symbols):
+                yield symbol, batch.symbol_data(index)
+    
+    def _build_arrays(self, series: List[Tuple[str, Dict[str, np.ndarray]]]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Compute the feature matrix and targets over the concatenated histories"""
+        if self.pipeline is not None:
+            return self._build_pipeline_arrays(series)
+        
+        window = self.config['window']
+        horizon = self.config['horizon']
+        
+        prices = np.concatenate([arrays['close'] for _, arrays in series])
+        lengths = np.array([len(arrays['close']) for _, arrays in series])
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        
+        # Row i is valid when its lookback and horizon stay inside its own symbol
+        rows = np.concatenate([
+            np.arange(offset + window, offset + length - horizon)
+            for offset, length in zip(offsets, lengths)
+        ])
+        if len(rows) == 0:
+            return None, None
+        
+        # windows[j] == prices[j:j + window], so the lookback of row i is windows[i - window]
+        windows = sliding_window_view(prices, window)
+        lookback = windows[rows - window]
+        
+        current = prices[rows]
+        previous = prices[rows - 1]
+        future = prices[rows + horizon]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bar_return = np.where(previous != 0, (current - previous) / previous, 0.0)
+            future_return = np.where(current != 0, (future - current) / current, 0.0)
+        
+        features = np.column_stack([
+            current,
+            lookback.mean(axis=1),
+            lookback.std(axis=1),
+            bar_return
+        ])
+        targets = (future_return > self.config['target_threshold']).astype(np.int64)
+        
+        return features, targets
+    
+    def _build_pipeline_arrays(self, series: List[Tuple[str, Dict[str, np.ndarray]]]) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Pipeline features per symbol, keeping rows past warm-up whose horizon stays inside the symbol"""
+        horizon = self.config['horizon']
+        first_row = self.pipeline.warmup_bars - 1
+        features, targets = [], []
+        
+        for _, arrays in series:
+            close = arrays['close']
+            timestamps = pd.to_datetime(arrays['timestamp'], unit='ns') if 'timestamp' in arrays else None
+            matrix = self.pipeline.transform(close, arrays.get('volume'), timestamps)
+            
+            rows = np.arange(first_row, len(close) - horizon)
+            if len(rows) == 0:
+                continue
+            
+            current = close[rows]
+            future = close[rows + horizon]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                future_return = np.where(current != 0, (future - current) / current, 0.0)
+            
+            valid = np.isfinite(matrix[rows]).all(axis=1)
+            features.append(matrix[rows][valid])
+            targets.append((future_return[valid] > self.config['target_threshold']).astype(np.int64))
+        
+        if not features or sum(len(block) for block in features) == 0:
+            return None, None
+        
+        return np.concatenate(features), np.concatenate(targets)
+    
+    def build_from_store(self, feature_store, data: Dict[str, Any], features: Optional[List[str]] = None,
+                         version: Optional[int] = None) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Build from features already in a FeatureStore, read point-in-time at
+        each bar's timestamp so no row sees values recorded after its bar.
+        """
+        if features is None:
+            features = self.pipeline.feature_names if self.pipeline is not None else feature_store.list_features()
+        horizon = self.config['horizon']
+        
+        symbols, times, targets = [], [], []
+        for symbol, arrays in self._collect_series(data):
+            if 'timestamp' not in arrays:
+                continue
+            
+            close = arrays['close']
+            rows = np.arange(len(close) - horizon)
+            current = close[rows]
+            future = close[rows + horizon]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                future_return = np.where(current != 0, (future - current) / current, 0.0)
+            
+            symbols.append(np.full(len(rows), symbol, dtype=object))
+            times.append(arrays['timestamp'][rows])
+            targets.append((future_return > self.config['target_threshold']).astype(np.int64))
+        
+        if not symbols:
+            return None, None
+        
+        # One vectorized as-of join over every (symbol, bar) pair
+        matrix = feature_store.get_as_of(np.concatenate(symbols), np.concatenate(times), features, version)
+        valid = np.isfinite(matrix).all(axis=1)
+        if not valid.any():
+            return None, None
+        
+        return matrix[valid], np.concatenate(targets)[valid]
+    
+    def _build_cached(self, series: List[Tuple[str, Dict[str, np.ndarray]]], cache_path: Path) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Load a memory-mapped build for identical inputs, or build and persist one"""
+        cache_path.mkdir(parents=True, exist_ok=True)
+        key = self._fingerprint(series)
+        features_file = cache_path / f"training_{key}_X.npy"
+        targets_file = cache_path / f"training_{key}_y.npy"
+        
+        if features_file.exists() and targets_file.exists():
+            self.logger.info(f"Loading cached training set {key}")
+            return np.load(features_file, mmap_mode='r'), np.load(targets_file, mmap_mode='r')
+        
+        features, targets = self._build_arrays(series)
+        if features is None:
+            return None, None
+        
+        # Write to temporary names first so a crash never leaves a partial cache entry
+        for array, target in ((features, features_file), (targets, targets_file)):
+            temporary = target.with_suffix('.tmp.npy')
+            np.save(temporary, array)
+            temporary.replace(target)
+        
+        self.logger.info(f"Cached training set {key}: {features.shape[0]} rows")
+        return np.load(features_file, mmap_mode='r'), np.load(targets_file, mmap_mode='r')
+    
+    def _fingerprint(self, series: List[Tuple[str, Dict[str, np.ndarray]]]) -> str:
+        """Hash of the build parameters, feature definitions and input histories"""
+        digest = hashlib.blake2b(digest_size=16)
+        params = {k: v for k, v in self.config.items() if k != 'cache_path'}
+        if self.pipeline is not None:
+            params['pipeline'] = {
+                'config': self.pipeline.config,
+                'specs': [[spec.name, spec.kind, spec.source, spec.period] for spec in self.pipeline.specs]
+            }
+        digest.update(json.dumps(params, sort_keys=True).encode())
+        
+        for symbol, arrays in series:
+            digest.update(symbol.encode())
+            for name in sorted(arrays):
+                digest.update(name.encode())
+                digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+        
+        return digest.hexdigest()
+    
+    def clear_cache(self) -> int:
+        """Delete cached training sets, returning the number of files removed"""
+        cache_path = self.config['cache_path']
+        if not cache_path or not Path(cache_path).exists():
+            return 0
+        
+        removed = 0
+        for cached in Path(cache_path).glob("training_*.npy"):
+            cached.unlink()
+            removed += 1
+        return removed
@@ -0,0 +1,199 @@
+"""
+Write-Behind Writer - Batched SQLite persistence off the event loop
+Rows are queued by the caller and committed by a dedicated writer thread
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Union
+
+
+@dataclass
+class WriteBehindConfig:
+    """Configuration for the write-behind writer"""
+    sync_interval_ms: int = 200  # queued rows are committed within this time
+    max_batch_rows: int = 5000  # commit early once this many rows are waiting
+    synchronous: str = "NORMAL"  # SQLite PRAGMA synchronous; FULL syncs on every commit
+
+
+class WriteBehindWriter:
+    """
+    Groups queued (statement, rows) writes into one transaction per interval.
+    The thread owns its own WAL-mode connection, so commits never block the
+    event loop; flush() waits until everything queued so far is committed.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, db_path: Union[str, Path], config: Optional[WriteBehindConfig] = None):
+        self.db_path = str(db_path)
+        self.config = config or WriteBehindConfig()
+        self.logger = logging.getLogger(__name__)
+        
+        self.queue: queue.Queue = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.pending_rows = 0
+        self.error: Optional[BaseException] = None  # why the thread died, if it did
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'transactions': 0,
+            'rows_written': 0,
+            'rows_failed': 0,
+            'batches_failed': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0
+        }
+    
+    def start(self) -> None:
+        """Start the writer thread"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="genx-write-behind", daemon=True)
+        self.thread.start()
+    
+    def submit(self, statement: Union[str, Callable[[sqlite3.Connection, List[tuple]], Any]],
+               rows: List[tuple], on_commit: Optional[Callable[[], Any]] = None) -> None:
+        """
+        Queue rows for the next transaction; statement is SQL or a function(connection, rows).
+        on_commit is called from the writer thread once the transaction has ended.
+        """
+        if not rows:
+            return
+        self._check_running()
+        with self._lock:
+            self.pending_rows += len(rows)
+        self.queue.put((statement, rows, on_commit))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued before this call is committed"""
+        if self.thread is None:
+            return self.pending_rows == 0
+        if self.thread.is_alive():
+            done = threading.Event()
+            self.queue.put(done)
+            if not done.wait(timeout):
+                return False
+        if self.pending_rows:
+            self._check_running()
+        return True
+    
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Commit what is queued and stop the thread"""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        self.queue.put(self._STOP)
+        self.thread.join(timeout)
+    
+    def _check_running(self) -> None:
+        """Raise if the thread was started but is no longer writing"""
+        if self.thread is not None and not self.thread.is_alive():
+            reason = f": {self.error}" if self.error is not None else ""
+            raise RuntimeError(f"Write-behind writer is not running ({self.pending_rows} rows unwritten){reason}")
+    
+    def _run(self) -> None:
+        try:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute(f'PRAGMA synchronous={self.config.synchronous}')
+                self._loop(connection)
+            finally:
+                connection.close()
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Write-behind writer stopped: {e}")
+        finally:
+            # Release flush() calls still waiting; their rows stay counted as pending
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+    
+    def _loop(self, connection: sqlite3.Connection) -> None:
+        interval = self.config.sync_interval_ms / 1000
+        while True:
+            batch = [self.queue.get()]
+            rows = self._row_count(batch[0])
+            deadline = time.monotonic() + interval
+            
+            # Gather until the interval elapses or the batch is full
+            while rows < self.config.max_batch_rows and batch[-1] is not self._STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                rows += self._row_count(item)
+            
+            self._commit(connection, batch)
+            if batch[-1] is self._STOP:
+                break
+    
+    def _row_count(self, item: Any) -> int:
+        return len(item[1]) if isinstance(item, tuple) else 0
+    
+    def _commit(self, connection: sqlite3.Connection, batch: List[Any]) -> None:
+        """Write every queued statement in one transaction, then release waiting flush() calls"""
+        writes = [item for item in batch if isinstance(item, tuple)]
+        rows = sum(len(item[1]) for item in writes)
+        
+        if writes:
+            started = time.perf_counter()
+            try:
+                with connection:
+                    for statement, statement_rows, _ in writes:
+                        if callable(statement):
+                            statement(connection, statement_rows)
+                        else:
+                            connection.executemany(statement, statement_rows)
+                self.stats['rows_written'] += rows
+            except Exception as e:
+                # The transaction was rolled back; keep serving later batches
+                self.stats['rows_failed'] += rows
+                self.stats['batches_failed'] += 1
+                self.logger.error(f"Error writing {rows} queued rows: {e}")
+            
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stats['transactions'] += 1
+            self.stats['last_flush_ms'] = elapsed_ms
+            self.stats['max_flush_ms'] = max(self.stats['max_flush_ms'], elapsed_ms)
+            self.stats['total_flush_ms'] += elapsed_ms
+            with self._lock:
+                self.pending_rows -= rows
+            
+            for _, _, on_commit in writes:
+                if on_commit is None:
+                    continue
+                try:
+                    on_commit()
+                except Exception as e:
+                    self.logger.error(f"Error in write commit callback: {e}")
+        
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency"""
+        transactions = self.stats['transactions']
+        return {
+            'queue_depth': self.pending_rows,
+            'running': self.thread is not None and self.thread.is_alive(),
+            'error': str(self.error) if self.error is not None else None,
+            'avg_flush_ms': self.stats['total_flush_ms'] / transactions if transactions else 0.0,
+            **self.stats
+        }
@@ -18,6 +18,7 @@ from ml.model_registry import ModelRegistry, ModelRegistryConfig
 from data.market_data import MarketDataManager, MarketDataConfig
 from execution.broker_adapter import BrokerAdapter, BrokerConfig, BrokerType
 from observability.metrics import MetricsCollector, MetricsConfig
+from backtesting.optimizer import ParameterOptimizer, OptimizerConfig
 
 
 class GenXTradingSystem:
@@ -38,6 +39,7 @@ class GenXTradingSystem:
         self.market_data = None
         self.broker = None
         self.metrics = None
+        self.optimizer = None
         
     async def initialize(self) -> bool:
         """Initialize the trading system"""
@@ -130,7 +132,19 @@ class GenXTradingSystem:
             history_days=365,
             storage_path="market_data",
             real_time_enabled=True,
-            backup_enabled=True
+            backup_enabled=True,
+            feature_lookback=self.decision_engine_config.lookback_period
+        )
+        
+        # Strategy optimizer configuration
+        self.optimizer_config = OptimizerConfig(
+            db_path="market_data/market_data.db",
+            symbols=self.market_data_config.symbols,
+            history_days=90,
+            train_bars=20000,
+            test_bars=5000,
+            objective='sharpe_ratio',
+            workspace_path="market_data/optimizer"
         )
         
         # Broker configuration
@@ -200,6 +214,11 @@ class GenXTradingSystem:
             market_data=self.market_data,
             metrics=self.metrics
         )
+        
+        # Give the self-manager a walk-forward optimizer for strategy updates
+        self.optimizer = ParameterOptimizer(self.optimizer_config)
+        self.self_manager.decision_engine = self.decision_engine
+        self.self_manager.optimizer = self.optimizer
     
     async def _initialize_observability(self) -> None:
         """Initialize observability components"""
@@ -300,6 +319,12 @@ class GenXTradingSystem:
             if self.agent:
                 await self.agent.shutdown()
             
+            if self.decision_engine:
+                await self.decision_engine.shutdown()
+            
+            if self.optimizer:
+                self.optimizer.shutdown()
+            
             if self.market_data:
                 await self.market_data.shutdown()
             
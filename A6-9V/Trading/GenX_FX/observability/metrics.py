@@ -149,6 +149,22 @@ class MetricsCollector:
         except Exception as e:
             self.logger.error(f"Error recording metric {name}: {e}")
     
+    async def record_market_snapshot(self, snapshot: Any) -> None:
+        """Record coverage and staleness of a MarketSnapshot"""
+        try:
+            await self.record_metric('market_snapshot_symbols', len(snapshot.symbols))
+            
+            latest = snapshot.latest_timestamps()
+            latest = latest[~np.isnat(latest)]
+            if len(latest):
+                now = np.datetime64(pd.Timestamp.now(tz='UTC').value, 'ns')
+                staleness = (now - latest) / np.timedelta64(1, 's')
+                await self.record_metric('market_data_staleness_seconds', float(staleness.max()))
+                await self.record_metric('market_data_median_staleness_seconds', float(np.median(staleness)))
+            
+        except Exception as e:
+            self.logger.error(f"Error recording market snapshot: {e}")
+    
     async def record_trade(self, trade_result: Dict[str, Any]) -> None:
         """Record trade execution"""
         try:
@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the GenX_FX packages importable from the tests directory
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
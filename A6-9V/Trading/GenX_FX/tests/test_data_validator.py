@@ -0,0 +1,85 @@
+"""
+DataValidator.violations masks
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.data_validator import DataValidator, Violation
+
+
+def bars(rows, start='2024-01-01', freq='h') -> pd.DataFrame:
+    data = pd.DataFrame(rows, columns=['open', 'high', 'low', 'close', 'volume'])
+    data.index = pd.date_range(start, periods=len(rows), freq=freq, tz='UTC')
+    return data
+
+
+CLEAN = [100.0, 101.0, 99.0, 100.5, 10.0]
+
+
+def test_clean_bars_have_no_violations():
+    masks = DataValidator().violations(bars([CLEAN] * 5))
+    assert masks.dtype == np.int32
+    assert not masks.any()
+
+
+def test_each_row_rule_sets_its_flag():
+    data = bars([
+        CLEAN,
+        [100.0, 101.0, np.nan, 100.5, 10.0],
+        [100.0, 101.0, -1.0, 100.5, 10.0],
+        [100.0, 2e6, 99.0, 100.5, 10.0],
+        [100.0, 101.0, 99.0, 100.5, -5.0],
+        [100.0, 99.5, 99.0, 100.5, 10.0],
+        [100.0, 101.0, 100.2, 100.5, 10.0],
+    ])
+    masks = DataValidator().violations(data)
+    
+    assert masks[0] == Violation.NONE
+    assert masks[1] & Violation.NULL
+    assert masks[2] & Violation.NON_POSITIVE_PRICE
+    assert masks[3] & Violation.EXTREME_PRICE
+    assert masks[4] == Violation.NEGATIVE_VOLUME
+    assert masks[5] == Violation.HIGH_INCONSISTENT
+    assert masks[6] == Violation.LOW_INCONSISTENT
+
+
+def test_rules_can_be_disabled():
+    data = bars([[100.0, 99.5, 99.0, 100.5, -5.0]])
+    masks = DataValidator({'ohlc_consistency': False, 'volume_check': False}).violations(data)
+    assert masks[0] == Violation.NONE
+
+
+def test_spike_flags_the_bar_after_the_jump():
+    data = bars([CLEAN, [100.0, 131.0, 99.0, 130.0, 10.0], [130.0, 131.0, 129.0, 130.5, 10.0]])
+    assert not DataValidator().violations(data).any()
+    
+    masks = DataValidator({'spike_threshold': 0.2}).violations(data)
+    np.testing.assert_array_equal(masks, [0, Violation.SPIKE, 0])
+
+
+def test_gap_uses_max_gap_seconds():
+    data = bars([CLEAN] * 3)
+    data.index = pd.DatetimeIndex(['2024-01-01 00:00', '2024-01-01 01:00', '2024-01-01 05:00'], tz='UTC')
+    
+    assert not DataValidator().violations(data).any()
+    masks = DataValidator({'max_gap_seconds': 3600}).violations(data)
+    np.testing.assert_array_equal(masks, [0, 0, Violation.GAP])
+
+
+def test_timestamp_order_check_gates_duplicate_and_stale():
+    data = bars([CLEAN] * 4)
+    data.index = pd.DatetimeIndex(
+        ['2024-01-01 01:00', '2024-01-01 01:00', '2024-01-01 00:00', '2024-01-01 02:00'], tz='UTC'
+    )
+    
+    assert not DataValidator().violations(data).any()
+    masks = DataValidator({'timestamp_order_check': True}).violations(data)
+    np.testing.assert_array_equal(masks, [0, Violation.DUPLICATE_TIMESTAMP, Violation.STALE_TIMESTAMP, 0])
+
+
+def test_timestamp_column_is_used_without_datetime_index():
+    data = bars([CLEAN] * 2).reset_index(names='timestamp')
+    data.loc[1, 'timestamp'] = data.loc[0, 'timestamp']
+    masks = DataValidator({'timestamp_order_check': True}).violations(data)
+    np.testing.assert_array_equal(masks, [0, Violation.DUPLICATE_TIMESTAMP])
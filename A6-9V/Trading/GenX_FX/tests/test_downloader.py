@@ -0,0 +1,41 @@
+"""
+Interval bookkeeping used to resume downloads
+"""
+
+from datetime import datetime
+
+from data.downloader import merge_intervals, missing_intervals
+
+
+def day(n: int) -> datetime:
+    return datetime(2024, 1, n)
+
+
+def test_merge_intervals_unions_overlapping_and_touching():
+    intervals = [(day(5), day(7)), (day(1), day(3)), (day(2), day(4)), (day(4), day(5)), (day(10), day(12))]
+    assert merge_intervals(intervals) == [(day(1), day(7)), (day(10), day(12))]
+
+
+def test_merge_intervals_keeps_contained_interval_bounds():
+    assert merge_intervals([(day(1), day(10)), (day(2), day(3))]) == [(day(1), day(10))]
+    assert merge_intervals([]) == []
+
+
+def test_missing_intervals_without_coverage():
+    assert missing_intervals(day(1), day(10), []) == [(day(1), day(10))]
+
+
+def test_missing_intervals_fully_covered():
+    assert missing_intervals(day(2), day(5), [(day(1), day(3)), (day(3), day(6))]) == []
+
+
+def test_missing_intervals_returns_gaps_inside_range():
+    covered = [(day(3), day(4)), (day(6), day(8))]
+    assert missing_intervals(day(1), day(10), covered) == [
+        (day(1), day(3)), (day(4), day(6)), (day(8), day(10))
+    ]
+
+
+def test_missing_intervals_ignores_coverage_outside_range():
+    covered = [(day(1), day(2)), (day(4), day(5)), (day(20), day(25))]
+    assert missing_intervals(day(3), day(10), covered) == [(day(3), day(4)), (day(5), day(10))]
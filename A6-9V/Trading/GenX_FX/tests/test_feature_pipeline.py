@@ -0,0 +1,64 @@
+"""
+Streaming feature rows must match the batch transform, time features included
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.feature_pipeline import FeaturePipeline
+
+
+def history(bars: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    volume = rng.lognormal(10, 0.8, bars)
+    timestamps = pd.date_range('2024-03-01 13:00', periods=bars, freq='h', tz='UTC')
+    return close, volume, timestamps
+
+
+def test_streaming_rows_match_batch_with_exchange_local_bars():
+    pipeline = FeaturePipeline({'lookback': 30})
+    close, volume, timestamps = history(400)
+    batch = pipeline.transform(close, volume, timestamps)
+    
+    state = pipeline.create_state()
+    local = timestamps.tz_convert('America/New_York')
+    for i in range(len(close)):
+        row = state.update({'close': close[i], 'volume': volume[i], 'timestamp': local[i]})
+        if row is None:
+            assert np.isnan(batch[i]).all()
+            continue
+        np.testing.assert_allclose(row, batch[i], rtol=1e-9, atol=1e-9)
+
+
+def test_warm_up_matches_last_batch_row():
+    pipeline = FeaturePipeline({'lookback': 30})
+    close, volume, timestamps = history(1500, seed=1)
+    
+    state = pipeline.create_state()
+    row = state.warm_up(close, volume, timestamps)
+    np.testing.assert_allclose(row, pipeline.transform(close, volume, timestamps)[-1], rtol=1e-9, atol=1e-9)
+
+
+def test_naive_timestamps_are_utc():
+    pipeline = FeaturePipeline({'lookback': 30})
+    close, volume, timestamps = history(100)
+    aware = pipeline.transform(close, volume, timestamps)
+    naive = pipeline.transform(close, volume, timestamps.tz_localize(None))
+    np.testing.assert_array_equal(aware[-1], naive[-1])
+
+
+def test_time_features_are_masked_without_timestamps():
+    pipeline = FeaturePipeline({'lookback': 30})
+    close, volume, _ = history(100)
+    time_columns = [pipeline.feature_names.index(name) for name in ('hour_of_day', 'day_of_week')]
+    other_columns = [column for column in range(len(pipeline.specs)) if column not in time_columns]
+    
+    matrix = pipeline.transform(close, volume)
+    assert np.isnan(matrix[:, time_columns]).all()
+    assert np.isfinite(matrix[-1, other_columns]).all()
+    
+    state = pipeline.create_state()
+    row = state.warm_up(close, volume)
+    assert np.isnan(row[time_columns]).all()
+    np.testing.assert_allclose(row[other_columns], matrix[-1, other_columns], rtol=1e-9, atol=1e-9)
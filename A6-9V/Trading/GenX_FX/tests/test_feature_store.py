@@ -0,0 +1,53 @@
+"""
+FeatureStore tiers: live appends to evicted columns stay off the full history
+"""
+
+import numpy as np
+
+from data.feature_store import FeatureStore
+
+MINUTE = 60_000_000_000
+
+
+def filled_store(path, symbols, rows: int, tail_rows: int = 8) -> FeatureStore:
+    # Budget for roughly one in-memory column, so every other symbol lives on disk
+    store = FeatureStore({'storage_path': str(path), 'max_memory_bytes': rows * 16 + 1024, 'tail_rows': tail_rows})
+    for symbol in symbols:
+        store.put(symbol, 'rsi', np.arange(rows) * MINUTE, np.arange(rows, dtype=float))
+    return store
+
+
+def test_appends_to_mapped_columns_buffer_a_bounded_tail(tmp_path):
+    symbols = ['EURUSD', 'GBPUSD', 'USDJPY']
+    rows = 5000
+    store = filled_store(tmp_path, symbols, rows)
+    
+    for step in range(100):
+        for symbol in symbols:
+            store.append(symbol, 'rsi', (rows + step) * MINUTE, float(rows + step))
+    
+    # Mapped columns are never copied back into memory: each holds only its tail
+    for key, column in store.columns.items():
+        assert column.mapped
+        assert column.tail_size < 8
+        assert column.nbytes <= 16 * 16
+    assert store.get_stats()['memory_bytes'] < rows * 16
+    
+    for symbol in symbols:
+        column = store.get(symbol, 'rsi')
+        assert column.tail_size == 0 and column.mapped
+        np.testing.assert_array_equal(column.index, np.arange(rows + 100) * MINUTE)
+        np.testing.assert_array_equal(column.data, np.arange(rows + 100, dtype=float))
+
+
+def test_flushed_tails_survive_a_restart(tmp_path):
+    store = filled_store(tmp_path, ['EURUSD', 'GBPUSD'], 1000, tail_rows=64)
+    for step in range(10):
+        store.append('EURUSD', 'rsi', (1000 + step) * MINUTE, -1.0)
+    store.flush()
+    
+    reopened = FeatureStore({'storage_path': str(tmp_path)})
+    series = reopened.get_series('EURUSD', 'rsi')
+    assert len(series) == 1010
+    assert (series.iloc[-10:] == -1.0).all()
+    assert series.iloc[999] == 999.0
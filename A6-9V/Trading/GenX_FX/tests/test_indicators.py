@@ -0,0 +1,62 @@
+"""
+Streaming indicators must reproduce the batch IndicatorEngine values
+"""
+
+import numpy as np
+import pytest
+
+from data.indicators import IndicatorEngine, StreamingIndicators
+
+
+def random_walk(bars: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    high = close * (1 + rng.uniform(0, 0.001, bars))
+    low = close * (1 - rng.uniform(0, 0.001, bars))
+    volume = rng.lognormal(10, 0.8, bars)
+    return close, high, low, volume
+
+
+def test_streaming_matches_history_at_every_bar():
+    close, high, low, volume = random_walk(300)
+    history = IndicatorEngine().compute_history(close, high, low, volume)
+    
+    streaming = StreamingIndicators()
+    for i in range(len(close)):
+        streaming.update({'close': close[i], 'high': high[i], 'low': low[i], 'volume': volume[i]})
+        snapshot = streaming.snapshot()
+        for name, values in history.items():
+            assert snapshot[name] == pytest.approx(values[i], rel=1e-9, abs=1e-9), (name, i)
+
+
+def test_compute_for_series_matches_streaming():
+    engine = IndicatorEngine()
+    series = [random_walk(bars, seed) for seed, bars in enumerate((30, 120, 600))]
+    batch = engine.compute_for_series(
+        [s[0] for s in series], [s[1] for s in series], [s[2] for s in series], [s[3] for s in series]
+    )
+    
+    for values, (close, high, low, volume) in zip(batch, series):
+        streaming = StreamingIndicators()
+        streaming.warm_up(close, high, low, volume)
+        snapshot = streaming.snapshot()
+        assert snapshot.keys() == values.keys()
+        for name, value in values.items():
+            assert snapshot[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+@pytest.mark.parametrize('rsi_method', ['simple', 'wilder'])
+def test_warm_up_matches_full_replay(rsi_method):
+    close, high, low, volume = random_walk(3000, seed=1)
+    
+    replayed = StreamingIndicators({'rsi_method': rsi_method})
+    for i in range(len(close)):
+        replayed.update({'close': close[i], 'high': high[i], 'low': low[i], 'volume': volume[i]})
+    
+    warmed = StreamingIndicators({'rsi_method': rsi_method})
+    assert warmed.history_bars < len(close)
+    warmed.warm_up(close, high, low, volume)
+    
+    expected = replayed.snapshot()
+    for name, value in warmed.snapshot().items():
+        assert value == pytest.approx(expected[name], rel=1e-9, abs=1e-9), name
@@ -0,0 +1,116 @@
+"""
+RangeCache containment, eviction and invalidation
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.range_cache import RangeCache
+
+HOUR = 3_600_000_000_000
+
+
+def bars(start: int, count: int) -> pd.DataFrame:
+    index = pd.DatetimeIndex(np.arange(start, start + count * HOUR, HOUR).view('datetime64[ns]'), tz='UTC')
+    close = 100.0 + np.arange(count)
+    return pd.DataFrame(
+        {'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': np.full(count, 10.0)},
+        index=index
+    )
+
+
+def test_contained_range_is_served_as_slice():
+    cache = RangeCache()
+    data = bars(0, 100)
+    cache.put('EURUSD', 0, 99 * HOUR, '1h', data)
+    
+    hit = cache.get('EURUSD', 10 * HOUR, 20 * HOUR, timeframe='1h')
+    assert hit is not None
+    assert len(hit) == 11
+    assert hit.index[0] == data.index[10] and hit.index[-1] == data.index[20]
+    np.testing.assert_array_equal(hit['close'].to_numpy(), data['close'].to_numpy()[10:21])
+    assert not hit['close'].to_numpy().flags.writeable
+
+
+def test_range_outside_cached_one_misses():
+    cache = RangeCache()
+    cache.put('EURUSD', 10 * HOUR, 50 * HOUR, '1h', bars(10 * HOUR, 41))
+    
+    assert cache.get('EURUSD', 0, 20 * HOUR, timeframe='1h') is None
+    assert cache.get('EURUSD', 40 * HOUR, 60 * HOUR, timeframe='1h') is None
+    assert cache.get('EURUSD', 40 * HOUR, None, timeframe='1h') is None
+    assert cache.get('EURUSD', 20 * HOUR, 30 * HOUR, timeframe='4h') is None
+    assert cache.get('GBPUSD', 20 * HOUR, 30 * HOUR, timeframe='1h') is None
+    stats = cache.get_stats()
+    assert stats['hits'] == 0 and stats['misses'] == 5
+
+
+def test_open_ended_range_serves_later_start():
+    cache = RangeCache()
+    cache.put('EURUSD', 0, None, '1h', bars(0, 50))
+    assert len(cache.get('EURUSD', 30 * HOUR, None, timeframe='1h')) == 20
+    assert len(cache.get('EURUSD', 30 * HOUR, 40 * HOUR, timeframe='1h')) == 11
+
+
+def test_put_drops_contained_ranges():
+    cache = RangeCache()
+    cache.put('EURUSD', 10 * HOUR, 20 * HOUR, '1h', bars(10 * HOUR, 11))
+    cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100))
+    assert cache.get_stats()['entries'] == 1
+
+
+def test_least_recently_used_range_is_evicted():
+    entry_bytes = bars(0, 100).shape[0] * 6 * 8
+    cache = RangeCache(max_bytes=2 * entry_bytes)
+    for symbol in ('A', 'B'):
+        cache.put(symbol, 0, 99 * HOUR, '1h', bars(0, 100))
+    
+    assert cache.get('A', 0, 10 * HOUR, timeframe='1h') is not None
+    cache.put('C', 0, 99 * HOUR, '1h', bars(0, 100))
+    
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['bytes_cached'] <= cache.max_bytes
+    assert cache.get('B', 0, 10 * HOUR, timeframe='1h') is None
+    assert cache.get('A', 0, 10 * HOUR, timeframe='1h') is not None
+    assert cache.get('C', 0, 10 * HOUR, timeframe='1h') is not None
+
+
+def test_range_larger_than_cache_is_returned_uncached():
+    cache = RangeCache(max_bytes=1024)
+    result = cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100))
+    assert len(result) == 100
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_put_after_invalidation_is_not_cached():
+    cache = RangeCache()
+    generation = cache.generation('EURUSD')
+    cache.invalidate(['EURUSD'])
+    
+    result = cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100), generation=generation)
+    assert len(result) == 100
+    assert cache.get('EURUSD', 0, 10 * HOUR, timeframe='1h') is None
+    
+    cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100), generation=cache.generation('EURUSD'))
+    assert cache.get('EURUSD', 0, 10 * HOUR, timeframe='1h') is not None
+
+
+def test_invalidate_drops_symbol_ranges():
+    cache = RangeCache()
+    cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100))
+    cache.put('GBPUSD', 0, 99 * HOUR, '1h', bars(0, 100))
+    
+    cache.invalidate(['EURUSD'])
+    assert cache.get('EURUSD', 0, 10 * HOUR, timeframe='1h') is None
+    assert cache.get('GBPUSD', 0, 10 * HOUR, timeframe='1h') is not None
+    
+    cache.invalidate()
+    assert cache.get_stats()['entries'] == 0 and cache.get_stats()['bytes_cached'] == 0
+
+
+def test_expired_range_misses():
+    cache = RangeCache(ttl_seconds=0.0)
+    cache.put('EURUSD', 0, 99 * HOUR, '1h', bars(0, 100))
+    assert cache.get('EURUSD', 0, 10 * HOUR, timeframe='1h') is None
+    assert cache.get_stats()['expirations'] == 1
@@ -0,0 +1,60 @@
+"""
+Shared ring matrices and the MarketSnapshot views handed out over them
+"""
+
+import numpy as np
+import pandas as pd
+
+from data.ring_buffer import BarRingBuffers
+from data.snapshot import MarketSnapshot
+from data.training_loader import MISSING_TIMESTAMP
+
+
+def history(count: int, start: str = '2024-01-01') -> pd.DataFrame:
+    close = 100.0 + np.arange(count)
+    return pd.DataFrame(
+        {'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': np.full(count, 10.0)},
+        index=pd.date_range(start, periods=count, freq='h', tz='UTC')
+    )
+
+
+def bar(timestamp, close: float) -> dict:
+    return {'timestamp': timestamp, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1.0}
+
+
+def test_rows_are_left_padded_and_shift_in_place():
+    buffers = BarRingBuffers(depth=5)
+    buffers.seed('EURUSD', history(3))
+    buffers.seed('GBPUSD', history(8))
+    
+    symbols, timestamps, values, counts = buffers.matrices()
+    assert symbols == ['EURUSD', 'GBPUSD']
+    assert list(counts) == [3, 5]
+    np.testing.assert_array_equal(values[3, 0], [np.nan, np.nan, 100.0, 101.0, 102.0])
+    np.testing.assert_array_equal(values[3, 1], [103.0, 104.0, 105.0, 106.0, 107.0])
+    assert (timestamps[0, :2] == MISSING_TIMESTAMP).all()
+    
+    next_hour = history(4).index[-1]
+    buffers.update('EURUSD', bar(next_hour, 200.0))
+    buffers.update('EURUSD', bar(next_hour, 201.0))  # same bar, replaced in place
+    np.testing.assert_array_equal(values[3, 0], [np.nan, 100.0, 101.0, 102.0, 201.0])
+    assert counts[0] == 4
+    assert timestamps[0, -1] == next_hour.value
+
+
+def test_snapshot_shares_the_feed_matrices():
+    buffers = BarRingBuffers(depth=4)
+    for index in range(10):  # past the initial row capacity
+        buffers.seed(f"SYM{index}", history(2 + index % 3))
+    
+    snapshot = MarketSnapshot.from_buffers(buffers)
+    assert np.shares_memory(snapshot.ohlcv, buffers.values)
+    assert np.shares_memory(snapshot.timestamps, buffers.timestamps)
+    assert not snapshot.close.flags.writeable
+    
+    data = snapshot['SYM4']
+    np.testing.assert_array_equal(data['close'], [100.0, 101.0, 102.0])
+    assert snapshot.latest('close')[snapshot.row('SYM4')] == 102.0
+    
+    buffers.update('SYM4', bar(history(4).index[-1], 300.0))
+    assert snapshot.latest('close')[snapshot.row('SYM4')] == 300.0
@@ -0,0 +1,80 @@
+"""
+simulate_trades must fill exactly like SimulatedBroker bar by bar
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+vectorized = pytest.importorskip("backtesting.vectorized")
+broker = pytest.importorskip("backtesting.broker")
+
+
+def random_market(bars: int, seed: int):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, bars)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.0005, bars))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, bars))
+    
+    long_entry = rng.random(bars) < 0.03
+    short_entry = rng.random(bars) < 0.03
+    width = rng.uniform(0.002, 0.01, bars)
+    masks = vectorized.SignalMasks(
+        long_entry=long_entry,
+        short_entry=short_entry,
+        long_stop=close * (1 - width),
+        long_take=close * (1 + 2 * width),
+        short_stop=close * (1 + width),
+        short_take=close * (1 - 2 * width)
+    )
+    return open_, high, low, close, masks
+
+
+def broker_trades(open_, high, low, close, masks, first_bar, slippage):
+    """Replay the masks through SimulatedBroker the way BacktestEngine does"""
+    clock = broker.SimulatedClock()
+    sim = broker.SimulatedBroker(slippage=slippage, clock=clock)
+    timestamps = pd.date_range('2024-01-01', periods=len(close), freq='h').values.view(np.int64)
+    
+    async def replay():
+        for i in range(len(close)):
+            clock.set(timestamps[i])
+            sim.on_bar('SYM', clock.now(), open_[i], high[i], low[i], close[i])
+            if first_bar <= i < len(close) - 1 and (masks.long_entry[i] or masks.short_entry[i]):
+                is_long = bool(masks.long_entry[i])
+                await sim.execute_trade({
+                    'symbol': 'SYM',
+                    'signal_type': 'buy' if is_long else 'sell',
+                    'position_size': 1,
+                    'entry_price': close[i],
+                    'stop_loss': (masks.long_stop if is_long else masks.short_stop)[i],
+                    'take_profit': (masks.long_take if is_long else masks.short_take)[i]
+                })
+        sim.close_all()
+    
+    asyncio.run(replay())
+    times = {clock_time: bar for bar, clock_time in enumerate(pd.DatetimeIndex(timestamps).to_pydatetime())}
+    return [
+        (times[trade['entry_time']], times[trade['exit_time']], trade['entry_price'], trade['exit_price'], trade['exit_reason'])
+        for trade in sim.trades
+    ]
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('slippage', [0.0, 0.0002])
+def test_simulate_trades_matches_broker(seed, slippage):
+    open_, high, low, close, masks = random_market(2000, seed)
+    first_bar = 50
+    
+    expected = broker_trades(open_, high, low, close, masks, first_bar, slippage)
+    trades = vectorized.simulate_trades(open_, high, low, close, masks, first_bar=first_bar, slippage=slippage)
+    
+    assert len(expected) > 10
+    assert len(trades) == len(expected)
+    for (entry_bar, exit_bar, _, entry_price, exit_price, reason), want in zip(trades, expected):
+        assert (entry_bar, exit_bar, reason) == (want[0], want[1], want[4])
+        assert entry_price == pytest.approx(want[2], rel=1e-9)
+        assert exit_price == pytest.approx(want[3], rel=1e-9)